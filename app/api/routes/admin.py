@@ -0,0 +1,66 @@
+"""Admin endpoints for operating the RAG artifacts."""
+
+import asyncio
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.core.config import settings
+from app.libs import rag
+
+# Header key for the admin token (settings.admin_token)
+ADMIN_TOKEN_HEADER_KEY = "wadeulwadeul-admin-token"
+
+
+async def require_admin_token(
+    token: str | None = Header(default=None, alias=ADMIN_TOKEN_HEADER_KEY),
+) -> None:
+    """
+    Dependency that checks the admin token header.
+
+    Raises:
+        HTTPException: 403 if admin endpoints are disabled or the token is wrong
+    """
+    if not settings.admin_token or not secrets.compare_digest(
+        token or "", settings.admin_token
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Admin token required in '{ADMIN_TOKEN_HEADER_KEY}' header.",
+        )
+
+
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_token)]
+)
+
+
+@router.get("/rag/release")
+async def rag_release() -> dict:
+    """
+    Currently loaded RAG artifact release.
+
+    Returns:
+        release: release version (None if loaded from the default paths)
+        index_version: loaded index file version
+        load_time_ms: load time of the current retriever
+    """
+    return rag.rag_status()
+
+
+@router.post("/rag/reload")
+async def reload_rag_release(force: bool = False) -> dict:
+    """
+    Swap to the current RAG artifact release without restarting.
+
+    The new retriever is verified and loaded in a worker thread; requests
+    already in flight finish on the previous one.
+
+    Args:
+        force: reload even if the current release is already loaded
+
+    Returns:
+        swapped: whether the retriever was replaced
+        error: load failure reason (the previous retriever is kept)
+    """
+    return await asyncio.to_thread(rag.reload_rag_retriever, None, force)
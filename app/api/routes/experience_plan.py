@@ -13,7 +13,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user_optional
 from app.core.database import get_db
+from app.libs import rag, single_flight
 from app.libs.openai_client import get_openai_client
+from app.libs.query_canonicalizer import canonicalize_query
 from app.models.user import User
 from app.prompts import experience_plan as experience_plan_prompts
 from app.prompts import materials_suggestion, steps_suggestion
@@ -39,15 +41,16 @@ class ExperienceRequest(BaseModel):
 
 def get_rag_retriever() -> RAGRetriever | None:
     """
-    RAGRetriever 의존성 제공. 기본 구현은 lazy 초기화 실패를 방지하기 위해 None을 허용한다.
-    테스트에서는 dependency override로 주입한다.
+    RAGRetriever 의존성 제공. 앱 lifespan에서 미리 로드한 싱글톤을 반환하며,
+    로딩에 실패했으면 None을 반환한다. 테스트에서는 dependency override로 주입한다.
     """
-    try:
-        from llm.rag_retriever import RAGRetriever
+    return rag.get_rag_retriever()
+
 
-        return RAGRetriever()
-    except Exception:
-        return None
+def _request_key(endpoint: str, payload: BaseModel) -> tuple[str, ...]:
+    """공백 차이를 정규화한 요청 키 (동일 요청의 동시 LLM 호출 병합용)."""
+    fields = sorted(payload.model_dump().items())
+    return (endpoint, *(f"{name}={' '.join(value.split())}" for name, value in fields))
 
 
 @router.post("/", status_code=status.HTTP_200_OK)
@@ -76,32 +79,24 @@ async def generate_experience_plan(
     system_prompt = experience_plan_prompts.get_system_prompt()
     rag_context = ""
     if rag_retriever:
-        query = " ".join(
-            [
-                payload.category,
-                payload.years_of_experience,
-                payload.job_description,
-                payload.materials,
-                payload.location,
-            ]
+        query = canonicalize_query(
+            category=payload.category,
+            years_of_experience=payload.years_of_experience,
+            job_description=payload.job_description,
+            materials=payload.materials,
+            location=payload.location,
+        )
+        # 만나는 장소가 지역으로 해석되면 그 지역 문서만 검색,
+        # 아니면 체험 유형별 사전 계산 컨텍스트를 우선 사용
+        rag_context = await rag.build_rag_context(
+            rag_retriever,
+            query,
+            top_k=3,
+            location=payload.location,
+            category=payload.category,
+            details=f"{payload.job_description} {payload.materials}",
+            endpoint="experience-plan",
         )
-        try:
-            results = rag_retriever.retrieve(query=query, top_k=3)
-            if results:
-                formatted = [
-                    " | ".join(
-                        [
-                            item.get("title", ""),
-                            item.get("introduction", ""),
-                            item.get("alltag", ""),
-                            item.get("address", ""),
-                        ]
-                    )
-                    for item in results
-                ]
-                rag_context = "\n".join(formatted)
-        except Exception:
-            rag_context = ""
 
     user_prompt = experience_plan_prompts.build_user_prompt(
         category=payload.category,
@@ -120,11 +115,14 @@ async def generate_experience_plan(
         {"role": "user", "content": user_prompt},
     ]
 
-    completion = await openai_client.chat.completions.create(
-        model="gpt-4o",
-        messages=messages,
-        temperature=0,
-        response_format={"type": "json_object"},
+    completion = await single_flight.get_group("llm_completion").do(
+        _request_key("experience-plan", payload),
+        lambda: openai_client.chat.completions.create(
+            model="gpt-4o",
+            messages=messages,
+            temperature=0,
+            response_format={"type": "json_object"},
+        ),
     )
 
     template_raw = completion.choices[0].message.content
@@ -180,30 +178,19 @@ async def suggest_materials(
     system_prompt = materials_suggestion.get_system_prompt()
     rag_context = ""
     if rag_retriever:
-        query = " ".join(
-            [
-                payload.category,
-                payload.years_of_experience,
-                payload.job_description,
-            ]
+        query = canonicalize_query(
+            category=payload.category,
+            years_of_experience=payload.years_of_experience,
+            job_description=payload.job_description,
+        )
+        rag_context = await rag.build_rag_context(
+            rag_retriever,
+            query,
+            top_k=3,
+            category=payload.category,
+            details=payload.job_description,
+            endpoint="materials-suggestion",
         )
-        try:
-            results = rag_retriever.retrieve(query=query, top_k=3)
-            if results:
-                formatted = [
-                    " | ".join(
-                        [
-                            item.get("title", ""),
-                            item.get("introduction", ""),
-                            item.get("alltag", ""),
-                            item.get("address", ""),
-                        ]
-                    )
-                    for item in results
-                ]
-                rag_context = "\n".join(formatted)
-        except Exception:
-            rag_context = ""
 
     user_prompt = materials_suggestion.build_user_prompt(
         category=payload.category,
@@ -217,10 +204,13 @@ async def suggest_materials(
         {"role": "user", "content": user_prompt},
     ]
 
-    completion = await openai_client.chat.completions.create(
-        model="gpt-4o",
-        messages=messages,
-        temperature=0,
+    completion = await single_flight.get_group("llm_completion").do(
+        _request_key("materials-suggestion", payload),
+        lambda: openai_client.chat.completions.create(
+            model="gpt-4o",
+            messages=messages,
+            temperature=0,
+        ),
     )
 
     suggestion = completion.choices[0].message.content
@@ -269,31 +259,20 @@ async def suggest_steps(
     system_prompt = steps_suggestion.get_system_prompt()
     rag_context = ""
     if rag_retriever:
-        query = " ".join(
-            [
-                payload.category,
-                payload.years_of_experience,
-                payload.job_description,
-                payload.materials,
-            ]
+        query = canonicalize_query(
+            category=payload.category,
+            years_of_experience=payload.years_of_experience,
+            job_description=payload.job_description,
+            materials=payload.materials,
+        )
+        rag_context = await rag.build_rag_context(
+            rag_retriever,
+            query,
+            top_k=3,
+            category=payload.category,
+            details=f"{payload.job_description} {payload.materials}",
+            endpoint="steps-suggestion",
         )
-        try:
-            results = rag_retriever.retrieve(query=query, top_k=3)
-            if results:
-                formatted = [
-                    " | ".join(
-                        [
-                            item.get("title", ""),
-                            item.get("introduction", ""),
-                            item.get("alltag", ""),
-                            item.get("address", ""),
-                        ]
-                    )
-                    for item in results
-                ]
-                rag_context = "\n".join(formatted)
-        except Exception:
-            rag_context = ""
 
     user_prompt = steps_suggestion.build_user_prompt(
         category=payload.category,
@@ -308,10 +287,13 @@ async def suggest_steps(
         {"role": "user", "content": user_prompt},
     ]
 
-    completion = await openai_client.chat.completions.create(
-        model="gpt-4o",
-        messages=messages,
-        temperature=0,
+    completion = await single_flight.get_group("llm_completion").do(
+        _request_key("steps-suggestion", payload),
+        lambda: openai_client.chat.completions.create(
+            model="gpt-4o",
+            messages=messages,
+            temperature=0,
+        ),
     )
 
     suggestion = completion.choices[0].message.content
@@ -3,6 +3,10 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from app.libs import rag, single_flight
+from app.libs.context_budget import context_token_stats
+from app.libs.context_cache import context_cache
+
 router = APIRouter(prefix="/health", tags=["health"])
 
 
@@ -22,3 +26,26 @@ async def ping() -> PingResponse:
         PingResponse: Simple ping response with status and message
     """
     return PingResponse(status="ok", message="pong")
+
+
+@router.get("/metrics")
+async def metrics() -> dict[str, dict]:
+    """
+    In-process LLM/RAG request metrics.
+
+    Returns:
+        single_flight: per-group call and coalesced counters
+        rag_context_cache: RAG context cache hit/miss counters and size
+        rag_context_tokens: context tokens before/after per-endpoint budgets
+        rag_precomputed_contexts: precomputed context lookups (empty if not loaded)
+    """
+    retriever = rag.get_rag_retriever()
+    precomputed = retriever.precomputed_contexts if retriever else None
+    return {
+        "single_flight": single_flight.stats(),
+        "rag_context_cache": context_cache.stats(),
+        "rag_context_tokens": context_token_stats.stats(),
+        "rag_precomputed_contexts": (
+            precomputed.stats() if precomputed is not None else {}
+        ),
+    }
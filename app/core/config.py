@@ -34,6 +34,26 @@ class Settings(BaseSettings):
     db_max_overflow: int = 20
     db_pool_pre_ping: bool = True
 
+    # RAG context cache (normalized query, top_k, index version -> context)
+    rag_context_cache_size: int = 1024
+    rag_context_cache_ttl_seconds: float = 600
+
+    # RAG context token budgets per endpoint (missing or 0 means unlimited)
+    rag_context_token_budgets: dict[str, int] = {
+        "experience-plan": 600,
+        "materials-suggestion": 400,
+        "steps-suggestion": 400,
+    }
+    # Per-hit field token limits (fields not listed are kept whole)
+    rag_context_field_max_tokens: dict[str, int] = {"introduction": 120, "alltag": 40}
+    # Drop hits whose L2 distance exceeds this (None keeps all; NaN distances are kept)
+    rag_context_max_distance: float | None = None
+
+    # RAG artifact releases: poll interval for hot-swapping (0 disables polling)
+    rag_release_poll_seconds: float = 30
+    # Token for /api/admin endpoints (empty disables them)
+    admin_token: str = ""
+
     @computed_field
     @property
     def database_url(self) -> str:
@@ -0,0 +1,237 @@
+"""Token-budgeted RAG context assembly.
+
+검색 결과를 프롬프트용 컨텍스트 문자열로 만들 때 엔드포인트별 토큰 예산을 지킨다.
+
+- 거리 임계값보다 먼 결과는 버린다 (거리가 없는 어휘 검색 결과는 유지).
+- introduction/alltag처럼 긴 필드는 필드별 토큰 한도로 자른다 (가능하면 문장 경계).
+- 예산을 넘는 결과는 남은 예산에 맞게 introduction을 더 줄이고, 그래도 넘으면
+  그 결과부터 제외한다 (검색 순위가 높은 결과를 우선).
+
+토큰 수는 tiktoken의 gpt-4o 인코딩으로 계산하고 같은 문자열의 토큰 수는 캐시한다.
+인코딩 파일은 이미지 빌드 시 TIKTOKEN_CACHE_DIR에 받아 두며(Dockerfile), 파일을
+불러오지 못한 경우에만 보수적인 문자 기반 추정치로 계산한다.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+import tiktoken
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHAT_MODEL = "gpt-4o"
+FIELDS = ("title", "introduction", "alltag", "address")
+ELLIPSIS = "…"
+# 남은 예산이 이보다 적으면 introduction을 줄여 넣지 않고 결과를 제외
+MIN_INTRODUCTION_TOKENS = 16
+
+_SENTENCE_END = re.compile(r"[.!?。](?=\s|$)")
+
+
+@functools.lru_cache(maxsize=1)
+def load_encoding() -> tiktoken.Encoding | None:
+    """
+    gpt-4o 토크나이저를 한 번만 불러온다 (실패하면 None).
+
+    인코딩 파일이 TIKTOKEN_CACHE_DIR에 없으면 내려받으므로 블로킹 I/O이며,
+    앱 시작 시(lifespan) 스레드에서 미리 호출한다.
+    """
+    try:
+        return tiktoken.encoding_for_model(CHAT_MODEL)
+    except Exception:
+        logger.warning(
+            "tiktoken 인코딩 로드 실패 - 토큰 수를 추정합니다", exc_info=True
+        )
+        return None
+
+
+def _estimate_tokens(text: str) -> int:
+    """ASCII는 4자당 1토큰, 그 외(한글 등)는 1자당 1토큰으로 보수적으로 추정."""
+    ascii_chars = sum(ch.isascii() for ch in text)
+    return math.ceil(ascii_chars / 4) + len(text) - ascii_chars
+
+
+def _count(text: str) -> int:
+    encoding = load_encoding()
+    if encoding is None:
+        return _estimate_tokens(text)
+    return len(encoding.encode(text))
+
+
+@functools.lru_cache(maxsize=8192)
+def count_tokens(text: str) -> int:
+    """문자열의 토큰 수 (같은 문자열은 캐시)."""
+    return _count(text) if text else 0
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    text를 max_tokens 이하로 자른다 (잘린 경우 끝에 "…").
+
+    한도 안에 들어가는 가장 긴 접두사를 이분 탐색으로 찾고, 그 뒤쪽 절반 안에
+    문장 끝이 있으면 문장 경계에서 자른다.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if _count(text[:mid].rstrip() + ELLIPSIS) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    prefix = text[:low].rstrip()
+    if not prefix:
+        return ""
+
+    sentence_ends = [m.end() for m in _SENTENCE_END.finditer(prefix)]
+    if sentence_ends and sentence_ends[-1] >= len(prefix) // 2:
+        return prefix[: sentence_ends[-1]]
+    return prefix + ELLIPSIS
+
+
+def format_hit(item: dict[str, Any]) -> str:
+    """검색 결과 한 건을 컨텍스트 한 줄로 변환한다."""
+    return " | ".join(item.get(name, "") or "" for name in FIELDS)
+
+
+@dataclass(frozen=True)
+class ContextBudget:
+    """컨텍스트 토큰 예산 (None이면 제한 없음)."""
+
+    max_tokens: int | None = None
+    field_max_tokens: dict[str, int] = field(default_factory=dict)
+    max_distance: float | None = None
+
+
+@dataclass(frozen=True)
+class BudgetedContext:
+    """예산을 적용한 컨텍스트와 적용 전후 토큰 수."""
+
+    text: str
+    tokens: int
+    original_tokens: int
+    hits: int
+    dropped: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.tokens
+
+
+def budget_for(endpoint: str | None) -> ContextBudget:
+    """엔드포인트별 예산 (settings.rag_context_token_budgets에 없으면 제한 없음)."""
+    max_tokens = settings.rag_context_token_budgets.get(endpoint or "")
+    return ContextBudget(
+        max_tokens=max_tokens or None,
+        field_max_tokens=settings.rag_context_field_max_tokens,
+        max_distance=settings.rag_context_max_distance,
+    )
+
+
+def _within_distance(item: dict[str, Any], max_distance: float | None) -> bool:
+    distance = item.get("distance")
+    if max_distance is None or distance is None or not math.isfinite(distance):
+        return True
+    return distance <= max_distance
+
+
+def build_budgeted_context(
+    results: list[dict[str, Any]], budget: ContextBudget
+) -> BudgetedContext:
+    """
+    검색 결과를 예산 안의 컨텍스트 문자열(한 줄에 한 건)로 변환한다.
+
+    Args:
+        results: 검색 순위 순의 결과 (title/introduction/alltag/address/distance)
+        budget: 토큰 예산, 필드별 토큰 한도, 거리 임계값
+
+    Returns:
+        컨텍스트와 예산 적용 전(필드 전체를 넣었을 때) 대비 토큰 수
+    """
+    original_tokens = count_tokens("\n".join(format_hit(item) for item in results))
+    limit = budget.max_tokens
+
+    lines: list[str] = []
+    used = 0
+    for item in results:
+        if not _within_distance(item, budget.max_distance):
+            continue
+        hit = {
+            name: truncate_tokens(
+                item.get(name, "") or "", budget.field_max_tokens[name]
+            )
+            if name in budget.field_max_tokens
+            else item.get(name, "") or ""
+            for name in FIELDS
+        }
+        separator = 1 if lines else 0  # 줄바꿈
+        line = format_hit(hit)
+        if limit is not None and used + separator + count_tokens(line) > limit:
+            # 남은 예산에 맞게 introduction을 줄여서라도 넣음
+            room = limit - used - separator
+            room -= count_tokens(format_hit({**hit, "introduction": ""}))
+            if room < MIN_INTRODUCTION_TOKENS:
+                break
+            hit["introduction"] = truncate_tokens(hit["introduction"], room)
+            line = format_hit(hit)
+            if used + separator + count_tokens(line) > limit:
+                break
+        lines.append(line)
+        used += separator + count_tokens(line)
+
+    # 줄 경계에서 토큰이 합쳐져 추정과 다를 수 있으므로 최종 문자열로 확인
+    text = "\n".join(lines)
+    while limit is not None and lines and count_tokens(text) > limit:
+        lines.pop()
+        text = "\n".join(lines)
+
+    return BudgetedContext(
+        text=text,
+        tokens=count_tokens(text),
+        original_tokens=original_tokens,
+        hits=len(lines),
+        dropped=len(results) - len(lines),
+    )
+
+
+class ContextTokenStats:
+    """컨텍스트 예산 적용 누적 통계 (/api/health/metrics)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.contexts = 0
+        self.original_tokens = 0
+        self.tokens = 0
+        self.dropped_hits = 0
+
+    def record(self, context: BudgetedContext) -> None:
+        with self._lock:
+            self.contexts += 1
+            self.original_tokens += context.original_tokens
+            self.tokens += context.tokens
+            self.dropped_hits += context.dropped
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "contexts": self.contexts,
+            "original_tokens": self.original_tokens,
+            "tokens": self.tokens,
+            "saved_tokens": self.original_tokens - self.tokens,
+            "dropped_hits": self.dropped_hits,
+        }
+
+
+context_token_stats = ContextTokenStats()
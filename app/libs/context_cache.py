@@ -0,0 +1,91 @@
+"""LRU + TTL cache of formatted RAG context strings."""
+
+from __future__ import annotations
+
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+from app.core.config import settings
+
+
+def normalize_query(query: str) -> str:
+    """유니코드(NFKC)와 공백 차이를 없앤 캐시 키용 쿼리."""
+    return " ".join(unicodedata.normalize("NFKC", query).split())
+
+
+class ContextCache:
+    """
+    검색 결과를 포매팅한 컨텍스트 문자열을 보관하는 LRU + TTL 캐시.
+
+    max_entries를 넘으면 가장 오래 쓰지 않은 항목부터 제거하고,
+    ttl_seconds가 지난 항목은 조회 시점에 만료 처리한다. 요청 처리(이벤트 루프)와
+    retriever 로드/교체(워커 스레드)가 함께 쓰므로 모든 연산을 잠금 안에서 수행한다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> str | None:
+        """Return the cached context, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, context: str) -> None:
+        """Store a context string, evicting least recently used entries."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, context)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. when a new index artifact is loaded)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._entries)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": size,
+        }
+
+
+context_cache = ContextCache(
+    max_entries=settings.rag_context_cache_size,
+    ttl_seconds=settings.rag_context_cache_ttl_seconds,
+)
@@ -0,0 +1,118 @@
+"""Canonical RAG query keys built from experience-plan request fields."""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+# 프롬프트의 <allowed_categories>와 동일한 다섯 가지 체험 유형
+ALLOWED_CATEGORIES = ("돌담", "감귤", "해녀", "요리", "목공")
+
+# 체험 유형별 동의어 (NFKC + casefold 후 단어 경계 일치, 앞의 항목이 우선)
+# 단어 앞부분과 일치하면 매칭하므로("해녀가", "cooking") 다른 단어의 앞부분이
+# 되기 쉬운 한 음절/일반 명사("돌" → "돌고래", "바다", "나무", "밥", "빵")는 두지 않는다.
+CATEGORY_SYNONYMS: dict[str, tuple[str, ...]] = {
+    "돌담": ("돌담", "stone", "돌쌓기", "돌 쌓기", "현무암", "석공", "밭담"),
+    "감귤": ("감귤", "tangerine", "citrus", "한라봉", "천혜향", "귤", "과수원"),
+    "해녀": ("해녀", "haenyeo", "물질", "잠수", "diver", "diving", "해산물"),
+    "요리": ("요리", "cooking", "cook", "쿠킹", "조리", "음식"),
+    "목공": ("목공", "woodworking", "wood", "목수", "목재", "가구"),
+}
+
+# (상한 미포함, 라벨) - 경력 연수 구간
+YEARS_BUCKETS = (
+    (1, "경력 1년 미만"),
+    (3, "경력 1~2년"),
+    (6, "경력 3~5년"),
+    (10, "경력 6~9년"),
+    (20, "경력 10~19년"),
+)
+YEARS_TOP_BUCKET = "경력 20년 이상"
+
+_MATERIAL_SEPARATORS = re.compile(r"[,、/;·\n]+")  # NFKC 이후 기준
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def normalize_text(text: str) -> str:
+    """NFKC 정규화 후 구두점/기호를 공백으로 바꾸고 공백을 하나로 합친다."""
+    text = unicodedata.normalize("NFKC", text)
+    text = "".join(
+        " " if unicodedata.category(ch)[0] in ("P", "S") else ch for ch in text
+    )
+    return " ".join(text.split())
+
+
+def _contains_words(words: list[str], synonym: tuple[str, ...]) -> bool:
+    """synonym 단어들이 words에 연속으로 있는지 (마지막 단어는 앞부분 일치, 조사 허용)."""
+    *head, last = synonym
+    return any(
+        words[i : i + len(head)] == head and words[i + len(head)].startswith(last)
+        for i in range(len(words) - len(head))
+    )
+
+
+_SYNONYM_WORDS = {
+    name: tuple(tuple(synonym.split()) for synonym in synonyms)
+    for name, synonyms in CATEGORY_SYNONYMS.items()
+}
+
+
+def canonical_category(category: str) -> str:
+    """입력 체험 유형을 허용된 다섯 가지 중 하나로 매핑 (매핑 불가 시 정규화 텍스트)."""
+    text = normalize_text(category).casefold()
+    if text in ALLOWED_CATEGORIES:
+        return text
+    words = text.split()
+    for name, synonyms in _SYNONYM_WORDS.items():
+        if any(_contains_words(words, synonym) for synonym in synonyms):
+            return name
+    return text
+
+
+def bucket_years(years_of_experience: str) -> str:
+    """경력 연수를 구간 라벨로 변환 ("20년", "20" → "경력 20년 이상")."""
+    text = unicodedata.normalize("NFKC", years_of_experience)
+    match = _NUMBER.search(text)
+    if match is None:
+        return normalize_text(text)
+    years = float(match.group())
+    for upper, label in YEARS_BUCKETS:
+        if years < upper:
+            return label
+    return YEARS_TOP_BUCKET
+
+
+def canonical_materials(materials: str) -> str:
+    """재료 목록을 토큰 단위로 정규화·중복 제거·정렬 ("테왁, 망사리" == "망사리,테왁")."""
+    tokens = {
+        normalize_text(token).casefold()
+        for token in _MATERIAL_SEPARATORS.split(
+            unicodedata.normalize("NFKC", materials)
+        )
+    }
+    return ", ".join(sorted(token for token in tokens if token))
+
+
+def canonicalize_query(
+    category: str,
+    years_of_experience: str | None = None,
+    job_description: str | None = None,
+    materials: str | None = None,
+    location: str | None = None,
+) -> str:
+    """
+    요청 필드로 안정적인 RAG 쿼리 키를 만든다.
+
+    공백·구두점·유니코드 표기, 재료 순서, 경력 연수 차이가 같은 쿼리로 모여
+    임베딩 캐시와 컨텍스트 캐시 적중률을 높인다. None인 필드는 생략한다.
+    """
+    parts = [canonical_category(category)]
+    if years_of_experience is not None:
+        parts.append(bucket_years(years_of_experience))
+    if job_description is not None:
+        parts.append(normalize_text(job_description))
+    if materials is not None:
+        parts.append(canonical_materials(materials))
+    if location is not None:
+        parts.append(normalize_text(location))
+    return " ".join(part for part in parts if part)
@@ -0,0 +1,246 @@
+"""Process-wide RAG retriever managed by the application lifespan."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.libs import single_flight
+from app.libs.context_budget import (
+    budget_for,
+    build_budgeted_context,
+    context_token_stats,
+    format_hit,
+)
+from app.libs.context_cache import context_cache, normalize_query
+from app.libs.query_canonicalizer import canonical_category
+
+if TYPE_CHECKING:  # pragma: no cover - import-time side effects guarded
+    from llm.rag_retriever import RAGRetriever
+
+logger = logging.getLogger(__name__)
+
+_retriever: RAGRetriever | None = None
+_release_version: str | None = None  # 로드한 아티팩트 릴리스 (릴리스가 아니면 None)
+_reload_lock = threading.Lock()
+
+
+def _releases_dir(releases_dir: str | Path | None) -> Path:
+    from llm import config
+
+    return Path(releases_dir) if releases_dir is not None else config.RELEASES_DIR
+
+
+def load_rag_retriever(
+    index_path: str | Path | None = None,
+    metadata_path: str | Path | None = None,
+    releases_dir: str | Path | None = None,
+) -> RAGRetriever | None:
+    """
+    FAISS 인덱스와 메타데이터를 한 번만 로드해 싱글톤으로 보관한다.
+
+    경로를 지정하지 않으면 현재 아티팩트 릴리스(llm/artifact_release.py)를,
+    릴리스가 없으면 기본 경로를 로드한다. 인덱스 파일이 없거나 로딩에
+    실패하면 None을 보관하여 엔드포인트가 기본 프롬프트로 동작하도록 한다.
+    """
+    global _retriever, _release_version
+    # 새 인덱스를 로드하면 이전 인덱스로 만든 컨텍스트는 무효
+    context_cache.clear()
+    _release_version = None
+    try:
+        from llm.artifact_release import current_release, verify_release
+        from llm.rag_retriever import RAGRetriever
+
+        release = None
+        if index_path is None and metadata_path is None:
+            release = current_release(_releases_dir(releases_dir))
+        if release is not None:
+            verify_release(release)
+            index_path, metadata_path = release.index_path, release.metadata_path
+        _retriever = RAGRetriever(index_path, metadata_path)
+    except Exception:
+        logger.warning("RAG retriever 로드 실패 - RAG 없이 동작합니다", exc_info=True)
+        _retriever = None
+        return None
+
+    _release_version = release.version if release is not None else None
+    logger.info(f"RAG retriever 준비 완료 ({_retriever.load_time_ms:.1f}ms)")
+    return _retriever
+
+
+def reload_rag_retriever(
+    releases_dir: str | Path | None = None, force: bool = False
+) -> dict[str, Any]:
+    """
+    현재 아티팩트 릴리스가 로드된 버전과 다르면 새 retriever로 교체한다.
+
+    새 retriever는 호출 스레드에서 체크섬 검증 후 로드하고, 완료되면 싱글톤
+    참조만 바꾼다. 처리 중인 요청은 이미 받은 이전 retriever로 끝까지 동작하며,
+    로드에 실패하면 이전 retriever를 그대로 유지한다. 블로킹 함수이므로
+    이벤트 루프에서는 asyncio.to_thread로 호출한다.
+
+    Returns:
+        swapped(교체 여부), error(실패 사유) 및 rag_status() 내용
+    """
+    global _retriever, _release_version
+    with _reload_lock:
+        from llm.artifact_release import current_release, verify_release
+        from llm.rag_retriever import RAGRetriever
+
+        try:
+            release = current_release(_releases_dir(releases_dir))
+            if release is None or (release.version == _release_version and not force):
+                return {"swapped": False, **rag_status()}
+            verify_release(release)
+            retriever = RAGRetriever(release.index_path, release.metadata_path)
+        except Exception as e:
+            logger.warning("RAG 릴리스 교체 실패 - 이전 버전 유지", exc_info=True)
+            return {"swapped": False, "error": str(e), **rag_status()}
+
+        previous = _release_version
+        _retriever, _release_version = retriever, release.version
+        context_cache.clear()
+
+    logger.info(
+        f"RAG 릴리스 교체: {previous} → {release.version} "
+        f"({retriever.load_time_ms:.1f}ms)"
+    )
+    return {"swapped": True, **rag_status()}
+
+
+async def watch_rag_releases(
+    interval_s: float, releases_dir: str | Path | None = None
+) -> None:
+    """interval_s마다 현재 릴리스를 확인해 바뀌었으면 백그라운드에서 교체한다."""
+    while True:
+        await asyncio.sleep(interval_s)
+        await asyncio.to_thread(reload_rag_retriever, releases_dir)
+
+
+def rag_status() -> dict[str, Any]:
+    """로드된 retriever의 릴리스/인덱스 버전"""
+    retriever = _retriever
+    return {
+        "release": _release_version,
+        "index_version": retriever.index_version if retriever else None,
+        "load_time_ms": retriever.load_time_ms if retriever else None,
+    }
+
+
+def get_rag_retriever() -> RAGRetriever | None:
+    """Return the preloaded RAGRetriever (None if RAG is unavailable)."""
+    return _retriever
+
+
+def close_rag_retriever() -> None:
+    """Release the preloaded RAGRetriever."""
+    global _retriever, _release_version
+    if _retriever is not None:
+        from llm.rag_retriever import flush_embedding_cache
+
+        # 캐시 히트 순서를 기록해 재시작 후에도 LRU 순서 유지
+        flush_embedding_cache()
+    _retriever = None
+    _release_version = None
+    context_cache.clear()
+
+
+def format_rag_context(results: list[dict]) -> str:
+    """검색 결과를 프롬프트용 컨텍스트 문자열(한 줄에 한 건)로 변환한다."""
+    return "\n".join(format_hit(item) for item in results)
+
+
+def budgeted_rag_context(results: list[dict], endpoint: str | None = None) -> str:
+    """
+    검색 결과를 엔드포인트별 토큰 예산 안의 컨텍스트 문자열로 변환한다.
+
+    거리 임계값을 넘는 결과를 버리고 긴 필드를 자르며(app/libs/context_budget.py),
+    예산 적용 전후 토큰 수를 로그와 /api/health/metrics에 남긴다.
+    """
+    context = build_budgeted_context(results, budget_for(endpoint))
+    context_token_stats.record(context)
+    logger.info(
+        f"RAG 컨텍스트 토큰 - 엔드포인트: {endpoint}, "
+        f"{context.original_tokens} → {context.tokens} "
+        f"(절약 {context.saved_tokens}), 결과: {context.hits}/{len(results)}"
+    )
+    return context.text
+
+
+def precomputed_rag_context(
+    retriever: RAGRetriever,
+    category: str,
+    details: str = "",
+    top_k: int = 3,
+    endpoint: str | None = None,
+) -> str | None:
+    """
+    build_index가 체험 유형과 직업/재료 패턴 조합별로 미리 계산한 컨텍스트를 반환한다.
+
+    임베딩 호출과 FAISS 검색이 없으며, 사전 계산 결과가 없거나, 체험 유형이
+    허용된 다섯 가지로 매핑되지 않거나, details가 어떤 패턴과도 맞지 않으면
+    None을 반환한다.
+    """
+    contexts = retriever.precomputed_contexts
+    if contexts is None:
+        return None
+    results = contexts.lookup(canonical_category(category), details, top_k)
+    return None if results is None else budgeted_rag_context(results, endpoint)
+
+
+async def build_rag_context(
+    retriever: RAGRetriever,
+    query: str,
+    top_k: int = 3,
+    location: str | None = None,
+    category: str | None = None,
+    details: str = "",
+    endpoint: str | None = None,
+) -> str:
+    """
+    비동기 검색 결과를 프롬프트용 컨텍스트 문자열로 변환한다.
+
+    category가 주어지고 location으로 검색 범위가 바뀌지 않으면 사전 계산
+    컨텍스트(category, details)를 먼저 사용한다. location이 지역/좌표로
+    해석되면 그 지역 문서만 검색하고 가까운 순으로 재순위한다. 컨텍스트는
+    endpoint별 토큰 예산에 맞춰 만들고, (정규화한 쿼리, top_k, location 해석
+    결과, 인덱스 버전, endpoint)별로 완성된 문자열을 캐시하며, 검색 실패 시
+    빈 문자열을 반환하여 기본 프롬프트로 폴백한다(캐시하지 않음).
+    """
+    # 같은 지역/좌표로 해석되는 location끼리 캐시/검색을 공유
+    location_key = retriever.location_key(location) if location else None
+    if category is not None and location_key is None:
+        precomputed = precomputed_rag_context(
+            retriever, category, details, top_k, endpoint
+        )
+        if precomputed is not None:
+            return precomputed
+
+    normalized = normalize_query(query)
+    cache_key = (
+        normalized,
+        top_k,
+        location_key,
+        retriever.index_version,
+        endpoint,
+    )
+    cached = context_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        # 동일 쿼리(캐시 키와 같은 정규화 기준)의 동시 검색은 하나의 임베딩/검색으로 병합
+        results = await single_flight.get_group("rag_retrieval").do(
+            (id(retriever), normalized, top_k, location_key),
+            lambda: retriever.aretrieve(query=query, top_k=top_k, location=location),
+        )
+    except Exception:
+        logger.warning("RAG 검색 실패 - 컨텍스트 없이 진행합니다", exc_info=True)
+        return ""
+
+    context = budgeted_rag_context(results, endpoint)
+    context_cache.put(cache_key, context)
+    return context
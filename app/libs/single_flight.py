@@ -0,0 +1,74 @@
+"""Single-flight deduplication of identical in-flight async work."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    동일 키로 동시에 들어온 작업을 하나로 합친다.
+
+    첫 호출자(leader)가 작업을 시작하고, 작업이 끝나기 전에 같은 키로 들어온
+    호출자는 같은 결과(또는 예외)를 공유한다. leader가 취소되어도 공유 작업은
+    계속 진행되어 나머지 호출자에게 결과를 전달한다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` once per key among concurrent callers and share its result."""
+        self.calls += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.debug(f"single-flight[{self.name}] 요청 병합")
+        else:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 호출자가 취소된 경우에도 예외가 "never retrieved"로 남지 않게 소비
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        """Return call/coalesce counters."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
+
+
+_groups: dict[str, SingleFlight] = {}
+
+
+def get_group(name: str) -> SingleFlight:
+    """Return the process-wide SingleFlight group for ``name``."""
+    group = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name)
+    return group
+
+
+def stats() -> dict[str, dict[str, int]]:
+    """Return counters of every SingleFlight group."""
+    return {name: group.stats() for name, group in _groups.items()}
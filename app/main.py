@@ -1,11 +1,39 @@
 """Main FastAPI application entry point."""
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routes import classes, experience_plan, health, heroes, users
+from app.api.routes import admin, classes, experience_plan, health, heroes, users
 from app.core.auth import WadeulwadeulAuthMiddleware
 from app.core.config import settings
+from app.libs import context_budget, rag
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Preload shared resources once per worker process."""
+    # FAISS 인덱스/메타데이터 로딩은 블로킹 I/O이므로 스레드에서 수행
+    await asyncio.to_thread(rag.load_rag_retriever)
+    # RAG 컨텍스트 토큰 예산용 토크나이저 (인코딩 파일 로드)
+    await asyncio.to_thread(context_budget.load_encoding)
+    # 새 아티팩트 릴리스가 배포되면 재시작 없이 교체
+    watcher = (
+        asyncio.create_task(rag.watch_rag_releases(settings.rag_release_poll_seconds))
+        if settings.rag_release_poll_seconds > 0
+        else None
+    )
+    yield
+    if watcher is not None:
+        watcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await watcher
+    rag.close_rag_retriever()
+
 
 app = FastAPI(
     title=settings.app_name,
@@ -14,6 +42,7 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 # CORS middleware configuration
@@ -30,6 +59,7 @@ app.add_middleware(WadeulwadeulAuthMiddleware)
 
 # Include routers - 모든 엔드포인트는 /api로 시작
 app.include_router(health.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
 app.include_router(heroes.router, prefix="/api/v1")
 app.include_router(users.router, prefix="/api/v1")
 app.include_router(classes.router, prefix="/api/v1")
@@ -0,0 +1,164 @@
+"""버전별 RAG 아티팩트 릴리스
+
+build_index가 만든 런타임 아티팩트(FAISS 인덱스, 메타데이터, 어휘/지역/공간
+인덱스, 사전 계산 결과)를 ``<릴리스 디렉터리>/<버전>/``에 복사하고, 파일별
+sha256/크기를 담은 ``manifest.json``을 함께 씁니다. 마지막으로 현재 릴리스를
+가리키는 ``CURRENT`` 파일을 원자적으로(rename) 교체합니다.
+
+런타임(app/libs/rag.py)은 ``CURRENT``를 주기적으로 확인하여, 버전이 바뀌면
+체크섬을 검증한 뒤 백그라운드에서 새 RAGRetriever를 로드하고 참조를 교체합니다.
+릴리스 디렉터리는 한 번 만들어지면 수정하지 않으므로, 이전 버전으로 처리 중인
+요청은 끝까지 이전 파일을 사용합니다.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+MANIFEST_NAME = "manifest.json"
+CURRENT_NAME = "CURRENT"
+
+
+@dataclass(frozen=True)
+class Release:
+    """릴리스 한 개 (manifest.json 내용 포함)"""
+
+    version: str
+    directory: Path
+    manifest: dict[str, Any]
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / self.manifest["index"]
+
+    @property
+    def metadata_path(self) -> Path:
+        return self.directory / self.manifest["metadata"]
+
+
+def file_sha256(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def publish_release(
+    releases_dir: str | Path,
+    index_path: str | Path,
+    metadata_path: str | Path,
+    files: list[str | Path] | None = None,
+    info: dict[str, Any] | None = None,
+    keep: int = 3,
+) -> Release:
+    """아티팩트를 새 버전 디렉터리로 복사하고 CURRENT를 그 버전으로 교체
+
+    파일은 mtime을 유지하여 복사하므로(copy2) 인덱스 버전(index_version)으로
+    검증하는 사전 계산 결과도 그대로 유효합니다.
+
+    Args:
+        releases_dir: 릴리스 디렉터리
+        index_path: FAISS 인덱스 파일
+        metadata_path: 메타데이터 JSON 파일
+        files: 함께 배포할 부속 아티팩트 (없는 파일은 건너뜀)
+        info: manifest에 함께 기록할 빌드 정보 (모델, 인덱스 타입 등)
+        keep: 남겨둘 최근 릴리스 수 (현재 릴리스는 항상 유지)
+    """
+    releases_dir = Path(releases_dir)
+    releases_dir.mkdir(parents=True, exist_ok=True)
+    sources = [Path(index_path), Path(metadata_path)]
+    sources += [Path(p) for p in files or () if Path(p).exists()]
+
+    checksums = {path.name: file_sha256(path) for path in sources}
+    digest = hashlib.sha256(json.dumps(checksums, sort_keys=True).encode()).hexdigest()
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{digest[:8]}"
+
+    # 임시 디렉터리에 모두 쓴 뒤 rename (반쯤 복사된 릴리스가 보이지 않음)
+    staging = releases_dir / f".{version}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+    for path in sources:
+        shutil.copy2(path, staging / path.name)
+    manifest = {
+        "version": version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "index": sources[0].name,
+        "metadata": sources[1].name,
+        "files": {
+            path.name: {"sha256": checksums[path.name], "size": path.stat().st_size}
+            for path in sources
+        },
+        **(info or {}),
+    }
+    (staging / MANIFEST_NAME).write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    directory = releases_dir / version
+    if directory.exists():  # 같은 내용을 같은 초에 다시 배포
+        shutil.rmtree(staging)
+    else:
+        os.replace(staging, directory)
+    _write_atomic(releases_dir / CURRENT_NAME, version + "\n")
+
+    prune_releases(releases_dir, keep)
+    return Release(version, directory, manifest)
+
+
+def current_version(releases_dir: str | Path) -> str | None:
+    """CURRENT가 가리키는 버전 (릴리스가 없으면 None)"""
+    try:
+        version = (Path(releases_dir) / CURRENT_NAME).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    return version.strip() or None
+
+
+def load_release(releases_dir: str | Path, version: str) -> Release:
+    directory = Path(releases_dir) / version
+    manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    return Release(version, directory, manifest)
+
+
+def current_release(releases_dir: str | Path) -> Release | None:
+    """현재 릴리스 (없으면 None)"""
+    version = current_version(releases_dir)
+    return None if version is None else load_release(releases_dir, version)
+
+
+def verify_release(release: Release) -> None:
+    """manifest의 크기/sha256과 파일이 일치하는지 검증 (불일치 시 ValueError)"""
+    for name, expected in release.manifest["files"].items():
+        path = release.directory / name
+        if not path.exists():
+            raise ValueError(f"릴리스 {release.version}: {name} 없음")
+        if path.stat().st_size != expected["size"]:
+            raise ValueError(f"릴리스 {release.version}: {name} 크기 불일치")
+        if file_sha256(path) != expected["sha256"]:
+            raise ValueError(f"릴리스 {release.version}: {name} 체크섬 불일치")
+
+
+def prune_releases(releases_dir: str | Path, keep: int) -> list[str]:
+    """최근 keep개와 현재 릴리스를 제외한 릴리스 삭제 (삭제한 버전 반환)"""
+    releases_dir = Path(releases_dir)
+    current = current_version(releases_dir)
+    versions = sorted(
+        p.name
+        for p in releases_dir.iterdir()
+        if p.is_dir() and not p.name.startswith(".")
+    )
+    stale = [v for v in versions[: max(len(versions) - keep, 0)] if v != current]
+    for version in stale:
+        shutil.rmtree(releases_dir / version, ignore_errors=True)
+    return stale
@@ -0,0 +1,715 @@
+"""RAG 검색 스택 벤치마크
+
+사용법:
+    python -m llm.benchmark index                 # 현재 인덱스의 벡터로 인덱스 타입 비교
+    python -m llm.benchmark index --synthetic 5000 --output report.json
+    python -m llm.benchmark dimensions --dimensions 256 512 1536
+    python -m llm.benchmark metadata              # JSON vs 컬럼형 메타데이터 저장소
+    python -m llm.benchmark query-keys --log requests.jsonl
+    python -m llm.benchmark --output retrieval.json retrieval --queries queries.jsonl
+
+index: 인덱스 타입(flat/hnsw/ivf/fp16/sq8/pq)별 메모리, 검색 지연시간,
+       IndexFlatL2 대비 recall@k 비교
+dimensions: 축소 임베딩 차원(text-embedding-3 dimensions)별 flat 인덱스의 메모리,
+            검색 지연시간, 기본 차원 검색 대비 recall@k 비교 (현재 인덱스 벡터를
+            앞 성분만 남기고 재정규화, API의 축소 벡터와 같은 방식)
+metadata: 메타데이터 로드 시간, 상주 메모리(RSS / 프로세스 전용 메모리),
+          행 조회 지연시간 비교 (측정마다 새 프로세스에서 실행)
+query-keys: 요청 로그를 재생하여 원본 쿼리 vs 정규화 쿼리(canonicalize_query)의
+            캐시 적중률 비교 (--log가 없으면 합성 요청 로그 사용)
+retrieval: 쿼리 코퍼스를 RAGRetriever.aretrieve로 재생하여 단계별
+           (resolve/embed/search/format) p50/p95/p99를 cold(빈 임베딩 캐시) /
+           warm(캐시 적중)으로 나눠 측정하고 TARGET_SEARCH_TIME_MS 충족 여부와
+           어휘 검색 폴백 횟수 기록. 임베딩은 네트워크 없는 stub (hashed 임베딩,
+           --embed-latency-ms로 API 지연 모사, --concurrency로 동시 요청)
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import faiss
+import numpy as np
+
+from app.libs.query_canonicalizer import canonicalize_query
+from llm import config
+from llm.embedding_backend import HashedNgramEmbeddingBackend, shorten_embeddings
+from llm.index_factory import (
+    INDEX_TYPES,
+    create_index,
+    evaluate_index,
+    index_memory_bytes,
+    latency_stats,
+    measure_latency,
+    recall_at_k,
+)
+from llm.metadata_store import (
+    MetadataStore,
+    convert_json_metadata,
+    extract_fields,
+    load_metadata,
+)
+
+
+def load_index_vectors(index_path: Path) -> np.ndarray:
+    """전수 탐색(flat) 인덱스에 저장된 원본 벡터를 (N, D)로 복원"""
+    index = faiss.read_index(str(index_path))
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def sample_queries(
+    embeddings: np.ndarray, num_queries: int, noise: float = 0.01, seed: int = 0
+) -> np.ndarray:
+    """문서 벡터를 샘플링하고 작은 잡음을 더해 평가 쿼리 생성"""
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(len(embeddings), size=min(num_queries, len(embeddings)))
+    queries = embeddings[sample] + rng.normal(0, noise, embeddings[sample].shape)
+    return queries.astype(np.float32)
+
+
+def compare_index_types(
+    embeddings: np.ndarray,
+    index_types: tuple[str, ...] = INDEX_TYPES,
+    num_queries: int = 200,
+    top_k: int = 10,
+    **index_options: Any,
+) -> list[dict[str, Any]]:
+    """인덱스 타입별 메모리/빌드 시간/지연시간/recall 비교 리포트"""
+    queries = sample_queries(embeddings, num_queries)
+    reference, _ = create_index(embeddings, "flat")
+    flat_bytes = index_memory_bytes(reference)
+
+    rows = []
+    for index_type in index_types:
+        start = time.perf_counter()
+        index, params = create_index(embeddings, index_type, **index_options)
+        build_s = time.perf_counter() - start
+
+        memory_bytes = index_memory_bytes(index)
+        rows.append(
+            {
+                "index_type": index_type,
+                "params": params,
+                "memory_bytes": memory_bytes,
+                "memory_ratio": memory_bytes / flat_bytes,
+                "build_s": build_s,
+                **evaluate_index(
+                    index,
+                    reference,
+                    queries,
+                    top_k=top_k,
+                    target_ms=config.TARGET_SEARCH_TIME_MS,
+                ),
+            }
+        )
+    return rows
+
+
+def print_index_table(rows: list[dict[str, Any]]) -> None:
+    print(
+        f"{'type':<6} {'memory':>10} {'ratio':>6} {'recall@k':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for row in rows:
+        latency = row["latency_ms"]
+        print(
+            f"{row['index_type']:<6} {row['memory_bytes'] / 2**20:>8.2f}MB "
+            f"{row['memory_ratio']:>6.2f} {row['recall_at_k']:>9.4f} "
+            f"{latency['p50']:>8.3f} {latency['p95']:>8.3f} {latency['p99']:>8.3f}"
+        )
+
+
+def _load_embeddings(args: argparse.Namespace) -> tuple[np.ndarray, str]:
+    """--synthetic N이면 정규화된 랜덤 벡터, 아니면 --index의 벡터"""
+    if args.synthetic:
+        rng = np.random.default_rng(0)
+        embeddings = rng.standard_normal(
+            (args.synthetic, config.EMBEDDING_DIMENSION)
+        ).astype(np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings, f"synthetic:{args.synthetic}"
+    return load_index_vectors(args.index), str(args.index)
+
+
+def run_index_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    embeddings, source = _load_embeddings(args)
+    rows = compare_index_types(
+        embeddings,
+        tuple(args.types),
+        num_queries=args.queries,
+        top_k=args.top_k,
+        pq_m=args.pq_m,
+    )
+    print(f"[INFO] source = {source}, vectors = {embeddings.shape}")
+    print_index_table(rows)
+    return {"benchmark": "index", "source": source, "results": rows}
+
+
+def compare_dimensions(
+    embeddings: np.ndarray,
+    dimensions: tuple[int, ...],
+    num_queries: int = 200,
+    top_k: int = 10,
+) -> list[dict[str, Any]]:
+    """축소 차원별 flat 인덱스의 메모리/지연시간/기본 차원 대비 recall 비교 리포트
+
+    정답은 원본(기본 차원) 벡터의 전수 탐색 결과이며, 축소 차원 인덱스와 쿼리는
+    shorten_embeddings(앞 성분 + 재정규화)로 만듭니다.
+    """
+    full_dimension = embeddings.shape[1]
+    if max(dimensions) > full_dimension:
+        raise ValueError(f"차원은 원본 차원({full_dimension}) 이하여야 합니다")
+
+    queries = sample_queries(embeddings, num_queries)
+    reference, _ = create_index(embeddings, "flat")
+    ground_truth, _ = measure_latency(reference, queries, top_k)
+    full_bytes = index_memory_bytes(reference)
+
+    rows = []
+    for dimension in dimensions:
+        index, _ = create_index(shorten_embeddings(embeddings, dimension), "flat")
+        found, latency = measure_latency(
+            index, shorten_embeddings(queries, dimension), top_k
+        )
+        memory_bytes = index_memory_bytes(index)
+        rows.append(
+            {
+                "dimension": dimension,
+                "vector_bytes": dimension * np.dtype(np.float32).itemsize,
+                "memory_bytes": memory_bytes,
+                "memory_ratio": memory_bytes / full_bytes,
+                "num_queries": len(queries),
+                "top_k": top_k,
+                "recall_at_k": recall_at_k(found, ground_truth),
+                "latency_ms": latency,
+                "within_target": latency["p99"] <= config.TARGET_SEARCH_TIME_MS,
+            }
+        )
+    return rows
+
+
+def run_dimensions_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    embeddings, source = _load_embeddings(args)
+    rows = compare_dimensions(
+        embeddings,
+        tuple(args.dimensions),
+        num_queries=args.queries,
+        top_k=args.top_k,
+    )
+    print(f"[INFO] source = {source}, vectors = {embeddings.shape}")
+    print(
+        f"{'dim':>5} {'memory':>10} {'ratio':>6} {'vector':>7} {'recall@k':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for row in rows:
+        latency = row["latency_ms"]
+        print(
+            f"{row['dimension']:>5} {row['memory_bytes'] / 2**20:>8.2f}MB "
+            f"{row['memory_ratio']:>6.2f} {row['vector_bytes']:>6}B "
+            f"{row['recall_at_k']:>9.4f} {latency['p50']:>8.3f} "
+            f"{latency['p95']:>8.3f} {latency['p99']:>8.3f}"
+        )
+    return {"benchmark": "dimensions", "source": source, "results": rows}
+
+
+def _memory_mb() -> dict[str, float]:
+    """현재 프로세스의 RSS와 전용(anonymous) 메모리 (MB)"""
+    status = {}
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in ("VmRSS", "RssAnon"):
+                    status[name] = int(value.split()[0]) / 1024
+    except OSError:
+        # /proc이 없는 환경: 최대 RSS로 대체 (Linux 기준 KB)
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        status = {"VmRSS": maxrss, "RssAnon": maxrss}
+    return {"rss": status["VmRSS"], "private": status.get("RssAnon", status["VmRSS"])}
+
+
+def _measure_metadata(kind: str, path: str, lookups: int) -> dict[str, Any]:
+    """새 프로세스에서 메타데이터를 로드하고 행 조회를 측정"""
+    rows = np.random.default_rng(0).integers(0, 2**31, size=lookups)
+    before = _memory_mb()
+    start = time.perf_counter()
+    if kind == "json":
+        with open(path, encoding="utf-8") as f:
+            items = json.load(f)["items"]
+    else:
+        items = MetadataStore(path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for i in (rows % len(items)).tolist():
+        if kind == "json":
+            extract_fields(items[i])
+        else:
+            items.row(i)
+    lookup_us = (time.perf_counter() - start) * 1e6 / max(lookups, 1)
+
+    after = _memory_mb()
+    return {
+        "format": kind,
+        "items": len(items),
+        "load_ms": load_ms,
+        "rss_mb": after["rss"] - before["rss"],
+        "private_mb": after["private"] - before["private"],
+        "lookup_us": lookup_us,
+    }
+
+
+def compare_metadata_formats(
+    metadata_path: Path, lookups: int = 1000
+) -> list[dict[str, Any]]:
+    """JSON items 로드와 컬럼형 저장소(memory-map)의 로드 비용 비교"""
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = Path(tmp_dir) / metadata_path.name
+        json_path.write_bytes(metadata_path.read_bytes())
+        store_path = convert_json_metadata(json_path)
+
+        rows = []
+        for kind, path in (("json", json_path), ("store", store_path)):
+            with ctx.Pool(1) as pool:
+                row = pool.apply(_measure_metadata, (kind, str(path), lookups))
+            row["file_bytes"] = path.stat().st_size
+            rows.append(row)
+    return rows
+
+
+def run_metadata_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    rows = compare_metadata_formats(args.metadata, lookups=args.lookups)
+    print(f"[INFO] source = {args.metadata}, items = {rows[0]['items']}")
+    print(
+        f"{'format':<6} {'file':>10} {'load ms':>9} {'rss':>9} "
+        f"{'private':>9} {'lookup us':>10}"
+    )
+    for row in rows:
+        print(
+            f"{row['format']:<6} {row['file_bytes'] / 2**20:>8.2f}MB "
+            f"{row['load_ms']:>9.2f} {row['rss_mb']:>7.2f}MB "
+            f"{row['private_mb']:>7.2f}MB {row['lookup_us']:>10.2f}"
+        )
+    return {"benchmark": "metadata", "source": str(args.metadata), "results": rows}
+
+
+# 합성 요청 로그용 페르소나 (category, job_description, materials, location)
+_PERSONAS = (
+    ("해녀", "제주 해녀", ("테왁", "망사리", "물안경"), "구좌읍"),
+    ("돌담", "제주도 돌담 장인", ("현무암", "장갑", "망치"), "애월읍"),
+    ("감귤", "감귤 농장주", ("감귤 가위", "바구니", "장갑"), "남원읍"),
+    ("요리", "제주 향토 요리사", ("보리", "메밀가루", "고사리"), "조천읍"),
+    ("목공", "목수", ("나무", "사포", "끌"), "안덕면"),
+)
+_CATEGORY_SPELLINGS = {
+    "해녀": ("해녀", "Haenyeo", "해녀 체험", "해녀 물질"),
+    "돌담": ("돌담", "stone", "돌담 쌓기", "Stone wall"),
+    "감귤": ("감귤", "tangerine", "감귤 따기", "귤"),
+    "요리": ("요리", "cooking", "향토 요리", "Cooking class"),
+    "목공": ("목공", "woodworking", "목공 체험", "Wood"),
+}
+
+
+def synthetic_request_log(num_requests: int = 1000, seed: int = 0) -> list[dict]:
+    """표기/공백/재료 순서/경력 연수만 다른 체험 계획 요청 로그 생성
+
+    canonicalize_query가 흡수하도록 만든 차이만 들어 있으므로, 이 로그로 잰
+    적중률은 실제 요청 로그에서 기대할 수 있는 값의 상한입니다.
+    """
+    rng = random.Random(seed)
+
+    def noisy(text: str) -> str:
+        text = text.replace(" ", " " * rng.choice((1, 1, 2)))
+        return rng.choice(("", " ")) + text + rng.choice(("", " ", ".", "!"))
+
+    log = []
+    for _ in range(num_requests):
+        category, job, materials, location = rng.choice(_PERSONAS)
+        picked = list(materials)
+        rng.shuffle(picked)
+        if rng.random() < 0.2:
+            picked.append(picked[0])
+        years = rng.randint(1, 30)
+        log.append(
+            {
+                "category": rng.choice(_CATEGORY_SPELLINGS[category]),
+                "years_of_experience": rng.choice((f"{years}", f"{years}년")),
+                "job_description": noisy(job),
+                "materials": rng.choice((", ", ",", " / ", "、")).join(picked),
+                "location": noisy(location),
+            }
+        )
+    return log
+
+
+def compare_query_keys(requests: list[dict]) -> dict[str, Any]:
+    """원본 쿼리 vs 정규화 쿼리의 캐시 적중률 (무제한 캐시 재생, 첫 등장만 미스)"""
+    fields = ("category", "years_of_experience", "job_description", "materials")
+    keys = {
+        "raw": [" ".join([*(r[f] for f in fields), r["location"]]) for r in requests],
+        "canonical": [
+            canonicalize_query(**{f: r[f] for f in (*fields, "location")})
+            for r in requests
+        ],
+    }
+    report: dict[str, Any] = {"requests": len(requests)}
+    for name, values in keys.items():
+        unique = len(set(values))
+        report[name] = {
+            "unique_keys": unique,
+            "hit_rate": (len(values) - unique) / len(values) if values else 0.0,
+        }
+    return report
+
+
+def run_query_keys_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    if args.log:
+        with args.log.open(encoding="utf-8") as f:
+            requests = [json.loads(line) for line in f if line.strip()]
+        source = str(args.log)
+    else:
+        requests = synthetic_request_log(args.requests)
+        source = f"synthetic:{args.requests}"
+
+    report = compare_query_keys(requests)
+    print(f"[INFO] source = {source}, requests = {report['requests']}")
+    if not args.log:
+        # 정규화 규칙이 흡수하는 표기 차이만으로 만든 로그라 적중률의 상한에 가까움
+        print(
+            "[WARN] synthetic log built from spelling variants the canonicalizer "
+            "handles - hit rate is an upper bound, replay real requests with --log"
+        )
+    for name in ("raw", "canonical"):
+        print(
+            f"{name:<9} unique keys {report[name]['unique_keys']:>6}  "
+            f"hit rate {report[name]['hit_rate']:.1%}"
+        )
+    return {
+        "benchmark": "query-keys",
+        "source": source,
+        "synthetic": not args.log,
+        **report,
+    }
+
+
+class StubEmbeddingBackend:
+    """벤치마크용 임베딩 백엔드 (네트워크 없음)
+
+    인덱스의 embedding_model 이름과 차원을 그대로 쓰는 hashed 임베딩이며,
+    latency_ms를 주면 호출마다 그만큼 대기하여 API 지연을 모사합니다.
+    """
+
+    def __init__(self, model: str, dimension: int, latency_ms: float = 0.0):
+        self.model = model
+        self.dimension = dimension
+        self.latency_s = latency_ms / 1000
+        self.calls = 0
+        self._hashed = HashedNgramEmbeddingBackend(dimension)
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        self.calls += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return self._hashed.embed(texts)
+
+    async def aembed(self, texts: list[str]) -> np.ndarray:
+        self.calls += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return self._hashed.embed(texts)
+
+
+def load_query_corpus(path: Path | None, num_queries: int) -> list[dict[str, Any]]:
+    """{"query", "location"} 목록
+
+    path가 .jsonl이면 한 줄에 {"query", "location"?} 또는 체험 계획 요청 payload,
+    그 외에는 한 줄에 쿼리 하나. 없으면 합성 요청 로그를 정규화한 쿼리 사용.
+    """
+    if path is None:
+        requests = synthetic_request_log(num_queries)
+    elif path.suffix == ".jsonl":
+        with path.open(encoding="utf-8") as f:
+            requests = [json.loads(line) for line in f if line.strip()]
+    else:
+        with path.open(encoding="utf-8") as f:
+            return [
+                {"query": line.strip(), "location": None} for line in f if line.strip()
+            ]
+
+    fields = ("category", "years_of_experience", "job_description", "materials")
+    return [
+        {
+            "query": r.get("query")
+            or canonicalize_query(**{f: r.get(f) for f in fields}),
+            "location": r.get("location"),
+        }
+        for r in requests
+    ]
+
+
+@contextlib.contextmanager
+def _stub_embeddings(backend: StubEmbeddingBackend, cache_dir: Path) -> Iterator[None]:
+    """임베딩 백엔드를 stub으로, 쿼리 임베딩 캐시를 빈 임시 캐시로 교체"""
+    from llm import rag_retriever
+
+    saved = (
+        rag_retriever.EMBEDDING_CACHE_STORE_PATH,
+        rag_retriever.EMBEDDING_CACHE_PATH,
+        config.PERFORMANCE_WARMUP_QUERIES,
+    )
+    rag_retriever.EMBEDDING_CACHE_STORE_PATH = cache_dir / "embedding_cache"
+    rag_retriever.EMBEDDING_CACHE_PATH = cache_dir / "embedding_cache.json"
+    config.PERFORMANCE_WARMUP_QUERIES = []
+    rag_retriever.set_embedding_backend(backend)
+    try:
+        yield
+    finally:
+        rag_retriever.set_embedding_backend(None)
+        (
+            rag_retriever.EMBEDDING_CACHE_STORE_PATH,
+            rag_retriever.EMBEDDING_CACHE_PATH,
+            config.PERFORMANCE_WARMUP_QUERIES,
+        ) = saved
+
+
+RETRIEVAL_STAGES = ("resolve", "embed", "search", "format", "total")
+
+
+async def _replay(
+    retriever: Any, corpus: list[dict[str, Any]], top_k: int, concurrency: int = 1
+) -> dict:
+    """코퍼스를 RAGRetriever.aretrieve로 한 번 재생하며 쿼리별 단계 지연시간(ms) 측정
+
+    단계 시간은 aretrieve 안에서 기록되므로 임베딩 캐시, 마이크로 배칭(동시 요청의
+    같은 쿼리는 한 번만 임베딩), EMBEDDING_TIMEOUT_MS 초과 시 어휘 검색 폴백이
+    서비스와 같은 경로로 측정됩니다. concurrency개씩 동시에 요청합니다.
+    """
+
+    async def run(entry: dict[str, Any]) -> dict[str, float]:
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+        await retriever.aretrieve(
+            entry["query"], top_k, entry["location"], timings=timings
+        )
+        timings["total"] = (time.perf_counter() - start) * 1000
+        return timings
+
+    stages: dict[str, list[float]] = {name: [] for name in RETRIEVAL_STAGES}
+    fallbacks = retriever.lexical_fallbacks
+    for offset in range(0, len(corpus), concurrency):
+        window = corpus[offset : offset + concurrency]
+        for timings in await asyncio.gather(*(run(entry) for entry in window)):
+            for name, values in stages.items():
+                values.append(timings[name])
+
+    report: dict[str, Any] = {
+        name: latency_stats(values) for name, values in stages.items()
+    }
+    report["within_target"] = report["total"]["p99"] <= config.TARGET_SEARCH_TIME_MS
+    report["lexical_fallbacks"] = retriever.lexical_fallbacks - fallbacks
+    return report
+
+
+async def _replay_cold_warm(
+    retriever: Any,
+    backend: StubEmbeddingBackend,
+    corpus: list[dict[str, Any]],
+    top_k: int,
+    concurrency: int,
+) -> tuple[dict, dict]:
+    """같은 이벤트 루프에서 cold/warm 두 번 재생 (임베딩 배처가 루프에 묶임)"""
+    cold = await _replay(retriever, corpus, top_k, concurrency)
+    cold["embed_calls"] = backend.calls
+    warm = await _replay(retriever, corpus, top_k, concurrency)
+    warm["embed_calls"] = backend.calls - cold["embed_calls"]
+    return cold, warm
+
+
+def benchmark_retrieval(
+    index_path: Path,
+    metadata_path: Path,
+    corpus: list[dict[str, Any]],
+    top_k: int = 3,
+    embed_latency_ms: float = 0.0,
+    concurrency: int = 1,
+) -> dict[str, Any]:
+    """RAGRetriever 로드 시간과 cold/warm 단계별 지연시간 리포트
+
+    cold: 빈 쿼리 임베딩 캐시에서 코퍼스 첫 재생 (중복 쿼리는 두 번째부터 캐시 적중)
+    warm: 같은 코퍼스 재생 (모든 쿼리 임베딩이 캐시에 있음)
+    """
+    from llm.rag_retriever import RAGRetriever
+
+    _, embedding_model, _ = load_metadata(metadata_path)
+    dimension = faiss.read_index(str(index_path)).d
+    backend = StubEmbeddingBackend(embedding_model, dimension, embed_latency_ms)
+
+    with (
+        tempfile.TemporaryDirectory() as cache_dir,
+        _stub_embeddings(backend, Path(cache_dir)),
+    ):
+        start = time.perf_counter()
+        retriever = RAGRetriever(index_path, metadata_path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        cold, warm = asyncio.run(
+            _replay_cold_warm(retriever, backend, corpus, top_k, concurrency)
+        )
+
+    return {
+        "index": str(index_path),
+        "index_type": retriever.index_type,
+        "vectors": int(retriever.index.ntotal),
+        "queries": len(corpus),
+        "unique_queries": len({entry["query"] for entry in corpus}),
+        "top_k": top_k,
+        "embed_latency_ms": embed_latency_ms,
+        "embed_timeout_ms": config.EMBEDDING_TIMEOUT_MS,
+        "concurrency": concurrency,
+        "target_ms": config.TARGET_SEARCH_TIME_MS,
+        "load_ms": load_ms,
+        "cold": cold,
+        "warm": warm,
+    }
+
+
+def print_retrieval_table(report: dict[str, Any]) -> None:
+    print(f"{'pass':<5} {'stage':<7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name in ("cold", "warm"):
+        for stage in RETRIEVAL_STAGES:
+            latency = report[name][stage]
+            print(
+                f"{name:<5} {stage:<7} {latency['p50']:>8.3f} "
+                f"{latency['p95']:>8.3f} {latency['p99']:>8.3f}"
+            )
+    print(
+        f"[INFO] load {report['load_ms']:.1f}ms, "
+        f"target {report['target_ms']}ms (p99 total): "
+        f"cold {report['cold']['within_target']}, warm {report['warm']['within_target']}"
+    )
+    fallbacks = (
+        report["cold"]["lexical_fallbacks"] + report["warm"]["lexical_fallbacks"]
+    )
+    if fallbacks:
+        print(
+            f"[WARN] 임베딩 시간 초과/실패로 어휘 검색 폴백 {fallbacks}회 "
+            f"(EMBEDDING_TIMEOUT_MS = {report['embed_timeout_ms']})"
+        )
+
+
+def run_retrieval_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    corpus = load_query_corpus(args.queries, args.num_queries)
+    report = benchmark_retrieval(
+        args.index,
+        args.metadata,
+        corpus,
+        top_k=args.top_k,
+        embed_latency_ms=args.embed_latency_ms,
+        concurrency=args.concurrency,
+    )
+    source = str(args.queries) if args.queries else f"synthetic:{args.num_queries}"
+    print(f"[INFO] source = {source}, queries = {len(corpus)}")
+    print_retrieval_table(report)
+    return {"benchmark": "retrieval", "source": source, **report}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="RAG 검색 스택 벤치마크")
+    parser.add_argument("--output", type=Path, help="JSON 결과 저장 경로")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser("index", help="인덱스 타입 비교")
+    index_parser.add_argument("--index", type=Path, default=config.INDEX_PATH)
+    index_parser.add_argument(
+        "--synthetic", type=int, default=0, help="N개의 랜덤 벡터로 비교"
+    )
+    index_parser.add_argument(
+        "--types", nargs="+", choices=INDEX_TYPES, default=list(INDEX_TYPES)
+    )
+    index_parser.add_argument("--queries", type=int, default=200)
+    index_parser.add_argument("--top-k", type=int, default=10)
+    index_parser.add_argument(
+        "--pq-m", type=int, default=None, help="기본: 차원의 약수 중 96 이하 최대값"
+    )
+    index_parser.set_defaults(run=run_index_benchmark)
+
+    dimensions_parser = subparsers.add_parser(
+        "dimensions", help="축소 임베딩 차원별 recall/지연시간/메모리 비교"
+    )
+    dimensions_parser.add_argument("--index", type=Path, default=config.INDEX_PATH)
+    dimensions_parser.add_argument(
+        "--synthetic", type=int, default=0, help="N개의 랜덤 벡터로 비교"
+    )
+    dimensions_parser.add_argument(
+        "--dimensions",
+        nargs="+",
+        type=int,
+        default=[256, 512, config.EMBEDDING_DIMENSION],
+    )
+    dimensions_parser.add_argument("--queries", type=int, default=200)
+    dimensions_parser.add_argument("--top-k", type=int, default=10)
+    dimensions_parser.set_defaults(run=run_dimensions_benchmark)
+
+    metadata_parser = subparsers.add_parser(
+        "metadata", help="JSON vs 컬럼형 메타데이터 저장소 비교"
+    )
+    metadata_parser.add_argument("--metadata", type=Path, default=config.METADATA_PATH)
+    metadata_parser.add_argument("--lookups", type=int, default=1000)
+    metadata_parser.set_defaults(run=run_metadata_benchmark)
+
+    query_keys_parser = subparsers.add_parser(
+        "query-keys", help="원본 vs 정규화 쿼리 캐시 적중률 비교"
+    )
+    query_keys_parser.add_argument(
+        "--log", type=Path, help="요청 payload JSONL (한 줄에 요청 하나)"
+    )
+    query_keys_parser.add_argument(
+        "--requests", type=int, default=1000, help="합성 로그 요청 수"
+    )
+    query_keys_parser.set_defaults(run=run_query_keys_benchmark)
+
+    retrieval_parser = subparsers.add_parser(
+        "retrieval", help="RAGRetriever 단계별 지연시간 (stub 임베딩, cold/warm)"
+    )
+    retrieval_parser.add_argument("--index", type=Path, default=config.INDEX_PATH)
+    retrieval_parser.add_argument("--metadata", type=Path, default=config.METADATA_PATH)
+    retrieval_parser.add_argument(
+        "--queries", type=Path, help="쿼리 코퍼스 (.jsonl 또는 한 줄에 쿼리 하나)"
+    )
+    retrieval_parser.add_argument(
+        "--num-queries", type=int, default=500, help="합성 코퍼스 쿼리 수"
+    )
+    retrieval_parser.add_argument("--top-k", type=int, default=config.DEFAULT_TOP_K)
+    retrieval_parser.add_argument(
+        "--embed-latency-ms", type=float, default=0.0, help="stub 임베딩 호출당 지연"
+    )
+    retrieval_parser.add_argument(
+        "--concurrency", type=int, default=1, help="동시에 보내는 요청 수"
+    )
+    retrieval_parser.set_defaults(run=run_retrieval_benchmark)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    args = parse_args(argv)
+    result = args.run(args)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"[INFO] Saved benchmark result to {args.output}")
+    return result
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
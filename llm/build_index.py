@@ -1,34 +1,69 @@
+import argparse
+import asyncio
+import contextlib
 import json
 import os
 from pathlib import Path
 
 import faiss
 import numpy as np
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from llm import config
+from llm.artifact_release import publish_release
+from llm.embedding_backend import (
+    EMBEDDING_BACKENDS,
+    cache_path_for_model,
+    create_embedding_backend,
+    embedding_key,
+)
+from llm.embedding_cache import EmbeddingCacheStore
+from llm.embedding_jobs import BatchCheckpoint, checkpoint_dir_for, embed_batches
+from llm.geo_index import GeoIndex, geo_path_for
+from llm.incremental_index import (
+    BuildState,
+    content_hash,
+    dedupe_items,
+    diff_items,
+    document_key,
+)
+from llm.index_factory import (
+    INDEX_TYPES,
+    check_pq_m,
+    create_index,
+    enable_reconstruct,
+    evaluate_index,
+    index_version,
+)
+from llm.lexical_index import LexicalIndex, lexical_path_for
+from llm.metadata_store import store_path_for, write_metadata_store
+from llm.precomputed_contexts import (
+    context_query,
+    contexts_path_for,
+    save_precomputed_contexts,
+)
+from llm.rag_retriever import format_batch_results, hybrid_search, mmr_rerank
+from llm.region_filter import build_region_index, region_path_for, save_region_index
 
 # ---------- 경로 & 설정 ----------
 DATA_PATH = Path("llm/output/visitjeju_workshops.json")  # 이미 저장해 둔 파일
 INDEX_PATH = Path("llm/output/visitjeju_faiss.index")  # FAISS 인덱스 저장 위치
 # 메타데이터(원본 items) 저장 위치
 META_PATH = Path("llm/output/visitjeju_metadata.json")
-CACHE_PATH = config.EMBEDDING_CACHE_PATH
-
-EMBEDDING_MODEL = "text-embedding-3-small"  # OpenAI 임베딩 모델
-_client: OpenAI | None = None
-# ---------------------------------
-
-
-def _get_client() -> OpenAI:
-    """Lazy OpenAI 클라이언트 생성 (ENV 미설정 시 명시적 예외)."""
-    global _client
-    if _client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY is required to build index")
-        _client = OpenAI(api_key=api_key)
-    return _client
+# 런타임이 memory-map 하는 메타데이터 저장소 (llm/metadata_store.py 참고)
+META_STORE_PATH = store_path_for(META_PATH)
+# recall/latency 리포트 저장 위치
+REPORT_PATH = Path("llm/output/visitjeju_index_report.json")
+CACHE_STORE_PATH = config.EMBEDDING_CACHE_STORE_PATH
+CACHE_PATH = config.EMBEDDING_CACHE_PATH  # 이전 JSON 캐시 (변환용)
+DOC_STORE_PATH = config.DOCUMENT_EMBEDDING_STORE_PATH  # 문서 임베딩 저장소
+
+# 임베딩 백엔드 (openai/hashed)와 축소 차원 (None이면 기본 차원), use_embedding_backend로 변경
+EMBEDDING_BACKEND = config.EMBEDDING_BACKEND
+EMBEDDING_DIMENSIONS = config.EMBEDDING_DIMENSIONS
+EMBEDDING_MODEL = create_embedding_backend(
+    EMBEDDING_BACKEND, dimensions=EMBEDDING_DIMENSIONS
+).model
 # ---------------------------------
 
 
@@ -60,56 +95,318 @@ def build_text(item: dict) -> str:
     return "\n".join(p for p in parts if p.strip())
 
 
+def use_embedding_backend(name: str, dimensions: int | None = None) -> None:
+    """빌드에 사용할 임베딩 백엔드/차원 선택 (EMBEDDING_MODEL도 백엔드의 모델 이름으로)"""
+    global EMBEDDING_BACKEND, EMBEDDING_DIMENSIONS, EMBEDDING_MODEL
+    EMBEDDING_BACKEND = name
+    EMBEDDING_DIMENSIONS = dimensions
+    EMBEDDING_MODEL = create_embedding_backend(name, dimensions=dimensions).model
+
+
+def _create_backend(async_client=None):
+    return create_embedding_backend(
+        EMBEDDING_BACKEND,
+        EMBEDDING_MODEL,
+        async_client=async_client,
+        dimensions=EMBEDDING_DIMENSIONS,
+    )
+
+
+def _embedding_key() -> str:
+    """문서 저장소/쿼리 캐시/체크포인트 키 (축소 차원이면 모델@차원)"""
+    return embedding_key(EMBEDDING_MODEL, _create_backend().dimension)
+
+
+def _new_async_client() -> AsyncOpenAI:
+    """빌드용 AsyncOpenAI 클라이언트 (재시도는 embed_batches에서 처리)"""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY is required to build index")
+    return AsyncOpenAI(api_key=api_key, max_retries=0)
+
+
+async def _aembed_texts(texts, batch_size: int) -> np.ndarray:
+    if not texts:
+        return np.array([], dtype="float32")
+    checkpoint = BatchCheckpoint(checkpoint_dir_for(INDEX_PATH), _embedding_key())
+    async with contextlib.AsyncExitStack() as stack:
+        client = None
+        if EMBEDDING_BACKEND == "openai":
+            client = await stack.enter_async_context(_new_async_client())
+        backend = _create_backend(async_client=lambda: client)
+        embeddings = await embed_batches(
+            backend.aembed,
+            texts,
+            batch_size=batch_size,
+            concurrency=config.EMBEDDING_BUILD_CONCURRENCY,
+            checkpoint=checkpoint,
+            max_retries=config.EMBEDDING_BUILD_MAX_RETRIES,
+            retry_base_s=config.EMBEDDING_BUILD_RETRY_BASE_S,
+        )
+    # 모든 배치가 끝났으면 체크포인트는 더 필요 없음
+    checkpoint.clear()
+    return embeddings
+
+
 def embed_texts(texts, batch_size: int = 64) -> np.ndarray:
     """
     여러 개의 텍스트를 배치로 나눠 임베딩 → (N, D) float32 numpy 배열로 반환.
+
+    배치는 최대 config.EMBEDDING_BUILD_CONCURRENCY개씩 동시에 요청하고,
+    rate limit은 백오프 후 재시도한다. 완료된 배치는 체크포인트로 저장되어
+    빌드가 중간에 실패해도 다시 실행하면 남은 배치만 요청한다
+    (llm/embedding_jobs.py 참고).
+    """
+    # FAISS는 float32를 요구합니다.
+    return asyncio.run(_aembed_texts(list(texts), batch_size))
+
+
+def _embed_with_store(
+    store: EmbeddingCacheStore, keys: list[str], texts: list[str]
+) -> np.ndarray:
+    """store에 없는 텍스트만 embed_texts로 임베딩해 저장하고 (N, D) 반환 (입력 순서)"""
+    if not keys:
+        return np.array([], dtype="float32")
+    missing = {
+        key: text for key, text in zip(keys, texts, strict=True) if key not in store
+    }
+    if missing:
+        store.put_many(
+            list(missing),
+            embed_texts(list(missing.values()), batch_size=config.BATCH_SIZE),
+        )
+    return np.stack([store.get(key) for key in keys])
+
+
+def embed_documents(texts: list[str]) -> np.ndarray:
+    """
+    문서 텍스트(build_text) 임베딩 → (N, D) float32 numpy 배열.
+
+    임베딩 모델 + 텍스트 해시로 키를 잡은 문서 임베딩 저장소
+    (config.DOCUMENT_EMBEDDING_STORE_PATH)에 없는 텍스트만 API로 임베딩한다.
+    """
+    store = EmbeddingCacheStore(DOC_STORE_PATH)
+    keys = [document_key(text, _embedding_key()) for text in texts]
+    cached = sum(key in store for key in set(keys))
+    embeddings = _embed_with_store(store, keys, texts)
+    print(
+        f"[INFO] Document embeddings: {cached} from store, "
+        f"{len(set(keys)) - cached} embedded"
+    )
+    return embeddings
+
+
+def embed_items(items: list, incremental: bool = False) -> np.ndarray:
+    """
+    items를 item 순서대로 임베딩 → (N, D) float32 numpy 배열로 반환.
+
+    contentsid로 키를 잡은 벡터 저장소와 매니페스트(llm/incremental_index.py)를
+    새 버전으로 함께 저장한다. incremental=True이면 이전 빌드와 build_text
+    해시를 비교해 추가/변경된 item만 임베딩하고 삭제된 item은 제거한다.
     """
-    vectors = []
-
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i : i + batch_size]
-        # OpenAI 공식 예제와 동일한 방식으로 embeddings.create 사용 :contentReference[oaicite:8]{index=8}
-        resp = _get_client().embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=batch,
-            encoding_format="float",  # float 벡터로 받기
+    texts = [build_text(it) for it in items]
+    hashes = {
+        it["contentsid"]: content_hash(text)
+        for it, text in zip(items, texts, strict=True)
+    }
+
+    previous = BuildState.load(INDEX_PATH)
+    model = _embedding_key()
+    if previous is None:
+        incremental = False
+    elif incremental and previous.embedding_model != model:
+        print(
+            f"[WARN] Previous build used {previous.embedding_model}, "
+            "re-embedding all items"
+        )
+        incremental = False
+    version = previous.version if previous is not None else 0
+
+    diff = diff_items(previous.hashes if incremental else {}, hashes)
+    text_by_id = dict(zip(hashes, texts, strict=True))
+    embeddings = embed_documents([text_by_id[c] for c in diff.to_embed])
+
+    if incremental:
+        state = previous
+    else:
+        dimension = (
+            embeddings.shape[1] if embeddings.ndim == 2 else _create_backend().dimension
         )
+        state = BuildState.empty(dimension, model)
+        state.version = version
+    state.apply(diff, hashes, embeddings)
+    state.save(INDEX_PATH, diff.summary())
+
+    changes = ", ".join(f"{k}={v}" for k, v in diff.summary().items())
+    print(f"[INFO] Build version {state.version}: {changes}")
+    return state.embeddings_for(items)
 
-        for d in resp.data:
-            vectors.append(d.embedding)
 
-    # FAISS는 float32를 요구합니다. :contentReference[oaicite:9]{index=9}
-    return np.array(vectors, dtype="float32")
+@contextlib.contextmanager
+def _replaced_atomically(path: Path):
+    """같은 디렉터리의 임시 파일 경로를 넘겨주고, 기록이 끝나면 path로 rename
+
+    기존 파일을 제자리에서 덮어쓰지 않으므로 그 파일을 memory-map 한 워커는
+    이전 inode를 계속 읽고(SIGBUS 없음), 다음 로드부터 새 파일을 씁니다.
+    확장자를 유지하므로 np.savez처럼 확장자를 붙이는 저장 함수에도 그대로 쓸 수 있습니다.
+    """
+    tmp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
 
-def build_and_save_index(embeddings: np.ndarray, items: list):
+def build_and_save_index(
+    embeddings: np.ndarray, items: list, index_type: str = "flat", **index_options
+) -> faiss.Index:
     """
-    FAISS IndexFlatL2 인덱스를 생성하고, 인덱스 + 원본 items를 디스크에 저장
+    FAISS 인덱스(flat/hnsw/ivf/fp16/sq8/pq)를 생성하고, 인덱스 + 원본 items +
+    어휘/지역/공간 인덱스를 디스크에 저장
     """
     # embeddings shape: (N, D)
-    _, d = embeddings.shape
     print(f"[INFO] embeddings shape = {embeddings.shape}")
 
-    # 1) IndexFlatL2 생성 (L2 거리 기반 정확 검색) :contentReference[oaicite:11]{index=11}
-    index = faiss.IndexFlatL2(d)
-    assert index.is_trained
-    index.add(embeddings)  # 내부적으로 데이터를 복사해서 저장
+    # 1) 인덱스 생성 (flat: L2 거리 기반 정확 검색, hnsw/ivf: 근사 검색)
+    index, params = create_index(embeddings, index_type, **index_options)
 
-    # 2) 인덱스 파일로 저장
-    faiss.write_index(index, str(INDEX_PATH))
+    # 2) 인덱스 파일로 저장 (INDEX_MMAP으로 로드한 워커가 있으므로 임시 파일 → rename)
+    with _replaced_atomically(INDEX_PATH) as tmp_path:
+        faiss.write_index(index, str(tmp_path))
 
-    # 3) 원본 items + 모델 정보도 함께 저장 (RAG 시 메타 활용)
+    # 3) 원본 items + 모델/인덱스 정보도 함께 저장
+    # (런타임이 인덱스 타입/파라미터를 읽고, 쿼리 임베딩 차원을 검증)
     meta = {
         "embedding_model": EMBEDDING_MODEL,
+        "index": {"type": index_type, "params": params, "dimension": index.d},
         "items": items,  # 순서 중요: 0번째 벡터 ↔ 0번째 item
     }
-    META_PATH.write_text(
-        json.dumps(meta, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+    with _replaced_atomically(META_PATH) as tmp_path:
+        tmp_path.write_text(
+            json.dumps(meta, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    # 4) 워커들이 memory-map으로 공유할 바이너리 메타데이터 저장소
+    write_metadata_store(META_STORE_PATH, items, EMBEDDING_MODEL, meta["index"])
+
+    # 5) 하이브리드 검색/임베딩 장애 폴백용 BM25 어휘 인덱스 (인덱스 파일 옆에 저장)
+    lexical_path = lexical_path_for(INDEX_PATH)
+    with _replaced_atomically(lexical_path) as tmp_path:
+        LexicalIndex.build(items).save(tmp_path)
+
+    # 6) location 필터 검색용 지역 → 문서 id 인덱스
+    region_path = region_path_for(INDEX_PATH)
+    with _replaced_atomically(region_path) as tmp_path:
+        save_region_index(tmp_path, build_region_index(items))
+
+    # 7) 거리 기반 재순위용 공간 인덱스 + 주소 지명 좌표 사전
+    geo_path = geo_path_for(INDEX_PATH)
+    with _replaced_atomically(geo_path) as tmp_path:
+        GeoIndex.build(items, cell_km=config.GEO_CELL_KM).save(tmp_path)
+
+    print(f"[INFO] Saved FAISS {index_type} index to {INDEX_PATH} ({params})")
+    print(f"[INFO] Saved metadata to {META_PATH}, {META_STORE_PATH}")
+    print(f"[INFO] Saved lexical index to {lexical_path}")
+    print(f"[INFO] Saved region index to {region_path}")
+    print(f"[INFO] Saved geo index to {geo_path}")
+    return index
+
+
+def write_index_report(
+    index: faiss.Index,
+    embeddings: np.ndarray,
+    index_type: str,
+    num_queries: int = 200,
+    top_k: int = 10,
+) -> dict:
+    """
+    전수 탐색(IndexFlatL2) 대비 recall@k와 쿼리당 지연시간 리포트를 저장
+    (평가 쿼리는 문서 임베딩에서 샘플링)
+    """
+    rng = np.random.default_rng(0)
+    sample = rng.choice(
+        len(embeddings), size=min(num_queries, len(embeddings)), replace=False
+    )
+
+    reference, _ = create_index(embeddings, "flat")
+    report = {
+        "index_type": index_type,
+        "ntotal": int(index.ntotal),
+        **evaluate_index(
+            index,
+            reference,
+            embeddings[sample],
+            top_k=min(top_k, len(embeddings)),
+            target_ms=config.TARGET_SEARCH_TIME_MS,
+        ),
+    }
+
+    REPORT_PATH.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    latency = report["latency_ms"]
+    print(
+        f"[INFO] recall@{report['top_k']} = {report['recall_at_k']:.4f}, "
+        f"latency p50/p95/p99 = {latency['p50']:.3f}/{latency['p95']:.3f}/"
+        f"{latency['p99']:.3f}ms (flat p50 {report['reference_latency_ms']['p50']:.3f}ms, "
+        f"target {config.TARGET_SEARCH_TIME_MS}ms)"
+    )
+    print(f"[INFO] Saved index report to {REPORT_PATH}")
+    return report
+
+
+def write_precomputed_contexts(index: faiss.Index, items: list) -> None:
+    """
+    체험 유형과 자주 쓰는 직업/재료 패턴 조합별 top-k 검색 결과를 미리 계산해 저장
+    (런타임은 임베딩/검색 없이 사용, config.PRECOMPUTED_CONTEXT_PATTERNS 참고)
+    """
+    keys = [
+        (category, pattern)
+        for category, patterns in config.PRECOMPUTED_CONTEXT_PATTERNS.items()
+        for pattern in patterns
+    ]
+    if not keys:
+        return
+
+    top_k = config.PRECOMPUTED_CONTEXT_TOP_K
+    queries = [context_query(category, pattern) for category, pattern in keys]
+    # 런타임과 같은 하이브리드(벡터 + BM25) 검색 (+ MMR 재순위)
+    lexical_index = LexicalIndex.load(lexical_path_for(INDEX_PATH))
+    query_vectors = embed_queries(queries)
+    pool_k = max(top_k, config.MMR_CANDIDATES) if config.MMR_RERANK else top_k
+    distances, indices = hybrid_search(
+        index, lexical_index, query_vectors, queries, pool_k
+    )
+    if config.MMR_RERANK:
+        enable_reconstruct(index)
+        distances, indices = mmr_rerank(index, query_vectors, distances, indices, top_k)
+    results = format_batch_results(distances, indices, items)
+
+    contexts_path = contexts_path_for(INDEX_PATH)
+    with _replaced_atomically(contexts_path) as tmp_path:
+        save_precomputed_contexts(
+            tmp_path,
+            [(*key, rows) for key, rows in zip(keys, results, strict=True)],
+            top_k,
+            index_version(INDEX_PATH),
+        )
+    print(f"[INFO] Saved {len(keys)} precomputed contexts to {contexts_path}")
+
+
+def _load_query_cache() -> EmbeddingCacheStore:
+    """런타임과 같은 (백엔드 모델별) 쿼리 임베딩 캐시"""
+    return EmbeddingCacheStore(
+        cache_path_for_model(CACHE_STORE_PATH, _embedding_key()),
+        max_entries=config.EMBEDDING_CACHE_MAX_ENTRIES,
+        legacy_json_path=(
+            CACHE_PATH if _embedding_key() == config.EMBEDDING_MODEL else None
+        ),
     )
 
-    print(f"[INFO] Saved FAISS index to {INDEX_PATH}")
-    print(f"[INFO] Saved metadata to {META_PATH}")
+
+def embed_queries(queries: list[str]) -> np.ndarray:
+    """쿼리 임베딩 (런타임과 같은 쿼리 임베딩 캐시에 없는 쿼리만 API 호출)"""
+    return _embed_with_store(_load_query_cache(), queries, queries)
 
 
 def prewarm_embedding_cache() -> None:
@@ -119,42 +416,109 @@ def prewarm_embedding_cache() -> None:
     if not warmup_queries:
         return
 
-    if CACHE_PATH.exists():
-        try:
-            cache = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            cache = {}
-    else:
-        cache = {}
-
-    queries_to_embed = [q for q in warmup_queries if q not in cache]
-    if not queries_to_embed:
-        return
-
-    resp = _get_client().embeddings.create(
-        model=EMBEDDING_MODEL,
-        input=queries_to_embed,
-        encoding_format="float",
+    embed_queries(warmup_queries)
+    print(f"[INFO] Saved warmup embedding cache to {CACHE_STORE_PATH}")
+
+
+def publish_artifacts(index_type: str) -> None:
+    """런타임 아티팩트를 새 릴리스로 배포 (실행 중인 API가 감지해 교체)"""
+    release = publish_release(
+        config.RELEASES_DIR,
+        INDEX_PATH,
+        META_PATH,
+        files=[
+            META_STORE_PATH,
+            lexical_path_for(INDEX_PATH),
+            region_path_for(INDEX_PATH),
+            geo_path_for(INDEX_PATH),
+            contexts_path_for(INDEX_PATH),
+        ],
+        info={
+            "embedding_model": EMBEDDING_MODEL,
+            "embedding_dimension": _create_backend().dimension,
+            "index_type": index_type,
+        },
+        keep=config.RELEASES_KEEP,
     )
+    print(f"[INFO] Published release {release.version} to {release.directory}")
 
-    for query, data in zip(queries_to_embed, resp.data, strict=False):
-        cache[query] = data.embedding
 
-    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    CACHE_PATH.write_text(
-        json.dumps(cache, ensure_ascii=False),
-        encoding="utf-8",
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="visitjeju FAISS 인덱스 빌드")
+    parser.add_argument("--index-type", choices=INDEX_TYPES, default="flat")
+    parser.add_argument(
+        "--embedding-backend",
+        choices=EMBEDDING_BACKENDS,
+        default=config.EMBEDDING_BACKEND,
+        help="hashed: API 키 없이 결정적 로컬 임베딩 (벤치마크/CI용)",
+    )
+    parser.add_argument(
+        "--embedding-dimensions",
+        type=int,
+        default=config.EMBEDDING_DIMENSIONS,
+        help="축소 임베딩 차원 (예: 256/512, 런타임도 같은 EMBEDDING_DIMENSIONS)",
+    )
+    parser.add_argument("--nlist", type=int, default=None, help="IVF 클러스터 수")
+    parser.add_argument("--nprobe", type=int, default=8, help="IVF 검색 클러스터 수")
+    parser.add_argument("--hnsw-m", type=int, default=32, help="HNSW 이웃 수")
+    parser.add_argument("--ef-construction", type=int, default=200)
+    parser.add_argument("--ef-search", type=int, default=64)
+    parser.add_argument(
+        "--pq-m",
+        type=int,
+        default=None,
+        help="PQ 서브벡터 수 (차원의 약수, 기본: 차원의 약수 중 96 이하 최대값)",
+    )
+    parser.add_argument("--pq-nbits", type=int, default=8, help="PQ 서브벡터당 비트")
+    parser.add_argument(
+        "--report-queries", type=int, default=200, help="리포트 평가 쿼리 수 (0: 생략)"
     )
-    print(f"[INFO] Saved warmup embedding cache to {CACHE_PATH}")
+    parser.add_argument("--report-top-k", type=int, default=10)
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="이전 빌드 대비 추가/변경된 item만 임베딩 (contentsid 기준)",
+    )
+    return parser.parse_args(argv)
 
 
-def main():
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    use_embedding_backend(args.embedding_backend, args.embedding_dimensions)
+    if args.index_type == "pq" and args.pq_m is not None:
+        # 임베딩(API 호출) 전에 차원과 맞지 않는 PQ 설정을 거부
+        check_pq_m(_create_backend().dimension, args.pq_m)
     items = load_items()
-    texts = [build_text(it) for it in items]
+    # contentsid가 벡터 저장소의 키이므로 중복 item은 하나만 사용
+    unique_items = dedupe_items(items)
+    if len(unique_items) != len(items):
+        print(f"[WARN] Skipped {len(items) - len(unique_items)} duplicate contentsid")
+    items = unique_items
 
     print(f"[INFO] #items = {len(items)}")
-    embeddings = embed_texts(texts, batch_size=64)
-    build_and_save_index(embeddings, items)
+    embeddings = embed_items(items, incremental=args.incremental)
+    index = build_and_save_index(
+        embeddings,
+        items,
+        index_type=args.index_type,
+        nlist=args.nlist,
+        nprobe=args.nprobe,
+        hnsw_m=args.hnsw_m,
+        ef_construction=args.ef_construction,
+        ef_search=args.ef_search,
+        pq_m=args.pq_m,
+        pq_nbits=args.pq_nbits,
+    )
+    if args.report_queries:
+        write_index_report(
+            index,
+            embeddings,
+            args.index_type,
+            num_queries=args.report_queries,
+            top_k=args.report_top_k,
+        )
+    write_precomputed_contexts(index, items)
+    publish_artifacts(args.index_type)
     prewarm_embedding_cache()
 
 
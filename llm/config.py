@@ -3,6 +3,7 @@
 모든 경로, 모델명, 하이퍼파라미터 등을 관리합니다.
 """
 
+import os
 from pathlib import Path
 
 # 프로젝트 경로
@@ -13,15 +14,68 @@ OUTPUT_DIR = BASE_DIR / "output"
 DATA_PATH = OUTPUT_DIR / "visitjeju_workshops.json"
 INDEX_PATH = OUTPUT_DIR / "visitjeju_faiss.index"
 METADATA_PATH = OUTPUT_DIR / "visitjeju_metadata.json"
+# 버전별 아티팩트 릴리스 (llm/artifact_release.py 참고)
+# 런타임은 RELEASES_DIR/CURRENT가 가리키는 릴리스를 로드하고, 없으면 위 경로를 사용
+RELEASES_DIR = OUTPUT_DIR / "releases"
+RELEASES_KEEP = 3  # 남겨둘 최근 릴리스 수
+# 인덱스/메타데이터를 읽기 전용 memory-map으로 로드 (워커 간 페이지 캐시 공유)
+# 메타데이터는 METADATA_PATH와 같은 이름의 .bin 저장소가 있으면 그것을 사용
+INDEX_MMAP = True
+# 쿼리 임베딩 캐시 (append-only 바이너리 로그, llm/embedding_cache.py 참고)
+EMBEDDING_CACHE_STORE_PATH = OUTPUT_DIR / "embedding_cache"
+EMBEDDING_CACHE_MAX_ENTRIES = 50_000  # LRU로 유지할 최대 쿼리 수
+# 이전 JSON 캐시 (바이너리 캐시가 없을 때 1회 변환용 시드)
 EMBEDDING_CACHE_PATH = OUTPUT_DIR / "embedding_cache.json"
+# 문서 임베딩 저장소 (모델 + build_text 해시 → 벡터, 같은 바이너리 로그 형식)
+# 인덱스 타입/파라미터만 바꾼 빌드는 임베딩 API 호출 없이 여기서 조립
+DOCUMENT_EMBEDDING_STORE_PATH = OUTPUT_DIR / "document_embeddings"
 
 # OpenAI 임베딩 모델
 EMBEDDING_MODEL = "text-embedding-3-small"
-EMBEDDING_DIMENSION = 1536  # text-embedding-3-small의 차원
+EMBEDDING_DIMENSION = 1536  # text-embedding-3-small의 (기본) 차원
+# 축소 차원 (text-embedding-3의 dimensions 파라미터, 예: 256/512, 0이면 기본 차원)
+# 인덱스 빌드와 런타임이 같은 값을 써야 하며, 인덱스 메타데이터 차원과 다르면 로드 실패
+# hashed 백엔드에서는 투영 차원으로 사용
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None
+# 임베딩 백엔드 (llm/embedding_backend.py 참고)
+# - openai: OpenAI embeddings API
+# - hashed: 문자 n-gram 해싱 기반 결정적 로컬 임베딩 (API 키 없이 빌드/벤치마크)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
 
 # RAG 검색 설정
 DEFAULT_TOP_K = 3  # 기본 검색 결과 개수
 BATCH_SIZE = 64  # 인덱스 빌드 시 배치 크기
+EMBEDDING_BUILD_CONCURRENCY = 4  # 인덱스 빌드 시 동시 임베딩 요청 수
+EMBEDDING_BUILD_MAX_RETRIES = 6  # rate limit/일시적 오류 시 배치당 재시도 횟수
+EMBEDDING_BUILD_RETRY_BASE_S = 1.0  # 첫 재시도 대기 시간 (이후 2배씩, jitter 적용)
+SEARCH_MAX_WORKERS = 4  # 비동기 검색용 FAISS 스레드 풀 크기
+
+# 하이브리드 검색 (문자 n-gram BM25 + 벡터, llm/lexical_index.py 참고)
+# 어휘 인덱스는 인덱스 파일 옆의 <인덱스 이름>_lexical.npz (없으면 벡터 검색만)
+EMBEDDING_TIMEOUT_MS = 400  # 쿼리 임베딩 지연 예산 (초과/실패 시 어휘 검색만 사용)
+HYBRID_CANDIDATES = 20  # RRF 융합 전 검색기별 후보 수
+RRF_K = 60  # reciprocal rank fusion 상수
+
+# 지역 필터 검색 (요청 location → region1cd/region2cd)
+REGION_FILTER_MIN_ITEMS = 10  # 이보다 문서가 적은 지역은 상위 지역(시)으로 검색
+
+# 거리 기반 재순위 (요청 location → 데이터셋 주소로 좌표화, llm/geo_index.py 참고)
+GEO_RERANK = True  # location이 좌표화되면 후보를 거리순 순위와 RRF로 합침
+GEO_CANDIDATES = 20  # 재순위 전 벡터(하이브리드) 후보 수 (반경 안 후보도 같은 수)
+# 격자 공간 인덱스로 찾은 반경 안 문서 중 쿼리와 가까운 GEO_CANDIDATES개를 후보에 추가
+# (전체 벡터 순위 밖이라도 가까운 체험이 재순위 대상이 되도록, 0이면 끔)
+GEO_RADIUS_KM = 10.0
+GEO_CELL_KM = 2.0  # 공간 인덱스 격자 크기 (km)
+
+# MMR 다양화 재순위 (같은 농장의 여러 지점처럼 거의 같은 문서가 top_k를 채우지 않도록)
+# 후보 벡터를 인덱스에서 복원(reconstruct)해 계산하므로 추가 API 호출 없음
+MMR_RERANK = False  # 후보를 관련도와 이미 고른 문서와의 유사도 균형으로 다시 고름
+MMR_CANDIDATES = 20  # 재순위 전 후보 수
+MMR_LAMBDA = 0.7  # 관련도 가중치 (1이면 기존 순위, 0이면 다양성만)
+
+# 동시 요청의 캐시 미스 쿼리 임베딩 마이크로 배칭
+EMBEDDING_BATCH_WINDOW_MS = 10  # 첫 요청 이후 배치를 모으는 시간 (ms)
+EMBEDDING_BATCH_MAX_SIZE = 64  # 배치 최대 크기 (도달 시 즉시 전송)
 
 # 성능 최적화: 테스트/주요 시나리오에 대한 임베딩 미리 계산
 PERFORMANCE_WARMUP_QUERIES = [
@@ -35,5 +89,19 @@ PERFORMANCE_WARMUP_QUERIES = [
     "제주 목공 체험",
 ]
 
+# 오프라인 사전 계산 컨텍스트 (llm/precomputed_contexts.py 참고)
+# build_index가 체험 유형과 자주 쓰는 직업/재료 패턴 조합별 top-k 검색 결과를
+# <인덱스 이름>_contexts.json으로 저장하고, 런타임은 임베딩/검색 없이 사용
+# ("" 패턴은 직업/재료 텍스트가 없는 요청용 기본 컨텍스트이며, 텍스트가 있는데
+# 어떤 패턴과도 맞지 않으면 사전 계산 결과 대신 실시간 검색)
+PRECOMPUTED_CONTEXT_TOP_K = 3
+PRECOMPUTED_CONTEXT_PATTERNS = {
+    "돌담": ["", "돌담 장인", "석공", "밭담", "현무암"],
+    "감귤": ["", "감귤 농부", "귤 따기", "감귤청", "한라봉"],
+    "해녀": ["", "해녀", "물질", "해산물", "테왁"],
+    "요리": ["", "향토 요리", "빙떡", "오메기떡", "고기국수"],
+    "목공": ["", "목공예", "가구", "나무 소품", "서각"],
+}
+
 # 성능 목표
 TARGET_SEARCH_TIME_MS = 500  # 검색 시간 목표 (ms)
@@ -0,0 +1,205 @@
+"""임베딩 백엔드
+
+검색(rag_retriever)과 빌드(build_index)는 EmbeddingBackend 인터페이스로
+임베딩을 요청합니다.
+
+- openai: OpenAI embeddings API (기본)
+- hashed: 문자 n-gram을 해시해 고정 차원에 투영하는 결정적 로컬 임베딩.
+  네트워크/API 키 없이 같은 텍스트는 항상 같은 벡터가 되므로, 망분리 CI에서
+  인덱스를 빌드하고 검색 스택 전체의 지연시간/처리량을 측정하는 용도입니다.
+  (의미 유사도가 아닌 문자열 겹침 기반이라 검색 품질 평가용은 아님)
+
+백엔드마다 벡터 공간이 다르므로 model 이름으로 캐시/문서 임베딩 저장소를
+구분하고, 인덱스 메타데이터의 embedding_model과 일치해야 검색합니다.
+
+text-embedding-3 모델은 dimensions 파라미터로 축소 차원(예: 256/512) 벡터를
+받을 수 있습니다. 축소 벡터는 같은 모델이어도 다른 벡터 공간이므로 캐시/저장소
+키는 embedding_key(모델@차원)로 구분하고, 인덱스 차원은 메타데이터의
+index.dimension과 일치해야 검색합니다.
+"""
+
+import functools
+import hashlib
+import re
+import unicodedata
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Protocol
+
+import numpy as np
+
+from llm import config
+
+EMBEDDING_BACKENDS = ("openai", "hashed")
+
+# dimensions 파라미터로 줄일 수 있는 모델과 기본(최대) 차원
+NATIVE_DIMENSIONS = {"text-embedding-3-small": 1536, "text-embedding-3-large": 3072}
+
+
+class EmbeddingBackend(Protocol):
+    """텍스트 리스트 → (N, D) float32 임베딩"""
+
+    model: str
+    dimension: int
+
+    def embed(self, texts: list[str]) -> np.ndarray: ...
+
+    async def aembed(self, texts: list[str]) -> np.ndarray: ...
+
+
+def _as_array(response: Any) -> np.ndarray:
+    return np.array([data.embedding for data in response.data], dtype=np.float32)
+
+
+class OpenAIEmbeddingBackend:
+    """OpenAI embeddings API (클라이언트는 호출 시점에 factory로 가져옴)"""
+
+    def __init__(
+        self,
+        model: str,
+        client: Callable[[], Any] | None = None,
+        async_client: Callable[[], Any] | None = None,
+        dimensions: int | None = None,
+    ):
+        """
+        Args:
+            model: 임베딩 모델 이름
+            client: OpenAI 클라이언트를 반환하는 함수 (embed용)
+            async_client: AsyncOpenAI 클라이언트를 반환하는 함수 (aembed용)
+            dimensions: 축소 차원 (None이면 모델 기본 차원)
+        """
+        native = NATIVE_DIMENSIONS.get(model, config.EMBEDDING_DIMENSION)
+        if dimensions is not None and dimensions != native:
+            if model not in NATIVE_DIMENSIONS:
+                raise ValueError(f"{model}은 dimensions(축소 차원)를 지원하지 않습니다")
+            if not 0 < dimensions < native:
+                raise ValueError(
+                    f"dimensions는 1~{native} 사이여야 합니다: {dimensions}"
+                )
+        self.model = model
+        self.dimension = dimensions or native
+        self._client = client
+        self._async_client = async_client
+        # 기본 차원이면 파라미터를 보내지 않음 (기존 요청/캐시와 동일)
+        self._options = (
+            {"dimensions": self.dimension} if self.dimension != native else {}
+        )
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        response = self._client().embeddings.create(
+            model=self.model, input=texts, encoding_format="float", **self._options
+        )
+        return _as_array(response)
+
+    async def aembed(self, texts: list[str]) -> np.ndarray:
+        response = await self._async_client().embeddings.create(
+            model=self.model, input=texts, encoding_format="float", **self._options
+        )
+        return _as_array(response)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _gram_hash(gram: str) -> int:
+    digest = hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class HashedNgramEmbeddingBackend:
+    """문자 n-gram 해싱(feature hashing) 기반 결정적 로컬 임베딩
+
+    NFKC/소문자/공백 정규화한 텍스트의 문자 n-gram마다 64bit 해시로 차원과
+    부호(±1)를 정하고, 빈도를 log(1 + tf)로 누적한 뒤 L2 정규화합니다.
+    """
+
+    def __init__(
+        self,
+        dimension: int = config.EMBEDDING_DIMENSION,
+        ngram_sizes: tuple[int, ...] = (1, 2, 3),
+    ):
+        self.dimension = dimension
+        self.ngram_sizes = ngram_sizes
+        sizes = "".join(map(str, ngram_sizes))
+        self.model = f"hashed-char{sizes}-{dimension}"
+
+    def _grams(self, text: str) -> list[str]:
+        text = " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+        return [
+            text[i : i + n] for n in self.ngram_sizes for i in range(len(text) - n + 1)
+        ]
+
+    def embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        grams = self._grams(text)
+        if not grams:
+            return vector
+        hashes = np.fromiter(map(_gram_hash, grams), dtype=np.uint64, count=len(grams))
+        keys, counts = np.unique(hashes, return_counts=True)
+        signs = np.where(keys >> np.uint64(63), -1.0, 1.0)
+        np.add.at(
+            vector,
+            (keys % np.uint64(self.dimension)).astype(np.int64),
+            (signs * np.log1p(counts)).astype(np.float32),
+        )
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vectors[row] = self.embed_one(text)
+        return vectors
+
+    async def aembed(self, texts: list[str]) -> np.ndarray:
+        return self.embed(texts)
+
+
+def create_embedding_backend(
+    name: str,
+    model: str = config.EMBEDDING_MODEL,
+    client: Callable[[], Any] | None = None,
+    async_client: Callable[[], Any] | None = None,
+    dimensions: int | None = None,
+) -> EmbeddingBackend:
+    """이름(openai/hashed)으로 백엔드 생성
+
+    model/client는 openai에만 사용하고, dimensions(None이면 기본 차원)는
+    openai에서는 축소 차원, hashed에서는 투영 차원입니다.
+    """
+    if name == "openai":
+        return OpenAIEmbeddingBackend(model, client, async_client, dimensions)
+    if name == "hashed":
+        return HashedNgramEmbeddingBackend(dimensions or config.EMBEDDING_DIMENSION)
+    raise ValueError(
+        f"Unknown embedding backend: {name} (expected {EMBEDDING_BACKENDS})"
+    )
+
+
+def embedding_key(model: str, dimension: int | None = None) -> str:
+    """캐시/문서 임베딩 저장소 키용 임베딩 식별자
+
+    기본 차원이면 모델 이름 그대로, 축소 차원이면 ``모델@차원``
+    (hashed 백엔드는 모델 이름에 차원이 들어 있음).
+    """
+    if dimension is None or dimension == NATIVE_DIMENSIONS.get(model, dimension):
+        return model
+    return f"{model}@{dimension}"
+
+
+def shorten_embeddings(vectors: np.ndarray, dimension: int) -> np.ndarray:
+    """앞 dimension개 성분만 남기고 L2 재정규화
+
+    text-embedding-3의 dimensions 파라미터가 반환하는 벡터와 같은 방식이므로,
+    기본 차원 벡터로 축소 차원의 recall/지연시간을 API 호출 없이 비교할 때 씁니다.
+    """
+    shortened = np.ascontiguousarray(vectors[..., :dimension], dtype=np.float32)
+    norms = np.linalg.norm(shortened, axis=-1, keepdims=True)
+    return shortened / np.where(norms > 0, norms, 1.0)
+
+
+def cache_path_for_model(path: str | Path, model: str) -> Path:
+    """임베딩 캐시 경로를 모델별로 구분 (기본 모델은 기존 경로 그대로)"""
+    path = Path(path)
+    if model == config.EMBEDDING_MODEL:
+        return path
+    suffix = re.sub(r"[^\w.-]", "_", model)
+    return path.with_name(f"{path.name}.{suffix}")
@@ -0,0 +1,95 @@
+"""쿼리 임베딩 마이크로 배칭
+
+짧은 시간 창(window) 안에 도착한 캐시 미스 쿼리들을 모아 한 번의
+embeddings 요청으로 보내고, 결과 벡터를 기다리던 호출자들에게 나눠줍니다.
+동시 요청이 몰릴 때 외부 API 호출 수와 꼬리 지연을 줄이기 위한 용도입니다.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EmbedBatchFn = Callable[[list[str]], Awaitable[np.ndarray]]
+
+
+class EmbeddingBatcher:
+    """캐시 미스 쿼리를 모아 한 번에 임베딩하는 디스패처
+
+    하나의 이벤트 루프에 묶여 동작합니다.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFn,
+        window_ms: float = 10,
+        max_batch_size: int = 64,
+    ):
+        """
+        Args:
+            embed_batch: 텍스트 리스트를 (N, D) 벡터로 변환하는 코루틴 함수
+            window_ms: 첫 요청 이후 배치를 모으는 최대 대기 시간 (ms)
+            max_batch_size: 배치 최대 크기 (도달 시 즉시 전송)
+        """
+        self.embed_batch = embed_batch
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.loop = asyncio.get_running_loop()
+
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._inflight: set[asyncio.Task] = set()
+
+        # 통계: 요청된 쿼리 수 / 실제 전송한 배치 수
+        self.requests = 0
+        self.batches = 0
+
+    async def embed(self, text: str) -> np.ndarray:
+        """텍스트 하나를 임베딩 (다른 동시 요청과 함께 배치 전송)
+
+        Returns:
+            (D,) shape의 float32 numpy 배열
+        """
+        future = self.loop.create_future()
+        self._pending.setdefault(text, []).append(future)
+        self.requests += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self.loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        self.batches += 1
+        task = self.loop.create_task(self._dispatch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: dict[str, list[asyncio.Future]]) -> None:
+        texts = list(batch)
+        logger.debug(f"임베딩 배치 전송 - 쿼리수: {len(texts)}")
+        try:
+            vectors = await self.embed_batch(texts)
+        except Exception as exc:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        for text, vector in zip(texts, vectors, strict=True):
+            for future in batch[text]:
+                if not future.done():
+                    future.set_result(vector)
@@ -0,0 +1,377 @@
+"""임베딩 캐시 저장소
+
+쿼리 임베딩을 append-only 바이너리 로그로 보관합니다.
+
+- ``<prefix>.keys``: 첫 줄은 헤더(JSON), 이후 한 줄에 키 하나(JSON 문자열).
+  n번째 키 줄이 벡터 로그의 n번째 행과 대응합니다.
+- ``<prefix>.<generation>.vec``: float32 (N, D) 행 우선 벡터 로그.
+  로드 시 memory-map 하므로 JSON 파싱 없이 바로 사용할 수 있습니다.
+- ``<prefix>.<generation>.access``: 캐시 히트한 키 로그 (한 줄에 키 하나).
+  재시작/다른 워커에서도 LRU 순서를 사용 순으로 복원하는 데 씁니다.
+- ``<prefix>.lock``: 여러 프로세스(워커)가 같은 로그를 공유할 때 쓰는 파일 락.
+
+캐시 미스 1건당 두 파일에 한 번씩 append 하고(O(1)), 크기가 max_entries를
+넘으면 LRU 순으로 키를 제거합니다. 제거된 행은 compact() 시 로그에서 정리됩니다.
+
+append/compact는 파일 락을 잡은 상태에서 다른 프로세스가 추가한 키를 먼저
+읽어 들인 뒤(_sync) 수행하므로, 행 번호는 항상 파일 기준으로 정해지고
+compaction으로 세대가 바뀌면 다른 프로세스도 새 세대를 다시 로드합니다.
+
+조회(get)는 락도 디스크 I/O도 없이, 쓰기 쪽이 _sync 끝에 통째로 바꿔 끼우는
+(key -> row, memory-map) 스냅샷만 읽습니다. 캐시 히트는 메모리에 모아 두었다가
+쓰기 경로(put_many/flush)나 백그라운드 스레드에서 LRU 순서와 access 로그에
+반영합니다. 다른 워커가 추가한 키는 refresh()/put_many 때 읽어 들입니다.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+# 캐시 히트 기록을 이 건수만큼 모아서 백그라운드 스레드에서 access 로그에 append
+ACCESS_FLUSH_SIZE = 64
+# 기록하지 못한 캐시 히트 보관 한도 (넘으면 오래된 히트부터 버림)
+ACCESS_BUFFER_SIZE = 4096
+
+
+class EmbeddingCacheStore:
+    """append-only float32 벡터 로그 + 키 인덱스 기반 LRU 임베딩 캐시"""
+
+    def __init__(
+        self,
+        path_prefix: str | Path,
+        max_entries: int | None = None,
+        legacy_json_path: str | Path | None = None,
+    ):
+        """캐시 저장소 로드
+
+        Args:
+            path_prefix: 저장 파일 경로 prefix (``.keys``/``.vec`` 확장자가 붙음)
+            max_entries: 유지할 최대 키 수 (None이면 무제한)
+            legacy_json_path: 저장소가 없을 때 1회 가져올 기존 JSON 캐시 경로
+        """
+        self.path_prefix = Path(path_prefix)
+        self.keys_path = self.path_prefix.with_name(self.path_prefix.name + ".keys")
+        self.lock_path = self.path_prefix.with_name(self.path_prefix.name + ".lock")
+        self.max_entries = max_entries
+
+        self.dimension: int | None = None
+        self._generation = 0
+        self._vec_name: str | None = None  # 현재 읽고 있는 세대의 벡터 로그 이름
+        self._rows = 0  # 벡터 로그의 전체 행 수 (제거된 행 포함)
+        self._keys_offset = 0  # 키 파일에서 읽어 들인 위치 (bytes)
+        self._access_offset = 0  # access 로그에서 읽어 들인 위치 (bytes)
+        self._keys_stat: tuple[int, int] | None = None  # 마지막 _sync 때 (inode, 크기)
+        self._index: OrderedDict[str, int] = OrderedDict()  # key -> row (LRU 순)
+        self._vectors: np.ndarray | None = None  # memory-mapped (rows, D)
+        # 조회용 불변 스냅샷 (쓰기 쪽이 _sync 끝에 통째로 교체)
+        self._snapshot: tuple[dict[str, int], np.ndarray | None] = ({}, None)
+        # 아직 LRU 순서/access 로그에 반영하지 않은 캐시 히트 (조회 스레드가 append)
+        self._hits: deque[str] = deque(maxlen=ACCESS_BUFFER_SIZE)
+        self._flush_thread: threading.Thread | None = None
+        self._lock = threading.Lock()  # 쓰기 쪽 상태(_index 등) 보호, 조회는 잡지 않음
+
+        if self.keys_path.exists():
+            with self._lock, self._file_lock():
+                self._sync()
+        elif legacy_json_path is not None and Path(legacy_json_path).exists():
+            self._import_legacy_json(Path(legacy_json_path))
+
+    # ---------- 조회 ----------
+
+    def __len__(self) -> int:
+        return len(self._snapshot[0])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._snapshot[0]
+
+    @property
+    def dead_rows(self) -> int:
+        """로그에 남아 있지만 키가 제거된 행 수"""
+        return self._rows - len(self._index)
+
+    def get(self, key: str) -> np.ndarray | None:
+        """키의 벡터를 (D,) float32 배열로 반환 (없으면 None)
+
+        락을 잡지 않고 현재 스냅샷만 읽으므로 쓰기/compaction 중에도 기다리지
+        않습니다. 다른 워커가 추가한 키는 refresh() 이후에 보입니다.
+        """
+        index, vectors = self._snapshot
+        row = index.get(key)
+        if row is None:
+            return None
+        vector = np.array(vectors[row], dtype=np.float32)
+        self._hits.append(key)
+        if len(self._hits) >= ACCESS_FLUSH_SIZE:
+            self._flush_in_background()
+        return vector
+
+    # ---------- 쓰기 ----------
+
+    def put(self, key: str, vector: np.ndarray | list[float]) -> None:
+        """벡터 1건을 로그 끝에 append"""
+        self.put_many([key], np.asarray(vector, dtype=np.float32).reshape(1, -1))
+
+    def put_many(self, keys: list[str], vectors: np.ndarray) -> None:
+        """벡터 여러 건을 한 번의 append로 기록
+
+        Args:
+            keys: 키 리스트
+            vectors: (len(keys), D) shape의 벡터 배열
+        """
+        if not keys:
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(keys), -1)
+
+        with self._lock, self._file_lock():
+            self._sync()
+            if self.dimension is None:
+                self.dimension = int(vectors.shape[1])
+                self._write_keys_file([], self._vec_path(self._generation))
+                self._sync()
+            elif vectors.shape[1] != self.dimension:
+                raise ValueError(
+                    f"임베딩 차원 불일치: expected {self.dimension}, got {vectors.shape[1]}"
+                )
+
+            self._truncate_partial_append()
+            # 벡터 먼저 기록 → 키 기록 (키 줄이 있는 행만 유효)
+            with self._vec_path(self._generation).open("ab") as f:
+                f.write(vectors.tobytes())
+            with self.keys_path.open("a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(k, ensure_ascii=False) + "\n" for k in keys))
+            # 방금 기록한 키도 다른 프로세스가 기록한 키와 같은 경로로 읽어 행 번호 부여
+            self._sync()
+
+            if self.dead_rows > max(len(self._index), 1024):
+                self._compact()
+
+    def flush(self) -> None:
+        """모아 둔 캐시 히트를 access 로그에 기록 (LRU 순서 영속화)"""
+        with self._lock:
+            if not self._hits or self.dimension is None:
+                return
+            with self._file_lock():
+                self._sync()
+
+    def refresh(self) -> None:
+        """다른 워커가 키 파일에 추가한 키를 읽어 들임 (바뀌지 않았으면 stat 한 번)"""
+        if not self._keys_changed():
+            return
+        with self._lock, self._file_lock():
+            self._sync()
+
+    def compact(self) -> None:
+        """제거된 행을 정리하여 새 세대의 로그로 다시 기록"""
+        with self._lock, self._file_lock():
+            self._sync()
+            self._compact()
+
+    # ---------- 내부 구현 ----------
+
+    def _flush_in_background(self) -> None:
+        """조회 스레드를 막지 않도록 캐시 히트 기록을 별도 스레드에서 수행"""
+        thread = self._flush_thread
+        if thread is not None and thread.is_alive():
+            return
+        self._flush_thread = threading.Thread(
+            target=self._flush_quietly, name="embedding-cache-flush", daemon=True
+        )
+        self._flush_thread.start()
+
+    def _flush_quietly(self) -> None:
+        try:
+            self.flush()
+        except OSError:
+            logger.warning("임베딩 캐시 히트 기록 실패", exc_info=True)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """프로세스 간 배타 락 (같은 prefix를 쓰는 모든 워커가 공유)"""
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock_path.open("a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _vec_path(self, generation: int) -> Path:
+        return self.path_prefix.with_name(f"{self.path_prefix.name}.{generation}.vec")
+
+    def _access_path(self, generation: int) -> Path:
+        return self.path_prefix.with_name(
+            f"{self.path_prefix.name}.{generation}.access"
+        )
+
+    def _write_keys_file(self, keys: list[str], vec_path: Path) -> None:
+        header = {
+            "version": FORMAT_VERSION,
+            "dimension": self.dimension,
+            "vectors": vec_path.name,
+        }
+        lines = [json.dumps(header)] + [json.dumps(k, ensure_ascii=False) for k in keys]
+        self.keys_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.keys_path.with_name(self.keys_path.name + ".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.keys_path)
+
+    def _keys_changed(self) -> bool:
+        try:
+            stat = self.keys_path.stat()
+        except FileNotFoundError:
+            return False
+        return (stat.st_ino, stat.st_size) != self._keys_stat
+
+    def _sync(self) -> None:
+        """다른 프로세스가 기록한 키/히트를 읽어 들임 (파일 락을 잡고 호출)
+
+        헤더가 가리키는 세대가 바뀌었으면(compaction) 처음부터 다시 읽고,
+        아니면 마지막으로 읽은 위치 이후의 완전한 줄만 읽습니다.
+        """
+        if not self.keys_path.exists():
+            return
+        with self.keys_path.open("rb") as f:
+            header = json.loads(f.readline())
+            if header["vectors"] != self._vec_name:
+                self._reset(header, f.tell())
+            f.seek(self._keys_offset)
+            data = f.read()
+            self._keys_stat = (os.fstat(f.fileno()).st_ino, f.tell())
+
+        keys, consumed = _complete_lines(data)
+        self._keys_offset += consumed
+        for key in keys:
+            self._index[key] = self._rows
+            self._index.move_to_end(key)
+            self._rows += 1
+
+        access_path = self._access_path(self._generation)
+        if access_path.exists():
+            with access_path.open("rb") as f:
+                f.seek(self._access_offset)
+                accessed, consumed = _complete_lines(f.read())
+            self._access_offset += consumed
+            for key in accessed:
+                if key in self._index:
+                    self._index.move_to_end(key)
+
+        # 이 프로세스의 히트는 다른 프로세스 기록보다 최근으로 반영
+        self._flush_access()
+        self._evict_if_needed()
+        self._remap()
+        self._snapshot = (dict(self._index), self._vectors)
+
+    def _reset(self, header: dict, keys_offset: int) -> None:
+        self.dimension = header["dimension"]
+        self._vec_name = header["vectors"]
+        self._generation = int(self._vec_name.rsplit(".", 2)[-2])
+        self._rows = 0
+        self._keys_offset = keys_offset
+        self._access_offset = 0
+        self._index = OrderedDict()
+        self._vectors = None
+
+    def _truncate_partial_append(self) -> None:
+        """비정상 종료로 남은 불완전한 기록을 잘라냄 (파일 락을 잡고 호출)
+
+        벡터만 기록되고 키가 없는 행, 줄바꿈 없이 끝난 키 줄을 버려서 이후
+        append의 행 번호가 키 줄 번호와 어긋나지 않게 합니다.
+        """
+        vec_path = self._vec_path(self._generation)
+        row_bytes = 4 * self.dimension
+        if vec_path.exists() and vec_path.stat().st_size != self._rows * row_bytes:
+            with vec_path.open("ab") as f:
+                f.truncate(self._rows * row_bytes)
+        if self.keys_path.stat().st_size != self._keys_offset:
+            with self.keys_path.open("ab") as f:
+                f.truncate(self._keys_offset)
+
+    def _flush_access(self) -> None:
+        """모아 둔 캐시 히트를 LRU 순서에 반영하고 access 로그에 append (파일 락을 잡고 호출)"""
+        hits = []
+        while self._hits:  # 조회 스레드는 append만 하므로 popleft는 이 스레드만 수행
+            hits.append(self._hits.popleft())
+        hits = [key for key in hits if key in self._index]
+        if not hits:
+            return
+        for key in hits:
+            self._index.move_to_end(key)
+        access_path = self._access_path(self._generation)
+        with access_path.open("a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(k, ensure_ascii=False) + "\n" for k in hits))
+        # 자기 기록은 다시 읽을 필요 없음
+        self._access_offset = access_path.stat().st_size
+
+    def _compact(self) -> None:
+        if self.dimension is None or self.dead_rows == 0:
+            return
+
+        # LRU 순서(오래된 것 → 최근)로 기록하므로 access 로그 없이도 순서 유지
+        keys = list(self._index)
+        rows = np.fromiter(self._index.values(), dtype=np.int64, count=len(keys))
+        live = np.ascontiguousarray(self._vectors[rows])
+
+        old_generation = self._generation
+        new_vec_path = self._vec_path(old_generation + 1)
+        new_vec_path.write_bytes(live.tobytes())
+        # 키 파일 교체가 커밋 지점 (헤더가 새 벡터 로그를 가리킴)
+        self._write_keys_file(keys, new_vec_path)
+        # 이미 memory-map 한 프로세스는 삭제 후에도 이전 세대를 읽을 수 있고,
+        # append 전에는 _sync로 새 세대를 다시 로드함
+        self._vec_path(old_generation).unlink(missing_ok=True)
+        self._access_path(old_generation).unlink(missing_ok=True)
+        self._sync()
+
+        logger.info(f"임베딩 캐시 compaction 완료 - 유지 키수: {len(keys)}")
+
+    def _import_legacy_json(self, legacy_json_path: Path) -> None:
+        try:
+            legacy = json.loads(legacy_json_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        if not legacy:
+            return
+        logger.info(f"기존 JSON 임베딩 캐시 변환: {legacy_json_path} ({len(legacy)}건)")
+        self.put_many(list(legacy), np.array(list(legacy.values()), dtype=np.float32))
+
+    def _evict_if_needed(self) -> None:
+        if self.max_entries is None:
+            return
+        while len(self._index) > self.max_entries:
+            self._index.popitem(last=False)
+
+    def _remap(self) -> None:
+        """현재 세대 벡터 로그를 memory-map (파일 락을 잡고 호출)"""
+        if self._rows == 0:
+            self._vectors = None
+            return
+        if self._vectors is not None and self._vectors.shape[0] >= self._rows:
+            return
+        self._vectors = np.memmap(
+            self._vec_path(self._generation),
+            dtype=np.float32,
+            mode="r",
+            shape=(self._rows, self.dimension),
+        )
+
+
+def _complete_lines(data: bytes) -> tuple[list[str], int]:
+    """줄바꿈으로 끝난 줄만 JSON으로 파싱 (기록 중이거나 잘린 마지막 줄 제외)
+
+    Returns:
+        (파싱한 값 리스트, 소비한 바이트 수)
+    """
+    end = data.rfind(b"\n") + 1
+    lines = data[:end].decode("utf-8").splitlines()
+    return [json.loads(line) for line in lines if line.strip()], end
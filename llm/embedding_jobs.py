@@ -0,0 +1,207 @@
+"""인덱스 빌드용 문서 임베딩 배치 작업
+
+문서 텍스트를 배치로 나눠 임베딩 백엔드(llm/embedding_backend.py)의 aembed로
+동시에(최대 concurrency개) 임베딩합니다.
+
+- rate limit/일시적 오류는 지수 백오프(+jitter)로 재시도하고, 응답의
+  Retry-After 헤더가 있으면 그 시간을 따릅니다.
+- 완료된 배치는 ``<인덱스 이름>_checkpoints/<배치 해시>.npy``로 바로 저장합니다.
+  배치 해시는 모델 이름과 배치 텍스트로 정해지므로, 빌드가 중간에 실패해도
+  다시 실행하면 저장된 배치는 건너뛰고 남은 배치만 요청합니다.
+- 배치가 끝날 때마다 진행률과 처리량(texts/s)을 출력합니다.
+"""
+
+import asyncio
+import hashlib
+import os
+import random
+import shutil
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import openai
+
+EmbedBatchFn = Callable[[list[str]], Awaitable[np.ndarray]]
+
+# 재시도할 오류 (rate limit, 타임아웃/연결 오류, 5xx)
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def checkpoint_dir_for(index_path: str | Path) -> Path:
+    """FAISS 인덱스 경로에 대응하는 임베딩 체크포인트 디렉터리"""
+    index_path = Path(index_path)
+    return index_path.with_name(f"{index_path.stem}_checkpoints")
+
+
+class BatchCheckpoint:
+    """완료된 임베딩 배치를 (모델, 배치 텍스트) 해시별 .npy 파일로 보관"""
+
+    def __init__(self, directory: str | Path, model: str):
+        self.directory = Path(directory)
+        self.model = model
+
+    def key(self, texts: list[str]) -> str:
+        digest = hashlib.sha256(self.model.encode("utf-8"))
+        for text in texts:
+            digest.update(b"\0")
+            digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def load(self, texts: list[str]) -> np.ndarray | None:
+        path = self.directory / f"{self.key(texts)}.npy"
+        if not path.exists():
+            return None
+        vectors = np.load(path, allow_pickle=False)
+        return vectors if len(vectors) == len(texts) else None
+
+    def save(self, texts: list[str], vectors: np.ndarray) -> None:
+        """임시 파일에 쓴 뒤 rename (중단되어도 반쯤 쓴 파일이 남지 않음)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{self.key(texts)}.npy"
+        tmp_path = path.with_name(f"{path.stem}.tmp.npy")
+        np.save(tmp_path, vectors)
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+@dataclass
+class EmbeddingProgress:
+    """진행률/처리량 집계 및 출력"""
+
+    total: int
+    done: int = 0
+    resumed: int = 0
+    retries: int = 0
+    requested: int = 0
+
+    def __post_init__(self):
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def throughput(self) -> float:
+        """API로 임베딩한 texts/s (체크포인트에서 읽은 배치 제외)"""
+        return self.requested / self.elapsed if self.elapsed > 0 else 0.0
+
+    def update(self, count: int, resumed: bool = False) -> None:
+        self.done += count
+        if resumed:
+            self.resumed += count
+            return
+        self.requested += count
+        print(
+            f"[INFO] Embedded {self.done}/{self.total} texts "
+            f"({self.done / self.total:.0%}, {self.throughput:.1f} texts/s)"
+        )
+
+    def summary(self) -> str:
+        return (
+            f"[INFO] Embedded {self.total} texts in {self.elapsed:.1f}s "
+            f"({self.throughput:.1f} texts/s, {self.resumed} from checkpoint, "
+            f"{self.retries} retries)"
+        )
+
+
+def _retry_after(error: Exception) -> float | None:
+    """응답의 Retry-After 헤더(초)"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def _embed_batch(
+    embed_batch: EmbedBatchFn,
+    texts: list[str],
+    max_retries: int,
+    retry_base_s: float,
+    progress: EmbeddingProgress,
+) -> np.ndarray:
+    attempt = 0
+    while True:
+        try:
+            return np.asarray(await embed_batch(texts), dtype="float32")
+        except RETRYABLE_ERRORS as e:
+            if attempt >= max_retries:
+                raise
+            delay = _retry_after(e)
+            if delay is None:
+                delay = retry_base_s * 2**attempt * random.uniform(0.5, 1.0)
+            attempt += 1
+            progress.retries += 1
+            print(
+                f"[WARN] {type(e).__name__}, retrying in {delay:.1f}s "
+                f"({attempt}/{max_retries})"
+            )
+            await asyncio.sleep(delay)
+
+
+async def embed_batches(
+    embed_batch: EmbedBatchFn,
+    texts: list[str],
+    batch_size: int = 64,
+    concurrency: int = 4,
+    checkpoint: BatchCheckpoint | None = None,
+    max_retries: int = 6,
+    retry_base_s: float = 1.0,
+) -> np.ndarray:
+    """텍스트를 배치로 나눠 동시에 임베딩 → (N, D) float32 (입력 순서)
+
+    한 배치가 재시도 후에도 실패하면 진행 중인 다른 배치가 끝나(체크포인트에
+    저장되어) 다음 실행에서 재사용되도록 기다린 뒤 예외를 다시 발생시킵니다.
+
+    Args:
+        embed_batch: 텍스트 리스트를 (N, D) 벡터로 변환하는 코루틴 함수
+        texts: 임베딩할 텍스트
+        batch_size: 요청당 텍스트 수
+        concurrency: 동시에 보낼 최대 요청 수
+        checkpoint: 완료된 배치 저장소 (None이면 저장하지 않음)
+        max_retries: 배치당 최대 재시도 횟수
+        retry_base_s: 첫 재시도 대기 시간 (이후 2배씩 증가)
+    """
+    batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+    if not batches:
+        return np.array([], dtype="float32")
+
+    progress = EmbeddingProgress(len(texts))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(batch: list[str]) -> np.ndarray:
+        if checkpoint is not None:
+            vectors = checkpoint.load(batch)
+            if vectors is not None:
+                progress.update(len(batch), resumed=True)
+                return vectors
+        async with semaphore:
+            vectors = await _embed_batch(
+                embed_batch, batch, max_retries, retry_base_s, progress
+            )
+        if checkpoint is not None:
+            checkpoint.save(batch, vectors)
+        progress.update(len(batch))
+        return vectors
+
+    results = await asyncio.gather(
+        *(run(batch) for batch in batches), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+    print(progress.summary())
+    return np.concatenate(results)
@@ -0,0 +1,223 @@
+"""위경도 기반 공간 인덱스 / 오프라인 지오코딩
+
+build_index에서 items의 latitude/longitude로 격자(grid) 공간 인덱스와
+주소 지명 → 좌표(해당 지명 문서들의 중심점) 사전을 만들어 인덱스 옆에
+``<인덱스 이름>_geo.npz``로 저장합니다. 외부 지오코딩 API 없이 요청의
+만나는 장소(location)를 같은 데이터셋의 주소로 좌표화하고, 격자 인덱스로
+찾은 반경 안 문서를 벡터 검색 후보에 더한 뒤 거리순 순위와 RRF로 합쳐
+가까운 체험을 앞으로 올립니다.
+"""
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from llm.region_filter import (
+    REGION_ALIASES,
+    location_tokens,
+    normalize_location,
+    place_tokens,
+    region_label,
+)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32  # 위도 1도의 거리 (경도는 cos(위도)배)
+
+
+def geo_path_for(index_path: str | Path) -> Path:
+    """FAISS 인덱스 경로에 대응하는 공간 인덱스 경로"""
+    index_path = Path(index_path)
+    return index_path.with_name(f"{index_path.stem}_geo.npz")
+
+
+def haversine_km(
+    origin: tuple[float, float], lats: np.ndarray, lons: np.ndarray
+) -> np.ndarray:
+    """origin(위도, 경도)에서 각 좌표까지의 대원 거리(km), 좌표가 NaN이면 NaN"""
+    lat0, lon0 = np.radians(origin)
+    lats = np.radians(lats)
+    dlat = lats - lat0
+    dlon = np.radians(lons) - lon0
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat0) * np.cos(lats) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _coordinates(item: dict[str, Any]) -> tuple[float, float]:
+    """item의 (위도, 경도), 누락/0 값(데이터의 미입력 표시)은 NaN"""
+    try:
+        lat, lon = float(item["latitude"]), float(item["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return np.nan, np.nan
+    if lat == 0 and lon == 0:
+        return np.nan, np.nan
+    return lat, lon
+
+
+class GeoIndex:
+    """문서 좌표 격자 인덱스 + 지명 사전 (i번째 좌표 = i번째 item)"""
+
+    def __init__(
+        self,
+        coords: np.ndarray,
+        place_names: list[str],
+        place_coords: np.ndarray,
+        region_names: list[str],
+        cell_km: float = 2.0,
+    ):
+        """
+        Args:
+            coords: (N, 2) 위도/경도 (좌표 없는 문서는 NaN)
+            place_names: 주소 지명 (…읍/면/동/리/로/길)
+            place_coords: (P, 2) 지명별 중심 좌표
+            region_names: 부분 일치로도 찾는 지역 이름 (region2 라벨/별칭, place_names에 포함)
+            cell_km: 격자 한 칸의 크기 (km)
+        """
+        self.coords = coords
+        self.places: dict[str, tuple[float, float]] = dict(
+            zip(place_names, map(tuple, place_coords.tolist()), strict=True)
+        )
+        self.region_names = sorted(region_names, key=len, reverse=True)
+        self.cell_km = cell_km
+
+        # 격자 셀 키 → 문서 id (CSR: 셀 키 정렬 + indptr)
+        self._cell_deg = cell_km / KM_PER_DEGREE
+        doc_ids = np.flatnonzero(~np.isnan(coords).any(axis=1))
+        keys = self._cell_keys(coords[doc_ids])
+        order = np.argsort(keys, kind="stable")
+        self._cell_docs = doc_ids[order]
+        self._cells, starts = np.unique(keys[order], return_index=True)
+        self._cell_indptr = np.append(starts, len(order))
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def _cells_of(self, coords: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        cells = np.floor(coords / self._cell_deg).astype(np.int64)
+        return cells[..., 0], cells[..., 1]
+
+    def _cell_keys(self, coords: np.ndarray) -> np.ndarray:
+        rows, cols = self._cells_of(coords)
+        return (rows << 32) + cols
+
+    @classmethod
+    def build(cls, items: list[dict[str, Any]], cell_km: float = 2.0) -> "GeoIndex":
+        """items의 latitude/longitude와 주소로 공간 인덱스/지명 사전 생성"""
+        coords = np.array(
+            [_coordinates(item) for item in items], dtype=np.float64
+        ).reshape(-1, 2)
+
+        members: dict[str, list[int]] = {}
+        region_names = set()
+        for doc_id, item in enumerate(items):
+            if np.isnan(coords[doc_id]).any():
+                continue
+            names = {
+                token
+                for field in ("address", "roadaddress")
+                for token in place_tokens(item.get(field) or "")
+            }
+            label = region_label(item.get("region2cd"))
+            if label is not None:
+                aliases = (label, *REGION_ALIASES.get(label, ()))
+                region_names.update(aliases)
+                names.update(aliases)
+            for name in names:
+                members.setdefault(name, []).append(doc_id)
+
+        place_names = sorted(members)
+        place_coords = np.array(
+            [coords[members[name]].mean(axis=0) for name in place_names],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        return cls(coords, place_names, place_coords, sorted(region_names), cell_km)
+
+    def save(self, path: str | Path) -> None:
+        """.npz(비압축)로 저장"""
+        names = list(self.places)
+        np.savez(
+            path,
+            coords=self.coords,
+            place_names=np.array(names, dtype=np.str_),
+            place_coords=np.array([self.places[n] for n in names], dtype=np.float64),
+            region_names=np.array(self.region_names, dtype=np.str_),
+            cell_km=np.array(self.cell_km),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "GeoIndex":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["coords"],
+                data["place_names"].tolist(),
+                data["place_coords"].reshape(-1, 2),
+                data["region_names"].tolist(),
+                float(data["cell_km"]),
+            )
+
+    def geocode(self, location: str | None) -> tuple[float, float] | None:
+        """location을 데이터셋 주소 기준 좌표로 변환 (찾지 못하면 None)
+
+        주소처럼 뒤쪽 토큰이 더 구체적이라고 보고 뒤에서부터 지명을 찾고,
+        없으면 지역 이름(애월, 성산 …)이 포함되어 있는지 봅니다.
+        """
+        if not location:
+            return None
+        for token in reversed(location_tokens(location)):
+            if token in self.places:
+                return self.places[token]
+        text = normalize_location(location)
+        for name in self.region_names:
+            if name in text:
+                return self.places[name]
+        return None
+
+    def distances_km(
+        self, doc_ids: np.ndarray, origin: tuple[float, float]
+    ) -> np.ndarray:
+        """origin에서 문서들까지의 거리(km), 좌표가 없거나 id가 -1이면 NaN"""
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        coords = np.full((len(doc_ids), 2), np.nan)
+        valid = doc_ids >= 0
+        coords[valid] = self.coords[doc_ids[valid]]
+        return haversine_km(origin, coords[:, 0], coords[:, 1])
+
+    def nearby(
+        self, origin: tuple[float, float], radius_km: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """origin 반경 radius_km 안의 문서를 가까운 순으로 반환
+
+        반경을 덮는 격자 셀의 문서만 거리 계산합니다.
+
+        Returns:
+            (distances_km, doc_ids): 거리 오름차순
+        """
+        lat_span = radius_km / KM_PER_DEGREE
+        lon_span = lat_span / max(np.cos(np.radians(origin[0])), 1e-6)
+        lower = np.array([origin[0] - lat_span, origin[1] - lon_span])
+        upper = np.array([origin[0] + lat_span, origin[1] + lon_span])
+        (row_lo, col_lo), (row_hi, col_hi) = (
+            self._cells_of(lower),
+            self._cells_of(upper),
+        )
+        rows, cols = np.meshgrid(
+            np.arange(row_lo, row_hi + 1), np.arange(col_lo, col_hi + 1), indexing="ij"
+        )
+        keys = ((rows << 32) + cols).ravel()
+        positions = np.searchsorted(self._cells, keys)
+        inside_range = positions < len(self._cells)
+        positions, keys = positions[inside_range], keys[inside_range]
+        positions = positions[self._cells[positions] == keys]
+        if positions.size == 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+
+        doc_ids = np.concatenate(
+            [
+                self._cell_docs[self._cell_indptr[p] : self._cell_indptr[p + 1]]
+                for p in positions
+            ]
+        )
+        distances = self.distances_km(doc_ids, origin)
+        inside = distances <= radius_km
+        order = np.argsort(distances[inside], kind="stable")
+        return distances[inside][order], doc_ids[inside][order]
@@ -0,0 +1,170 @@
+"""contentsid 기반 증분 인덱스 빌드
+
+build_index는 빌드마다 문서 벡터를 contentsid로 키를 잡은 ID-mapped 인덱스
+(``<인덱스 이름>_vectors.index``, IndexIDMap2(IndexFlatL2))와 매니페스트
+(``<인덱스 이름>_manifest.json``: contentsid → build_text 해시, 모델, 버전)로
+저장합니다. 증분 빌드는 새 visitjeju_workshops.json을 이전 매니페스트와 비교해
+추가/변경된 item만 다시 임베딩하고, 삭제된 item은 벡터 저장소에서 제거한 뒤
+새 버전의 아티팩트를 씁니다.
+
+런타임 아티팩트(FAISS 검색 인덱스, 메타데이터, 어휘/지역/공간 인덱스)는
+item 순서를 문서 id로 쓰므로, 벡터 저장소에서 item 순서대로 벡터를 꺼내
+기존과 같은 방식으로 다시 만듭니다 (임베딩 API 호출만 증분).
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import faiss
+import numpy as np
+
+
+def vectors_path_for(index_path: str | Path) -> Path:
+    """FAISS 인덱스 경로에 대응하는 contentsid 벡터 저장소 경로"""
+    index_path = Path(index_path)
+    return index_path.with_name(f"{index_path.stem}_vectors.index")
+
+
+def manifest_path_for(index_path: str | Path) -> Path:
+    """FAISS 인덱스 경로에 대응하는 빌드 매니페스트 경로"""
+    index_path = Path(index_path)
+    return index_path.with_name(f"{index_path.stem}_manifest.json")
+
+
+def content_id(contentsid: str) -> int:
+    """contentsid → FAISS int64 id (안정적인 63bit 해시)"""
+    digest = hashlib.blake2b(contentsid.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") & 0x7FFF_FFFF_FFFF_FFFF
+
+
+def content_hash(text: str) -> str:
+    """임베딩 입력(build_text) 해시"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def document_key(text: str, embedding_model: str) -> str:
+    """문서 임베딩 저장소 키 (임베딩 모델 + build_text 해시)"""
+    return content_hash(f"{embedding_model}\0{text}")
+
+
+def dedupe_items(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """contentsid가 중복된 item은 처음 것만 남김 (contentsid가 없으면 제외)"""
+    seen: set[str] = set()
+    unique = []
+    for item in items:
+        contentsid = item.get("contentsid")
+        if not contentsid or contentsid in seen:
+            continue
+        seen.add(contentsid)
+        unique.append(item)
+    return unique
+
+
+@dataclass
+class ItemDiff:
+    """이전 빌드 대비 contentsid 변경 내역"""
+
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def to_embed(self) -> list[str]:
+        return self.added + self.changed
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "removed": len(self.removed),
+            "unchanged": self.unchanged,
+        }
+
+
+def diff_items(previous: dict[str, str], current: dict[str, str]) -> ItemDiff:
+    """contentsid → 해시 매핑 두 개를 비교"""
+    diff = ItemDiff()
+    for contentsid, digest in current.items():
+        if contentsid not in previous:
+            diff.added.append(contentsid)
+        elif previous[contentsid] != digest:
+            diff.changed.append(contentsid)
+        else:
+            diff.unchanged += 1
+    diff.removed = [c for c in previous if c not in current]
+    return diff
+
+
+class BuildState:
+    """이전 빌드의 벡터 저장소(IndexIDMap2)와 매니페스트"""
+
+    def __init__(
+        self,
+        vectors: faiss.IndexIDMap2,
+        hashes: dict[str, str],
+        embedding_model: str,
+        version: int = 0,
+    ):
+        self.vectors = vectors
+        self.hashes = hashes
+        self.embedding_model = embedding_model
+        self.version = version
+
+    @classmethod
+    def empty(cls, dimension: int, embedding_model: str) -> "BuildState":
+        return cls(faiss.IndexIDMap2(faiss.IndexFlatL2(dimension)), {}, embedding_model)
+
+    @classmethod
+    def load(cls, index_path: str | Path) -> "BuildState | None":
+        """이전 빌드 상태 로드 (없으면 None)"""
+        manifest_path = manifest_path_for(index_path)
+        vectors_path = vectors_path_for(index_path)
+        if not (manifest_path.exists() and vectors_path.exists()):
+            return None
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        return cls(
+            faiss.read_index(str(vectors_path)),
+            manifest["items"],
+            manifest["embedding_model"],
+            manifest["version"],
+        )
+
+    def apply(self, diff: ItemDiff, hashes: dict[str, str], embeddings: np.ndarray):
+        """변경/삭제된 벡터를 제거하고 추가/변경된 벡터(diff.to_embed 순서)를 반영
+
+        추가분도 먼저 제거하므로, 이전 빌드가 저장 도중 중단되어 매니페스트가
+        벡터 저장소보다 오래되었어도 id가 중복되지 않습니다.
+        """
+        stale = diff.to_embed + diff.removed
+        if stale:
+            self.vectors.remove_ids(np.array([content_id(c) for c in stale]))
+        if diff.to_embed:
+            self.vectors.add_with_ids(
+                np.ascontiguousarray(embeddings, dtype=np.float32),
+                np.array([content_id(c) for c in diff.to_embed], dtype=np.int64),
+            )
+        self.hashes = dict(hashes)
+
+    def embeddings_for(self, items: list[dict[str, Any]]) -> np.ndarray:
+        """item 순서대로 저장된 벡터를 (N, D) 행렬로 반환"""
+        ids = np.array([content_id(item["contentsid"]) for item in items])
+        return self.vectors.reconstruct_batch(ids)
+
+    def save(self, index_path: str | Path, summary: dict[str, int]) -> None:
+        """새 버전으로 벡터 저장소와 매니페스트 저장"""
+        self.version += 1
+        faiss.write_index(self.vectors, str(vectors_path_for(index_path)))
+        manifest = {
+            "version": self.version,
+            "embedding_model": self.embedding_model,
+            "dimension": self.vectors.d,
+            "changes": summary,
+            "items": self.hashes,
+        }
+        manifest_path_for(index_path).write_text(
+            json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
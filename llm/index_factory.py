@@ -0,0 +1,242 @@
+"""FAISS 인덱스 생성/설정/평가 유틸
+
+build_index에서 인덱스 타입별로 인덱스를 만들고, 런타임(RAGRetriever)에서는
+아티팩트에 기록된 검색 파라미터(nprobe, efSearch)를 다시 적용합니다.
+"""
+
+import logging
+import math
+import time
+from pathlib import Path
+from typing import Any
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 지원하는 인덱스 타입
+# - flat: IndexFlatL2 (전수 탐색, 정확)
+# - hnsw: IndexHNSWFlat (그래프 기반 근사 탐색)
+# - ivf: IndexIVFFlat (클러스터 기반 근사 탐색)
+# - fp16: IndexScalarQuantizer fp16 (전수 탐색, 벡터 메모리 1/2)
+# - sq8: IndexScalarQuantizer 8bit (전수 탐색, 벡터 메모리 1/4)
+# - pq: IndexPQ (곱 양자화, 벡터당 pq_m 바이트)
+INDEX_TYPES = ("flat", "hnsw", "ivf", "fp16", "sq8", "pq")
+
+# 런타임에 다시 적용할 검색 파라미터 (FAISS ParameterSpace 이름)
+SEARCH_PARAMS = ("nprobe", "efSearch")
+
+# PQ 서브벡터 수 상한 (1536차원 기준 96 = 서브벡터당 16차원, 벡터당 96바이트)
+MAX_PQ_M = 96
+
+
+def default_nlist(n: int) -> int:
+    """IVF 클러스터 수 기본값 (4·√N, 클러스터당 학습 벡터 39개 이상 유지)"""
+    return max(1, min(int(4 * math.sqrt(n)), n // 39))
+
+
+def default_pq_m(d: int) -> int:
+    """PQ 서브벡터 수 기본값 (차원의 약수 중 MAX_PQ_M 이하 최대값, 256/512차원 → 64)"""
+    return max(m for m in range(1, min(d, MAX_PQ_M) + 1) if d % m == 0)
+
+
+def check_pq_m(d: int, pq_m: int) -> None:
+    """pq_m이 차원의 약수인지 확인 (아니면 ValueError)"""
+    if pq_m <= 0 or d % pq_m:
+        raise ValueError(
+            f"pq_m({pq_m})은 차원({d})의 약수여야 합니다 "
+            f"(--pq-m을 생략하면 {default_pq_m(d)} 사용)"
+        )
+
+
+def create_index(
+    embeddings: np.ndarray,
+    index_type: str = "flat",
+    *,
+    nlist: int | None = None,
+    nprobe: int = 8,
+    hnsw_m: int = 32,
+    ef_construction: int = 200,
+    ef_search: int = 64,
+    pq_m: int | None = None,
+    pq_nbits: int = 8,
+) -> tuple[faiss.Index, dict[str, Any]]:
+    """임베딩으로 지정한 타입의 인덱스를 생성
+
+    Args:
+        embeddings: (N, D) float32 임베딩
+        index_type: INDEX_TYPES 중 하나
+        nlist: IVF 클러스터 수 (None이면 default_nlist)
+        nprobe: IVF 검색 시 탐색할 클러스터 수
+        hnsw_m: HNSW 노드당 이웃 수
+        ef_construction: HNSW 구축 시 탐색 폭
+        ef_search: HNSW 검색 시 탐색 폭
+        pq_m: PQ 서브벡터 수 (차원의 약수, 벡터당 코드 바이트 수, None이면
+            default_pq_m)
+        pq_nbits: PQ 서브벡터당 비트 수 (학습 벡터 수가 적으면 자동으로 낮춤)
+
+    Returns:
+        (index, params): 생성된 인덱스와 아티팩트에 기록할 파라미터
+    """
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    n, d = embeddings.shape
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(d)
+        params: dict[str, Any] = {}
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(d, hnsw_m)
+        index.hnsw.efConstruction = ef_construction
+        params = {"M": hnsw_m, "efConstruction": ef_construction, "efSearch": ef_search}
+    elif index_type == "ivf":
+        nlist = nlist or default_nlist(n)
+        quantizer = faiss.IndexFlatL2(d)
+        index = faiss.IndexIVFFlat(quantizer, d, nlist)
+        index.train(embeddings)
+        params = {"nlist": nlist, "nprobe": min(nprobe, nlist)}
+    elif index_type in ("fp16", "sq8"):
+        qtype = {
+            "fp16": faiss.ScalarQuantizer.QT_fp16,
+            "sq8": faiss.ScalarQuantizer.QT_8bit,
+        }[index_type]
+        index = faiss.IndexScalarQuantizer(d, qtype, faiss.METRIC_L2)
+        index.train(embeddings)
+        params = {}
+    elif index_type == "pq":
+        pq_m = pq_m or default_pq_m(d)
+        check_pq_m(d, pq_m)
+        # 코드북 centroid(2^nbits)당 학습 벡터 39개 이상이 되도록 nbits 제한
+        nbits = min(pq_nbits, max(1, int(math.log2(n / 39))))
+        index = faiss.IndexPQ(d, pq_m, nbits)
+        index.train(embeddings)
+        params = {"M": pq_m, "nbits": nbits}
+    else:
+        raise ValueError(
+            f"지원하지 않는 인덱스 타입: {index_type} (가능: {INDEX_TYPES})"
+        )
+
+    assert index.is_trained
+    index.add(embeddings)
+    configure_index(index, params)
+    return index, params
+
+
+def configure_index(index: faiss.Index, params: dict[str, Any]) -> None:
+    """아티팩트에 기록된 검색 파라미터(nprobe, efSearch)를 인덱스에 적용"""
+    space = faiss.ParameterSpace()
+    for name in SEARCH_PARAMS:
+        if name in params:
+            space.set_index_parameter(index, name, params[name])
+
+
+def enable_reconstruct(index: faiss.Index) -> None:
+    """저장된 벡터를 id로 복원(reconstruct)할 수 있게 준비
+
+    IVF 인덱스는 id → 역리스트 위치 direct map을 만들어야 복원할 수 있고,
+    나머지 타입(flat/hnsw/fp16/sq8/pq)은 그대로 복원됩니다(압축 타입은 근사값).
+    """
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except RuntimeError:
+        return
+    ivf.make_direct_map()
+
+
+def index_version(path: str | Path) -> str:
+    """인덱스 파일 버전 (파일이 다시 빌드되면 바뀌는 mtime/크기 기반 문자열)"""
+    stat = Path(path).stat()
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def read_index(path: str | Path, mmap: bool = True) -> faiss.Index:
+    """인덱스 파일 로드
+
+    mmap=True이면 벡터 코드를 읽기 전용으로 memory-map 하여(IO_FLAG_MMAP_IFC)
+    같은 노드의 워커들이 프로세스 힙 복사 없이 페이지 캐시를 공유합니다.
+    memory-map을 지원하지 않는 FAISS 빌드/인덱스면 일반 로드로 폴백합니다.
+    """
+    flags = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+    if mmap and flags is not None:
+        try:
+            return faiss.read_index(str(path), flags | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError as exc:
+            logger.warning(f"인덱스 memory-map 로드 실패, 일반 로드로 진행: {exc}")
+    return faiss.read_index(str(path))
+
+
+def latency_stats(latencies_ms: Any) -> dict[str, float]:
+    """지연시간(ms) 목록의 평균/p50/p95/p99"""
+    latencies = np.asarray(latencies_ms, dtype=np.float64)
+    return {
+        "mean": float(latencies.mean()),
+        "p50": float(np.percentile(latencies, 50)),
+        "p95": float(np.percentile(latencies, 95)),
+        "p99": float(np.percentile(latencies, 99)),
+    }
+
+
+def measure_latency(
+    index: faiss.Index, queries: np.ndarray, top_k: int
+) -> tuple[np.ndarray, dict[str, float]]:
+    """쿼리를 한 건씩 검색하여 결과와 쿼리당 지연시간 통계(ms)를 반환"""
+    indices = np.empty((len(queries), top_k), dtype=np.int64)
+    latencies = np.empty(len(queries), dtype=np.float64)
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        _, row = index.search(query.reshape(1, -1), top_k)
+        latencies[i] = (time.perf_counter() - start) * 1000
+        indices[i] = row[0]
+
+    return indices, latency_stats(latencies)
+
+
+def recall_at_k(indices: np.ndarray, ground_truth: np.ndarray) -> float:
+    """정답(전수 탐색) top-k 대비 근사 top-k의 평균 재현율"""
+    k = ground_truth.shape[1]
+    hits = sum(
+        len(set(found.tolist()) & set(truth.tolist()))
+        for found, truth in zip(indices, ground_truth, strict=True)
+    )
+    return hits / (len(ground_truth) * k)
+
+
+def evaluate_index(
+    index: faiss.Index,
+    reference: faiss.Index,
+    queries: np.ndarray,
+    top_k: int = 10,
+    target_ms: float | None = None,
+) -> dict[str, Any]:
+    """전수 탐색 인덱스 대비 recall@k와 쿼리당 지연시간을 측정
+
+    Args:
+        index: 평가할 인덱스
+        reference: 정답을 만들 IndexFlatL2
+        queries: (Q, D) 평가 쿼리
+        top_k: recall@k의 k
+        target_ms: 지연시간 목표 (p99 기준 충족 여부 기록)
+
+    Returns:
+        recall_at_k, latency_ms, reference_latency_ms 등을 담은 리포트 dict
+    """
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    ground_truth, reference_latency = measure_latency(reference, queries, top_k)
+    found, latency = measure_latency(index, queries, top_k)
+
+    report: dict[str, Any] = {
+        "num_queries": len(queries),
+        "top_k": top_k,
+        "recall_at_k": recall_at_k(found, ground_truth),
+        "latency_ms": latency,
+        "reference_latency_ms": reference_latency,
+    }
+    if target_ms is not None:
+        report["target_ms"] = target_ms
+        report["within_target"] = latency["p99"] <= target_ms
+    return report
+
+
+def index_memory_bytes(index: faiss.Index) -> int:
+    """직렬화 크기로 본 인덱스 메모리 사용량 (벡터 코드 + 구조)"""
+    return int(faiss.serialize_index(index).nbytes)
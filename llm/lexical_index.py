@@ -0,0 +1,205 @@
+"""문자 n-gram BM25 역색인
+
+임베딩 API 없이 동작하는 어휘 검색용 인덱스입니다. title, alltag,
+introduction을 문자 bigram으로 쪼개 BM25로 점수를 매기며, build_index에서
+FAISS 인덱스와 함께 만들어 .npz 하나로 저장합니다.
+
+하이브리드 검색에서는 벡터 검색 결과와 reciprocal rank fusion(RRF)으로
+합치고, 임베딩이 지연되거나 실패하면 어휘 검색 결과만으로 응답합니다.
+"""
+
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# 필드별 가중치 (term frequency에 곱함)
+FIELD_WEIGHTS = {"title": 2.0, "alltag": 1.0, "introduction": 1.0}
+
+
+def lexical_path_for(index_path: str | Path) -> Path:
+    """FAISS 인덱스 경로에 대응하는 어휘 인덱스 경로"""
+    index_path = Path(index_path)
+    return index_path.with_name(f"{index_path.stem}_lexical.npz")
+
+
+def char_ngrams(text: str, n: int = 2) -> list[str]:
+    """공백으로 나눈 토큰마다 문자 n-gram 생성 (n보다 짧은 토큰은 그대로)"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    grams = []
+    for token in text.split():
+        token = "".join(ch for ch in token if ch.isalnum())
+        if len(token) <= n:
+            if token:
+                grams.append(token)
+            continue
+        grams.extend(token[i : i + n] for i in range(len(token) - n + 1))
+    return grams
+
+
+def _item_field(item: dict[str, Any], field: str) -> str:
+    if field == "alltag":
+        return item.get("alltag") or item.get("tag") or ""
+    return item.get(field) or ""
+
+
+class LexicalIndex:
+    """CSR 형태(term → 문서 posting)의 BM25 역색인"""
+
+    def __init__(
+        self,
+        terms: list[str],
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        term_freqs: np.ndarray,
+        doc_lengths: np.ndarray,
+        ngram: int = 2,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.terms = terms
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.ngram = ngram
+        self.k1 = k1
+        self.b = b
+
+        num_docs = len(doc_lengths)
+        doc_freqs = np.diff(indptr).astype(np.float32)
+        self.idf = np.log1p((num_docs - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        avg_length = float(doc_lengths.mean()) if num_docs else 0.0
+        # BM25 분모의 문서 길이 항은 쿼리와 무관하므로 미리 계산
+        self._length_norm = k1 * (1 - b + b * doc_lengths / max(avg_length, 1e-9))
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.doc_lengths)
+
+    @classmethod
+    def build(
+        cls,
+        items: list[dict[str, Any]],
+        ngram: int = 2,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> "LexicalIndex":
+        """items로 역색인 생성 (i번째 문서 = i번째 item = i번째 벡터)"""
+        postings: dict[str, list[tuple[int, float]]] = {}
+        doc_lengths = np.zeros(len(items), dtype=np.float32)
+        for doc_id, item in enumerate(items):
+            counts: Counter[str] = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                for gram in char_ngrams(_item_field(item, field), ngram):
+                    counts[gram] += weight
+            doc_lengths[doc_id] = sum(counts.values())
+            for gram, tf in counts.items():
+                postings.setdefault(gram, []).append((doc_id, tf))
+
+        terms = sorted(postings)
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(postings[t]) for t in terms])
+        doc_ids = np.fromiter(
+            (d for t in terms for d, _ in postings[t]), dtype=np.int32, count=indptr[-1]
+        )
+        term_freqs = np.fromiter(
+            (f for t in terms for _, f in postings[t]),
+            dtype=np.float32,
+            count=indptr[-1],
+        )
+        return cls(terms, indptr, doc_ids, term_freqs, doc_lengths, ngram, k1, b)
+
+    def save(self, path: str | Path) -> None:
+        """.npz(비압축)로 저장"""
+        np.savez(
+            path,
+            terms=np.array(self.terms, dtype=np.str_),
+            indptr=self.indptr,
+            doc_ids=self.doc_ids,
+            term_freqs=self.term_freqs,
+            doc_lengths=self.doc_lengths,
+            params=np.array([self.ngram, self.k1, self.b], dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LexicalIndex":
+        with np.load(path, allow_pickle=False) as data:
+            ngram, k1, b = data["params"].tolist()
+            return cls(
+                data["terms"].tolist(),
+                data["indptr"],
+                data["doc_ids"],
+                data["term_freqs"],
+                data["doc_lengths"],
+                int(ngram),
+                k1,
+                b,
+            )
+
+    def scores(self, query: str) -> np.ndarray:
+        """쿼리에 대한 문서별 BM25 점수 (num_docs,)"""
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        for gram, query_tf in Counter(char_ngrams(query, self.ngram)).items():
+            term = self.vocabulary.get(gram)
+            if term is None:
+                continue
+            start, end = self.indptr[term], self.indptr[term + 1]
+            docs = self.doc_ids[start:end]
+            tf = self.term_freqs[start:end]
+            scores[docs] += (
+                query_tf
+                * self.idf[term]
+                * tf
+                * (self.k1 + 1)
+                / (tf + self._length_norm[docs])
+            )
+        return scores
+
+    def search(
+        self, query: str, top_k: int = 3, allowed_ids: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """BM25 상위 문서 검색 (점수 0인 문서는 제외)
+
+        Args:
+            query: 검색할 텍스트 쿼리
+            top_k: 반환할 문서 수
+            allowed_ids: 지정하면 이 문서 id들만 대상으로 검색 (지역 필터)
+
+        Returns:
+            (scores, doc_ids): 점수 내림차순, 각각 (k,) shape (k ≤ top_k)
+        """
+        scores = self.scores(query)
+        if allowed_ids is not None:
+            mask = np.zeros(self.num_docs, dtype=bool)
+            mask[allowed_ids] = True
+            scores[~mask] = 0.0
+        k = min(top_k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return scores[top], top.astype(np.int64)
+
+
+def reciprocal_rank_fusion(
+    rankings: list[np.ndarray], top_k: int, k: int = 60
+) -> np.ndarray:
+    """여러 순위 리스트를 RRF(Σ 1 / (k + rank))로 합쳐 상위 top_k 문서 id 반환
+
+    Args:
+        rankings: 순위 순서의 문서 id 배열 리스트 (-1은 무시)
+        top_k: 반환할 문서 수
+        k: RRF 상수 (클수록 하위 순위의 영향이 커짐)
+    """
+    fused: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking.tolist()):
+            if doc_id < 0:
+                continue
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    ranked = sorted(fused, key=lambda doc_id: -fused[doc_id])
+    return np.array(ranked[:top_k], dtype=np.int64)
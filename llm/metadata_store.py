@@ -0,0 +1,210 @@
+"""memory-map 기반 컬럼형 메타데이터 저장소
+
+visitjeju_metadata.json은 로드할 때마다 repPhoto, phoneno, 지역 코드 등
+검색에 쓰지 않는 필드까지 전체 items를 파싱해 프로세스 힙에 올립니다.
+이 모듈은 검색 결과 포매팅에 필요한 필드(FIELDS)만 하나의 UTF-8 문자열
+버퍼에 모아 저장하고, 로드 시 memory-map 하여 검색된 행의 문자열만
+그 자리에서 디코딩합니다. 같은 노드의 워커들은 페이지 캐시를 공유합니다.
+
+파일 구성 (모든 정수는 little-endian)::
+
+    magic (8B) | header_len (u64) | header JSON (8B 정렬 패딩)
+    | offsets (u64, count * len(fields) + 1개) | 문자열 버퍼
+
+행 우선으로 저장하므로 i번째 행의 j번째 필드는
+``buffer[offsets[i * F + j]:offsets[i * F + j + 1]]`` 입니다 (F = 필드 수).
+"""
+
+import itertools
+import json
+import logging
+import mmap
+import os
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VJMETA\x00\x02"
+FORMAT_VERSION = 2
+_ALIGN = 8
+
+# 검색 결과 포매팅에 필요한 필드 (format_results의 결과 키와 동일)
+FIELDS = ("title", "introduction", "alltag", "address")
+
+
+def store_path_for(metadata_path: str | Path) -> Path:
+    """JSON 메타데이터 경로에 대응하는 바이너리 저장소 경로 (``.bin``)"""
+    return Path(metadata_path).with_suffix(".bin")
+
+
+def extract_fields(item: dict[str, Any]) -> tuple[str, ...]:
+    """원본 item에서 FIELDS 순서대로 값을 추출 (태그/주소는 대체 필드 사용)"""
+    return (
+        item.get("title") or "",
+        item.get("introduction") or "",
+        item.get("alltag") or item.get("tag") or "",
+        item.get("roadaddress") or item.get("address") or "",
+    )
+
+
+def write_metadata_store(
+    path: str | Path,
+    items: list[dict[str, Any]],
+    embedding_model: str,
+    index_info: dict[str, Any] | None = None,
+) -> None:
+    """items의 검색용 필드와 모델/인덱스 정보를 저장소로 기록 (임시 파일 → rename)
+
+    Args:
+        path: 저장할 파일 경로
+        items: 원본 items (순서 중요: i번째 벡터 ↔ i번째 item)
+        embedding_model: 인덱스를 만든 임베딩 모델명
+        index_info: {"type": ..., "params": {...}} 인덱스 정보
+    """
+    path = Path(path)
+    encoded = [
+        value.encode("utf-8") for item in items for value in extract_fields(item)
+    ]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    offsets[1:] = np.cumsum([len(b) for b in encoded], dtype=np.uint64)
+
+    header = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "count": len(items),
+            "fields": list(FIELDS),
+            "embedding_model": embedding_model,
+            "index": index_info or {"type": "flat", "params": {}},
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+    header += b" " * (-len(header) % _ALIGN)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).astype("<u8").tobytes())
+        f.write(header)
+        f.write(offsets.tobytes())
+        f.write(b"".join(encoded))
+    os.replace(tmp_path, path)
+
+
+class MetadataStore(Sequence):
+    """memory-map 된 컬럼형 items 시퀀스
+
+    로드 시에는 헤더만 파싱하고, 각 행은 조회할 때 필요한 문자열만
+    memory-map 에서 바로 디코딩합니다.
+    """
+
+    def __init__(self, path: str | Path):
+        """저장소 파일을 읽기 전용으로 memory-map
+
+        Args:
+            path: write_metadata_store로 만든 파일 경로
+        """
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        if buffer[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"지원하지 않는 메타데이터 저장소 형식: {self.path}")
+
+        start = len(MAGIC)
+        header_len = int.from_bytes(buffer[start : start + 8], "little")
+        start += 8
+        header = json.loads(bytes(buffer[start : start + header_len]))
+        start += header_len
+
+        self.fields: tuple[str, ...] = tuple(header["fields"])
+        self._count: int = header["count"]
+        end = start + 8 * (self._count * len(self.fields) + 1)
+        # 파일의 u64는 little-endian (그 외 플랫폼에서는 복사본 사용)
+        if sys.byteorder == "little":
+            self._offsets = buffer[start:end].cast("Q")
+        else:
+            self._offsets = np.frombuffer(buffer[start:end], dtype="<u8").tolist()
+        self._buffer = buffer[end:]
+
+        self.embedding_model: str = header["embedding_model"]
+        self.index_info: dict[str, Any] = header["index"]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return dict(zip(self.fields, self.row(i), strict=True))
+
+    def row(self, i: int) -> tuple[str, ...]:
+        """i번째 행의 필드 값들을 fields 순서대로 반환"""
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        width = len(self.fields)
+        bounds = self._offsets[i * width : (i + 1) * width + 1]
+        return tuple(
+            str(self._buffer[start:end], "utf-8")
+            for start, end in itertools.pairwise(bounds)
+        )
+
+    def field(self, i: int, name: str) -> str:
+        """i번째 행의 필드 하나만 디코딩"""
+        return self.row(i)[self.fields.index(name)]
+
+
+def load_metadata(
+    metadata_path: str | Path,
+) -> tuple[Sequence[dict[str, Any]], str, dict[str, Any]]:
+    """메타데이터 로드 (바이너리 저장소가 있으면 memory-map, 없으면 JSON)
+
+    Args:
+        metadata_path: JSON 메타데이터 경로
+
+    Returns:
+        (items, embedding_model, index_info)
+    """
+    store_path = store_path_for(metadata_path)
+    if store_path.exists():
+        try:
+            store = MetadataStore(store_path)
+        except ValueError:
+            logger.warning(
+                f"메타데이터 저장소를 읽을 수 없어 JSON을 사용합니다: {store_path}"
+            )
+        else:
+            return store, store.embedding_model, store.index_info
+
+    with open(metadata_path, encoding="utf-8") as f:
+        metadata = json.load(f)
+    # 이전 아티팩트는 인덱스 정보가 없음 (flat)
+    index_info = metadata.get("index", {"type": "flat", "params": {}})
+    return metadata["items"], metadata["embedding_model"], index_info
+
+
+def convert_json_metadata(metadata_path: str | Path) -> Path:
+    """기존 JSON 메타데이터를 바이너리 저장소로 변환 (인덱스 재빌드 불필요)"""
+    with open(metadata_path, encoding="utf-8") as f:
+        metadata = json.load(f)
+    store_path = store_path_for(metadata_path)
+    write_metadata_store(
+        store_path,
+        metadata["items"],
+        metadata["embedding_model"],
+        metadata.get("index"),
+    )
+    return store_path
+
+
+if __name__ == "__main__":
+    from llm import config
+
+    source = sys.argv[1] if len(sys.argv) > 1 else config.METADATA_PATH
+    print(f"[INFO] Saved metadata store to {convert_json_metadata(source)}")
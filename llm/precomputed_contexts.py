@@ -0,0 +1,137 @@
+"""오프라인 사전 계산 RAG 검색 결과
+
+프롬프트가 모든 요청을 다섯 가지 체험 유형 중 하나로 분류하므로, 체험 유형과
+자주 쓰는 직업/재료 패턴(config.PRECOMPUTED_CONTEXT_PATTERNS) 조합별 top-k 검색
+결과를 build_index에서 미리 계산해 ``<인덱스 이름>_contexts.json``으로
+저장합니다. 런타임은 요청의 체험 유형과 직업/재료 텍스트로 항목을 찾아
+임베딩 호출과 FAISS 검색 없이 결과를 반환합니다.
+
+파일에는 인덱스 버전을 함께 기록하여, 인덱스만 다시 빌드된 경우에는
+이전 결과를 사용하지 않습니다.
+"""
+
+import json
+import math
+import unicodedata
+from pathlib import Path
+from typing import Any
+
+
+def contexts_path_for(index_path: str | Path) -> Path:
+    """FAISS 인덱스 경로에 대응하는 사전 계산 결과 경로"""
+    index_path = Path(index_path)
+    return index_path.with_name(f"{index_path.stem}_contexts.json")
+
+
+def context_query(category: str, pattern: str) -> str:
+    """(체험 유형, 패턴)의 검색 쿼리 (canonicalize_query와 같은 '유형 …' 형태)"""
+    return " ".join(part for part in (category, pattern) if part)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def save_precomputed_contexts(
+    path: str | Path,
+    entries: list[tuple[str, str, list[dict[str, Any]]]],
+    top_k: int,
+    index_version: str,
+) -> None:
+    """(체험 유형, 패턴, 검색 결과) 목록을 JSON으로 저장 (NaN 거리는 null)"""
+    data = {
+        "index_version": index_version,
+        "top_k": top_k,
+        "contexts": [
+            {
+                "category": category,
+                "pattern": pattern,
+                "results": [
+                    {
+                        **result,
+                        "distance": (
+                            result["distance"]
+                            if math.isfinite(result["distance"])
+                            else None
+                        ),
+                    }
+                    for result in results
+                ],
+            }
+            for category, pattern, results in entries
+        ],
+    }
+    Path(path).write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+class PrecomputedContexts:
+    """(체험 유형, 패턴) → 사전 계산된 검색 결과"""
+
+    def __init__(self, data: dict[str, Any]):
+        self.index_version: str = data["index_version"]
+        self.top_k: int = data["top_k"]
+        self._results: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self._patterns: dict[str, list[str]] = {}
+        for entry in data["contexts"]:
+            category, pattern = entry["category"], entry["pattern"]
+            self._results[category, pattern] = [
+                {
+                    **result,
+                    "distance": (
+                        math.nan if result["distance"] is None else result["distance"]
+                    ),
+                }
+                for result in entry["results"]
+            ]
+            self._patterns.setdefault(category, []).append(pattern)
+        # 긴(구체적인) 패턴 우선
+        for patterns in self._patterns.values():
+            patterns.sort(key=len, reverse=True)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PrecomputedContexts":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def lookup(
+        self, category: str, text: str = "", top_k: int = 3
+    ) -> list[dict[str, Any]] | None:
+        """체험 유형과 직업/재료 텍스트에 맞는 사전 계산 결과 (없으면 None)
+
+        text에 포함된 가장 긴 패턴을 고르고, text가 비어 있으면 체험 유형
+        기본("" 패턴) 결과를 사용합니다. text가 있는데 일치하는 패턴이 없거나
+        top_k가 저장된 개수보다 크면 None (요청 텍스트로 실시간 검색하도록).
+
+        Args:
+            category: canonical 체험 유형 (돌담/감귤/해녀/요리/목공)
+            text: 직업/재료 등 요청 텍스트
+            top_k: 필요한 결과 수
+        """
+        patterns = self._patterns.get(category)
+        if top_k > self.top_k or not patterns:
+            self.misses += 1
+            return None
+
+        normalized = _normalize(text)
+        for pattern in patterns:
+            key = _normalize(pattern)
+            # "" 패턴은 요청 텍스트가 없을 때만 (있으면 그 텍스트가 검색에 반영되어야 함)
+            if key in normalized if key else not normalized:
+                self.hits += 1
+                return self._results[category, pattern][:top_k]
+
+        self.misses += 1
+        return None
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._results),
+        }
@@ -3,28 +3,61 @@
 FAISS 인덱스를 사용하여 유사한 문서를 검색하는 기능을 제공합니다.
 """
 
+import asyncio
 import contextlib
 import json
 import logging
+import math
 import os
 import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import faiss
 import numpy as np
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from llm import config
+from llm.embedding_backend import (
+    EmbeddingBackend,
+    cache_path_for_model,
+    create_embedding_backend,
+    embedding_key,
+)
+from llm.embedding_batcher import EmbeddingBatcher
+from llm.embedding_cache import EmbeddingCacheStore
+from llm.geo_index import GeoIndex, geo_path_for
+from llm.index_factory import (
+    configure_index,
+    enable_reconstruct,
+    index_version,
+    read_index,
+)
+from llm.lexical_index import LexicalIndex, lexical_path_for, reciprocal_rank_fusion
+from llm.metadata_store import MetadataStore, extract_fields, load_metadata
+from llm.precomputed_contexts import PrecomputedContexts, contexts_path_for
+from llm.region_filter import Region, RegionIndex, filtered_search, region_path_for
 
 logger = logging.getLogger(__name__)
 
 client: OpenAI | None = None  # lazy init
+async_client: AsyncOpenAI | None = None  # lazy init
+
+# FAISS 검색 전용 스레드 풀 (이벤트 루프 블로킹 방지, 동시 검색 수 제한)
+_search_executor = ThreadPoolExecutor(
+    max_workers=config.SEARCH_MAX_WORKERS, thread_name_prefix="faiss-search"
+)
 
 EMBEDDING_MODEL = config.EMBEDDING_MODEL
-EMBEDDING_CACHE_PATH = config.EMBEDDING_CACHE_PATH
+EMBEDDING_CACHE_STORE_PATH = config.EMBEDDING_CACHE_STORE_PATH
+EMBEDDING_CACHE_PATH = config.EMBEDDING_CACHE_PATH  # 이전 JSON 캐시 (변환용)
 
-_embedding_cache: dict[str, list[float]] | None = None
+_embedding_backend: EmbeddingBackend | None = None
+_embedding_cache: EmbeddingCacheStore | None = None
+_embedding_cache_load: asyncio.Future[EmbeddingCacheStore] | None = None
+_embedding_batcher: EmbeddingBatcher | None = None
 
 
 def _get_client() -> OpenAI:
@@ -38,33 +71,103 @@ def _get_client() -> OpenAI:
     return client
 
 
-def _load_embedding_cache() -> dict[str, list[float]]:
-    """디스크에서 임베딩 캐시 로드 (최초 1회)."""
+def _get_async_client() -> AsyncOpenAI:
+    """Lazy AsyncOpenAI 클라이언트 생성 (ENV 없으면 명시적 예외)."""
+    global async_client
+    if async_client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY is required for embeddings")
+        async_client = AsyncOpenAI(api_key=api_key)
+    return async_client
+
+
+def get_embedding_backend() -> EmbeddingBackend:
+    """쿼리 임베딩 백엔드 (config.EMBEDDING_BACKEND/EMBEDDING_DIMENSIONS, 최초 1회 생성)."""
+    global _embedding_backend
+    if _embedding_backend is None:
+        _embedding_backend = create_embedding_backend(
+            config.EMBEDDING_BACKEND,
+            EMBEDDING_MODEL,
+            client=_get_client,
+            async_client=_get_async_client,
+            dimensions=config.EMBEDDING_DIMENSIONS,
+        )
+    return _embedding_backend
+
+
+def set_embedding_backend(backend: EmbeddingBackend | None) -> None:
+    """쿼리 임베딩 백엔드 교체 (None이면 config 기준으로 다시 생성)
+
+    백엔드마다 벡터 공간이 다르므로 임베딩 캐시도 다시 로드합니다.
+    """
+    global _embedding_backend, _embedding_cache, _embedding_batcher
+    _embedding_backend = backend
+    _embedding_cache = None
+    _embedding_batcher = None
+
+
+def _load_embedding_cache() -> EmbeddingCacheStore:
+    """디스크에서 임베딩 캐시 로드 (최초 1회, memory-map, 백엔드 모델/차원별 파일)."""
 
     global _embedding_cache
+    if _embedding_cache is None:
+        backend = get_embedding_backend()
+        model = embedding_key(backend.model, backend.dimension)
+        _embedding_cache = EmbeddingCacheStore(
+            cache_path_for_model(EMBEDDING_CACHE_STORE_PATH, model),
+            max_entries=config.EMBEDDING_CACHE_MAX_ENTRIES,
+            legacy_json_path=(
+                EMBEDDING_CACHE_PATH if model == EMBEDDING_MODEL else None
+            ),
+        )
+    return _embedding_cache
+
+
+async def _aload_embedding_cache() -> EmbeddingCacheStore:
+    """_load_embedding_cache의 비동기 버전 (최초 로드의 파일 락/읽기는 스레드에서 수행)
+
+    로드 중에 들어온 호출자는 같은 로드를 기다리며, 도착 순서대로 재개됩니다.
+    """
+    global _embedding_cache_load
     if _embedding_cache is not None:
         return _embedding_cache
+    load = _embedding_cache_load
+    if load is None or load.done() or load.get_loop() is not asyncio.get_running_loop():
+        load = _embedding_cache_load = asyncio.ensure_future(
+            asyncio.to_thread(_load_embedding_cache)
+        )
+    return await asyncio.shield(load)
 
-    if EMBEDDING_CACHE_PATH.exists():
-        with EMBEDDING_CACHE_PATH.open(encoding="utf-8") as f:
-            try:
-                _embedding_cache = json.load(f)
-            except json.JSONDecodeError:
-                _embedding_cache = {}
-    else:
-        _embedding_cache = {}
 
-    return _embedding_cache
+def flush_embedding_cache() -> None:
+    """모아 둔 캐시 히트를 기록하여 재시작 후에도 LRU 순서 유지 (종료 시 호출)."""
+    if _embedding_cache is not None:
+        with contextlib.suppress(OSError):
+            _embedding_cache.flush()
 
 
-def _save_embedding_cache(cache: dict[str, list[float]]) -> None:
-    """임베딩 캐시를 디스크에 저장."""
+def _cache_put(cache: EmbeddingCacheStore, keys: list[str], vectors: Any) -> None:
+    """캐시 append (디스크 오류는 검색을 막지 않도록 무시)."""
+    with contextlib.suppress(OSError):
+        cache.put_many(keys, np.asarray(vectors, dtype=np.float32))
 
-    EMBEDDING_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    EMBEDDING_CACHE_PATH.write_text(
-        json.dumps(cache, ensure_ascii=False),
-        encoding="utf-8",
-    )
+
+def _cached_vectors(
+    cache: EmbeddingCacheStore, queries: list[str]
+) -> dict[str, np.ndarray]:
+    """캐시에 있는 쿼리의 벡터 (미스가 있으면 다른 워커가 추가한 키를 읽어 한 번 더 확인)
+
+    refresh가 파일 락을 기다릴 수 있으므로 이벤트 루프에서는 스레드로 호출합니다.
+    """
+    vectors = {q: v for q in queries if (v := cache.get(q)) is not None}
+    if len(vectors) < len(queries):
+        with contextlib.suppress(OSError):
+            cache.refresh()
+        for query in queries:
+            if query not in vectors and (cached := cache.get(query)) is not None:
+                vectors[query] = cached
+    return vectors
 
 
 def _warmup_cache_if_needed() -> None:
@@ -79,17 +182,7 @@ def _warmup_cache_if_needed() -> None:
     if not missing:
         return
 
-    response = _get_client().embeddings.create(
-        model=EMBEDDING_MODEL,
-        input=missing,
-        encoding_format="float",
-    )
-
-    for query, data in zip(missing, response.data, strict=False):
-        cache[query] = data.embedding
-
-    with contextlib.suppress(OSError):
-        _save_embedding_cache(cache)
+    _cache_put(cache, missing, get_embedding_backend().embed(missing))
 
 
 def embed_query(query: str) -> np.ndarray:
@@ -102,48 +195,366 @@ def embed_query(query: str) -> np.ndarray:
         (1536,) shape의 float32 numpy 배열
     """
     cache = _load_embedding_cache()
-    if query in cache:
-        return np.array(cache[query], dtype=np.float32)
+    cached = _cached_vectors(cache, [query]).get(query)
+    if cached is not None:
+        return cached
 
-    response = _get_client().embeddings.create(
-        model=EMBEDDING_MODEL,
-        input=query,
-        encoding_format="float",
-    )
+    embedding = get_embedding_backend().embed([query])[0]
+    _cache_put(cache, [query], [embedding])
 
-    embedding = response.data[0].embedding
-    cache[query] = embedding
-    with contextlib.suppress(OSError):
-        _save_embedding_cache(cache)
+    return embedding
+
+
+def embed_queries(queries: list[str]) -> np.ndarray:
+    """여러 쿼리를 임베딩 행렬로 변환 (캐시 미스는 한 번의 API 호출로 처리)
+
+    Args:
+        queries: 임베딩할 텍스트 쿼리 리스트
+
+    Returns:
+        (N, 1536) shape의 float32 numpy 배열 (queries 순서 유지)
+    """
+    cache = _load_embedding_cache()
+    vectors = _cached_vectors(cache, queries)
+
+    # 중복 제거 후 캐시 미스만 한 번에 임베딩
+    missing = list(dict.fromkeys(q for q in queries if q not in vectors))
+    if missing:
+        embeddings = get_embedding_backend().embed(missing)
+        _cache_put(cache, missing, embeddings)
+        vectors.update(zip(missing, embeddings, strict=True))
+
+    return np.stack([vectors[query] for query in queries])
 
-    return np.array(embedding, dtype=np.float32)
+
+async def _aembed_batch(queries: list[str]) -> np.ndarray:
+    """임베딩 백엔드로 쿼리 배치를 비동기 임베딩하고 캐시에 기록
+
+    다른 워커가 그새 기록한 쿼리는 API를 호출하지 않고 캐시에서 가져옵니다.
+    캐시 확인/기록(파일 락, append, memmap 재매핑)은 블로킹 I/O이므로 스레드에서 수행
+    """
+    cache = await _aload_embedding_cache()
+    vectors = await asyncio.to_thread(_cached_vectors, cache, queries)
+    missing = [query for query in queries if query not in vectors]
+    if missing:
+        embeddings = await get_embedding_backend().aembed(missing)
+        await asyncio.to_thread(_cache_put, cache, missing, embeddings)
+        vectors.update(zip(missing, embeddings, strict=True))
+    return np.stack([vectors[query] for query in queries])
+
+
+def _get_embedding_batcher() -> EmbeddingBatcher:
+    """현재 이벤트 루프에 묶인 임베딩 배처 반환 (lazy init)."""
+    global _embedding_batcher
+    loop = asyncio.get_running_loop()
+    if _embedding_batcher is None or _embedding_batcher.loop is not loop:
+        _embedding_batcher = EmbeddingBatcher(
+            _aembed_batch,
+            window_ms=config.EMBEDDING_BATCH_WINDOW_MS,
+            max_batch_size=config.EMBEDDING_BATCH_MAX_SIZE,
+        )
+    return _embedding_batcher
+
+
+async def aembed_query(query: str) -> np.ndarray:
+    """embed_query의 비동기 버전 (백엔드의 aembed 사용)
+
+    캐시 미스는 동시에 들어온 다른 요청의 쿼리와 함께 마이크로 배칭되어
+    한 번의 embeddings 요청으로 전송됩니다. 캐시 조회는 락 없는 스냅샷 읽기라서
+    다른 스레드가 캐시를 기록/compaction 하는 동안에도 이벤트 루프를 막지 않습니다.
+
+    Args:
+        query: 임베딩할 텍스트 쿼리
+
+    Returns:
+        (1536,) shape의 float32 numpy 배열
+    """
+    cached = (await _aload_embedding_cache()).get(query)
+    if cached is not None:
+        return cached
+
+    return await _get_embedding_batcher().embed(query)
+
+
+async def asearch(
+    index: faiss.Index,
+    query_vector: np.ndarray,
+    top_k: int = 3,
+    region: Region | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """search의 비동기 버전. FAISS 검색을 전용 스레드 풀에서 실행한다."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _search_executor, search, index, query_vector, top_k, region
+    )
 
 
 def search(
-    index: faiss.IndexFlatL2, query_vector: np.ndarray, top_k: int = 3
+    index: faiss.IndexFlatL2,
+    query_vector: np.ndarray,
+    top_k: int = 3,
+    region: Region | None = None,
 ) -> tuple[np.ndarray, np.ndarray]:
     """FAISS 인덱스에서 쿼리 벡터와 유사한 문서 검색
 
     Args:
         index: FAISS IndexFlatL2 인덱스
-        query_vector: (1536,) shape의 쿼리 벡터
+        query_vector: (1536,) 또는 (N, 1536) shape의 쿼리 벡터
         top_k: 반환할 상위 문서 개수 (default: 3)
+        region: 지정하면 해당 지역 문서의 벡터만 검색 (ID selector)
 
     Returns:
-        (distances, indices): 거리와 인덱스 배열, shape은 각각 (1, top_k)
+        (distances, indices): 거리와 인덱스 배열, shape은 각각 (N, top_k)
     """
     # 쿼리 벡터를 (1, D) shape으로 변환 (FAISS는 배치 입력 요구)
     if query_vector.ndim == 1:
         query_vector = query_vector.reshape(1, -1)
 
     # FAISS 검색 수행
+    if region is not None:
+        return filtered_search(index, query_vector, top_k, region)
     distances, indices = index.search(query_vector, top_k)
 
     return distances, indices
 
 
+def hybrid_search(
+    index: faiss.Index,
+    lexical_index: LexicalIndex,
+    query_vectors: np.ndarray,
+    queries: list[str],
+    top_k: int = 3,
+    region: Region | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """벡터 검색과 BM25 어휘 검색 결과를 RRF로 합쳐 상위 top_k 반환
+
+    Args:
+        index: FAISS 인덱스
+        lexical_index: 같은 문서 순서로 만든 어휘 인덱스
+        query_vectors: (D,) 또는 (N, D) shape의 쿼리 벡터
+        queries: query_vectors와 같은 순서의 쿼리 텍스트 N개
+        top_k: 쿼리별 반환할 문서 수
+        region: 지정하면 두 검색 모두 해당 지역 문서만 대상으로 함
+
+    Returns:
+        (distances, indices): (N, top_k) shape. 벡터 후보에 없던 문서의 거리는 NaN,
+        결과가 top_k보다 적으면 인덱스를 -1로 채움 (FAISS와 동일)
+    """
+    candidates = max(top_k, config.HYBRID_CANDIDATES)
+    distances, indices = search(index, query_vectors, candidates, region)
+    allowed_ids = region.ids if region is not None else None
+
+    fused_distances = np.full((len(queries), top_k), np.nan, dtype=np.float32)
+    fused_indices = np.full((len(queries), top_k), -1, dtype=np.int64)
+    for row, query in enumerate(queries):
+        _, lexical_ids = lexical_index.search(query, candidates, allowed_ids)
+        ids = reciprocal_rank_fusion(
+            [indices[row], lexical_ids], top_k, k=config.RRF_K
+        ).tolist()
+        vector_distance = dict(
+            zip(indices[row].tolist(), distances[row].tolist(), strict=True)
+        )
+        fused_indices[row, : len(ids)] = ids
+        fused_distances[row, : len(ids)] = [vector_distance.get(i, np.nan) for i in ids]
+    return fused_distances, fused_indices
+
+
+def nearby_search(
+    index: faiss.Index,
+    geo_index: GeoIndex,
+    query_vectors: np.ndarray,
+    origin: tuple[float, float],
+    radius_km: float,
+    top_k: int,
+    region: Region | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """origin 반경 radius_km 안의 문서만 대상으로 벡터 검색
+
+    격자 공간 인덱스(GeoIndex.nearby)로 반경 안 문서 id를 찾고, 그 문서들로
+    ID selector 검색을 합니다. region이 있으면 지역 문서와의 교집합만 검색합니다.
+
+    Returns:
+        (distances, indices): (N, top_k) shape, 반경 안 문서가 없으면 (N, 0)
+    """
+    if query_vectors.ndim == 1:
+        query_vectors = query_vectors.reshape(1, -1)
+    _, doc_ids = geo_index.nearby(origin, radius_km)
+    if region is not None:
+        doc_ids = doc_ids[np.isin(doc_ids, region.ids)]
+    if doc_ids.size == 0:
+        empty = (len(query_vectors), 0)
+        return np.empty(empty, dtype=np.float32), np.empty(empty, dtype=np.int64)
+    nearby = Region("radius", f"{radius_km:g}km", doc_ids)
+    return search(index, query_vectors, min(top_k, doc_ids.size), nearby)
+
+
+def append_candidates(
+    distances: np.ndarray,
+    indices: np.ndarray,
+    extra_distances: np.ndarray,
+    extra_indices: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """각 행의 후보 뒤에 아직 없는 extra 후보를 순서대로 이어 붙임
+
+    원래 후보의 순서(검색 순위)는 그대로이며, 빈 자리는 -1/NaN으로 채웁니다.
+    """
+    width = indices.shape[1] + extra_indices.shape[1]
+    merged_distances = np.full((len(indices), width), np.nan, dtype=np.float32)
+    merged_indices = np.full((len(indices), width), -1, dtype=np.int64)
+    for row in range(len(indices)):
+        ids = indices[row].tolist()
+        row_distances = distances[row].tolist()
+        seen = set(ids)
+        for distance, doc_id in zip(
+            extra_distances[row].tolist(), extra_indices[row].tolist(), strict=True
+        ):
+            if doc_id >= 0 and doc_id not in seen:
+                seen.add(doc_id)
+                ids.append(doc_id)
+                row_distances.append(distance)
+        merged_indices[row, : len(ids)] = ids
+        merged_distances[row, : len(ids)] = row_distances
+    return merged_distances, merged_indices
+
+
+def geo_rerank(
+    geo_index: GeoIndex,
+    distances: np.ndarray,
+    indices: np.ndarray,
+    origin: tuple[float, float],
+    top_k: int = 3,
+) -> tuple[np.ndarray, np.ndarray]:
+    """검색 후보를 origin과의 거리순 순위와 RRF로 합쳐 상위 top_k 반환
+
+    후보 전체의 haversine 거리를 한 번에 계산하며, 좌표가 없는 문서는
+    거리 순위에서 빠져 검색 순위만으로 점수를 받습니다.
+
+    Args:
+        geo_index: 같은 문서 순서로 만든 공간 인덱스
+        distances: (N, C) shape의 후보 거리 (검색 순위 순)
+        indices: (N, C) shape의 후보 인덱스 (-1은 빈 자리)
+        origin: (위도, 경도)
+        top_k: 쿼리별 반환할 문서 수
+
+    Returns:
+        (distances, indices): (N, top_k) shape, 원래 검색 거리를 유지
+    """
+    km = geo_index.distances_km(indices.ravel(), origin).reshape(indices.shape)
+
+    reranked_distances = np.full((len(indices), top_k), np.nan, dtype=np.float32)
+    reranked_indices = np.full((len(indices), top_k), -1, dtype=np.int64)
+    for row in range(len(indices)):
+        located = np.flatnonzero(np.isfinite(km[row]))
+        by_distance = indices[row, located[np.argsort(km[row, located], kind="stable")]]
+        ids = reciprocal_rank_fusion(
+            [indices[row], by_distance], top_k, k=config.RRF_K
+        ).tolist()
+        search_distance = dict(
+            zip(indices[row].tolist(), distances[row].tolist(), strict=True)
+        )
+        reranked_indices[row, : len(ids)] = ids
+        reranked_distances[row, : len(ids)] = [search_distance[i] for i in ids]
+    return reranked_distances, reranked_indices
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def mmr_select(
+    relevance: np.ndarray, similarity: np.ndarray, k: int, lambda_: float
+) -> np.ndarray:
+    """maximal marginal relevance로 k개 후보 위치를 고른 순서대로 반환
+
+    매 단계 lambda·관련도 - (1-lambda)·(이미 고른 후보와의 최대 유사도)가 가장 큰
+    후보를 고르며, 최대 유사도는 고른 후보의 유사도 행과 누적 maximum으로 갱신합니다.
+
+    Args:
+        relevance: (C,) 쿼리-후보 유사도
+        similarity: (C, C) 후보-후보 유사도
+        k: 고를 후보 수
+        lambda_: 관련도 가중치 (0~1)
+    """
+    k = min(k, len(relevance))
+    if k == 0:
+        return np.array([], dtype=np.int64)
+    first = int(np.argmax(relevance))
+    selected = [first]
+    redundancy = similarity[first].copy()
+    available = np.ones(len(relevance), dtype=bool)
+    available[first] = False
+    while len(selected) < k:
+        scores = lambda_ * relevance - (1 - lambda_) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+    return np.array(selected, dtype=np.int64)
+
+
+def mmr_rerank(
+    index: faiss.Index,
+    query_vectors: np.ndarray,
+    distances: np.ndarray,
+    indices: np.ndarray,
+    top_k: int = 3,
+    lambda_: float | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """검색 후보를 MMR로 다시 골라 서로 다른 문서 top_k 반환
+
+    후보 벡터는 인덱스에서 복원하고(enable_reconstruct 참고), 쿼리-후보/후보-후보
+    코사인 유사도를 행렬 곱 한 번씩으로 계산합니다.
+
+    Args:
+        index: 후보를 검색한 FAISS 인덱스
+        query_vectors: (D,) 또는 (N, D) shape의 쿼리 벡터
+        distances: (N, C) shape의 후보 거리 (검색 순위 순)
+        indices: (N, C) shape의 후보 인덱스 (-1은 빈 자리)
+        top_k: 쿼리별 반환할 문서 수
+        lambda_: 관련도 가중치 (1이면 쿼리 유사도 순, 0이면 다양성만,
+            None이면 config.MMR_LAMBDA)
+
+    Returns:
+        (distances, indices): (N, top_k) shape, 원래 검색 거리를 유지
+    """
+    if lambda_ is None:
+        lambda_ = config.MMR_LAMBDA
+    queries = _unit_rows(np.atleast_2d(query_vectors).astype(np.float32))
+
+    reranked_distances = np.full((len(indices), top_k), np.nan, dtype=np.float32)
+    reranked_indices = np.full((len(indices), top_k), -1, dtype=np.int64)
+    for row in range(len(indices)):
+        candidates = np.flatnonzero(indices[row] >= 0)
+        if not len(candidates):
+            continue
+        ids = indices[row, candidates].astype(np.int64)
+        vectors = _unit_rows(index.reconstruct_batch(ids))
+        chosen = candidates[
+            mmr_select(vectors @ queries[row], vectors @ vectors.T, top_k, lambda_)
+        ]
+        reranked_indices[row, : len(chosen)] = indices[row, chosen]
+        reranked_distances[row, : len(chosen)] = distances[row, chosen]
+    return reranked_distances, reranked_indices
+
+
+def lexical_search(
+    lexical_index: LexicalIndex,
+    query: str,
+    top_k: int = 3,
+    region: Region | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """어휘 검색만으로 (1, top_k) shape의 결과 반환 (거리는 NaN)"""
+    allowed_ids = region.ids if region is not None else None
+    _, ids = lexical_index.search(query, top_k, allowed_ids)
+    indices = np.full((1, top_k), -1, dtype=np.int64)
+    indices[0, : len(ids)] = ids
+    return np.full((1, top_k), np.nan, dtype=np.float32), indices
+
+
 def format_results(
-    distances: np.ndarray, indices: np.ndarray, items: list[dict[str, Any]]
+    distances: np.ndarray, indices: np.ndarray, items: Sequence[dict[str, Any]]
 ) -> list[dict[str, Any]]:
     """검색 결과를 메타데이터와 매칭하여 포매팅
 
@@ -155,22 +566,52 @@ def format_results(
     Returns:
         검색 결과 리스트. 각 결과는 distance, title, introduction, alltag, address 포함
     """
-    results = []
-
     # 배치 차원 제거 (1, k) -> (k,)
-    distances = distances[0]
-    indices = indices[0]
+    return _format_row(distances[0], indices[0], items)
+
+
+def format_batch_results(
+    distances: np.ndarray, indices: np.ndarray, items: Sequence[dict[str, Any]]
+) -> list[list[dict[str, Any]]]:
+    """배치 검색 결과를 쿼리별 결과 리스트로 포매팅
+
+    Args:
+        distances: (N, k) shape의 거리 배열
+        indices: (N, k) shape의 인덱스 배열
+        items: 메타데이터 items 리스트
+
+    Returns:
+        쿼리 순서대로의 검색 결과 리스트의 리스트
+    """
+    return [
+        _format_row(row_distances, row_indices, items)
+        for row_distances, row_indices in zip(distances, indices, strict=True)
+    ]
+
+
+def _format_row(
+    distances: np.ndarray, indices: np.ndarray, items: Sequence[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """(k,) shape의 거리/인덱스 한 행을 결과 dict 리스트로 변환"""
+    results = []
 
     for distance, idx in zip(distances, indices, strict=False):
-        item = items[int(idx)]
+        # 결과가 top_k보다 적으면 FAISS는 -1을 채워 반환
+        if idx < 0:
+            continue
+
+        # 필요한 필드 추출 (컬럼형 저장소는 해당 행의 문자열만 디코딩)
+        if isinstance(items, MetadataStore):
+            title, introduction, alltag, address = items.row(int(idx))
+        else:
+            title, introduction, alltag, address = extract_fields(items[int(idx)])
 
-        # 필요한 필드 추출
         result = {
             "distance": float(distance),
-            "title": item.get("title", ""),
-            "introduction": item.get("introduction", ""),
-            "alltag": item.get("alltag") or item.get("tag", ""),
-            "address": item.get("roadaddress") or item.get("address", ""),
+            "title": title,
+            "introduction": introduction,
+            "alltag": alltag,
+            "address": address,
         }
 
         results.append(result)
@@ -178,6 +619,43 @@ def format_results(
     return results
 
 
+class _StageClock:
+    """timings가 주어지면 직전 mark 이후 경과 시간(ms)을 단계 이름으로 기록"""
+
+    def __init__(self, timings: dict[str, float] | None):
+        self.timings = timings
+        self.last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        if self.timings is None:
+            return
+        now = time.perf_counter()
+        self.timings[stage] = (now - self.last) * 1000
+        self.last = now
+
+
+def _log_results(results: list[dict[str, Any]], start_time: float) -> None:
+    """검색 완료 통계와 상위 결과를 로깅"""
+    # 로깅: 검색 완료 및 통계
+    elapsed = time.time() - start_time
+    # 어휘 검색으로만 찾은 문서는 거리가 NaN
+    distances_list = [
+        r["distance"] for r in results if math.isfinite(r["distance"])
+    ] or [0.0]
+    logger.info(
+        f"검색 완료 - 소요시간: {elapsed:.3f}s, "
+        f"결과수: {len(results)}, "
+        f"거리범위: [{min(distances_list):.3f}, {max(distances_list):.3f}]"
+    )
+
+    # 로깅: 상위 결과 (DEBUG 레벨)
+    for i, result in enumerate(results[:3]):
+        logger.debug(
+            f"  [{i + 1}] distance={result['distance']:.3f}, "
+            f"title='{result['title'][:50]}'"
+        )
+
+
 def retrieve(
     query: str,
     top_k: int = 3,
@@ -222,21 +700,7 @@ def retrieve(
     # 5. 검색 결과 포매팅
     results = format_results(distances, indices, metadata["items"])
 
-    # 로깅: 검색 완료 및 통계
-    elapsed = time.time() - start_time
-    distances_list = [r["distance"] for r in results]
-    logger.info(
-        f"검색 완료 - 소요시간: {elapsed:.3f}s, "
-        f"결과수: {len(results)}, "
-        f"거리범위: [{min(distances_list):.3f}, {max(distances_list):.3f}]"
-    )
-
-    # 로깅: 상위 결과 (DEBUG 레벨)
-    for i, result in enumerate(results[:3]):
-        logger.debug(
-            f"  [{i+1}] distance={result['distance']:.3f}, "
-            f"title='{result['title'][:50]}'"
-        )
+    _log_results(results, start_time)
 
     return results
 
@@ -248,61 +712,374 @@ class RAGRetriever:
     텍스트 쿼리로 유사한 문서를 검색하는 기능을 제공합니다.
     """
 
-    def __init__(self, index_path: str, metadata_path: str):
+    def __init__(
+        self,
+        index_path: str | Path | None = None,
+        metadata_path: str | Path | None = None,
+    ):
         """RAGRetriever 초기화
 
         Args:
-            index_path: FAISS 인덱스 파일 경로
-            metadata_path: 메타데이터 JSON 파일 경로
+            index_path: FAISS 인덱스 파일 경로 (default: config.INDEX_PATH)
+            metadata_path: 메타데이터 JSON 파일 경로 (default: config.METADATA_PATH)
+                같은 이름의 .bin 저장소가 있으면 memory-map 하여 사용
         """
+        start_time = time.perf_counter()
+
+        if index_path is None:
+            index_path = config.INDEX_PATH
+        if metadata_path is None:
+            metadata_path = config.METADATA_PATH
+
         _warmup_cache_if_needed()
 
-        # FAISS 인덱스 로드
-        self.index = faiss.read_index(index_path)
+        # FAISS 인덱스 로드 (읽기 전용 memory-map, 워커 간 페이지 캐시 공유)
+        self.index = read_index(index_path, mmap=config.INDEX_MMAP)
+
+        # 메타데이터 로드 (.bin 저장소가 있으면 memory-map, 없으면 JSON)
+        self.items, self.embedding_model, index_info = load_metadata(metadata_path)
+        backend = get_embedding_backend()
+        if self.embedding_model != backend.model:
+            raise ValueError(
+                f"인덱스 임베딩 모델({self.embedding_model})과 쿼리 임베딩 백엔드"
+                f"({backend.model})가 다릅니다 - "
+                "EMBEDDING_BACKEND/EMBEDDING_DIMENSIONS를 확인하세요"
+            )
+        # 임베딩 차원 (메타데이터에 기록된 차원이 없는 이전 아티팩트는 검색 시에만 검증)
+        self.dimension = self.index.d
+        recorded = index_info.get("dimension")
+        if recorded is not None and recorded != self.dimension:
+            raise ValueError(
+                f"메타데이터 차원({recorded})과 인덱스 차원({self.dimension})이 "
+                "다릅니다 - 같은 빌드의 아티팩트인지 확인하세요"
+            )
+        if recorded is not None and backend.dimension != recorded:
+            raise ValueError(
+                f"인덱스 임베딩 차원({recorded})과 쿼리 임베딩 차원"
+                f"({backend.dimension})이 다릅니다 - EMBEDDING_DIMENSIONS를 확인하세요"
+            )
+
+        # 아티팩트 버전 (인덱스 파일이 다시 빌드되면 바뀜, 결과 캐시 키에 사용)
+        self.index_version = index_version(index_path)
+
+        # 어휘(BM25) 인덱스 (없으면 벡터 검색만 사용)
+        lexical_path = lexical_path_for(index_path)
+        self.lexical_index = (
+            LexicalIndex.load(lexical_path) if lexical_path.exists() else None
+        )
+        self.lexical_fallbacks = 0  # 임베딩 지연/실패로 어휘 검색만 사용한 횟수
+
+        # 지역 → 문서 id 인덱스 (없으면 location 필터 없이 전체 검색)
+        region_path = region_path_for(index_path)
+        self.region_index = (
+            RegionIndex.load(region_path, min_items=config.REGION_FILTER_MIN_ITEMS)
+            if region_path.exists()
+            else None
+        )
+
+        # 문서 좌표 공간 인덱스 (없으면 거리 기반 재순위 없음)
+        geo_path = geo_path_for(index_path)
+        self.geo_index = GeoIndex.load(geo_path) if geo_path.exists() else None
 
-        # 메타데이터 로드
-        with open(metadata_path, encoding="utf-8") as f:
-            metadata = json.load(f)
+        # 체험 유형과 패턴 조합별 사전 계산 결과 (같은 빌드의 인덱스일 때만 사용)
+        self.precomputed_contexts = self._load_precomputed_contexts(
+            contexts_path_for(index_path)
+        )
+
+        # 인덱스 타입/검색 파라미터 적용 (MMR 재순위용 벡터 복원 준비 포함)
+        self.index_type = index_info["type"]
+        configure_index(self.index, index_info["params"])
+        enable_reconstruct(self.index)
+
+        # 로딩 소요시간 (ms)
+        self.load_time_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            f"인덱스 로드 완료 - 타입: {self.index_type}, 차원: {self.dimension}, "
+            f"하이브리드: {self.lexical_index is not None}, "
+            f"지역필터: {self.region_index is not None}, "
+            f"거리재순위: {self.geo_index is not None}, "
+            f"사전계산: {len(self.precomputed_contexts or ())}, "
+            f"소요시간: {self.load_time_ms:.1f}ms, "
+            f"벡터수: {self.index.ntotal}, 문서수: {len(self.items)}"
+        )
+
+    def _load_precomputed_contexts(self, path: Path) -> PrecomputedContexts | None:
+        if not path.exists():
+            return None
+        contexts = PrecomputedContexts.load(path)
+        if contexts.index_version != self.index_version:
+            logger.warning(
+                f"사전 계산 컨텍스트가 현재 인덱스와 다른 빌드입니다 - 사용하지 않습니다: {path}"
+            )
+            return None
+        return contexts
 
-        self.items = metadata["items"]
-        self.embedding_model = metadata["embedding_model"]
+    def resolve_region(self, location: str | None) -> Region | None:
+        """요청 location을 검색 대상 지역으로 해석 (지역 인덱스가 없으면 None)"""
+        if self.region_index is None:
+            return None
+        return self.region_index.resolve(location)
 
-    def retrieve(self, query: str, top_k: int = 3) -> list[dict[str, Any]]:
+    def geocode(self, location: str | None) -> tuple[float, float] | None:
+        """요청 location을 재순위 기준 좌표로 변환 (재순위를 쓰지 않으면 None)"""
+        if self.geo_index is None or not config.GEO_RERANK:
+            return None
+        return self.geo_index.geocode(location)
+
+    def location_key(self, location: str | None) -> tuple[Any, ...] | None:
+        """검색 결과에 영향을 주는 location 해석 결과 (캐시 키용)
+
+        같은 지역/좌표로 해석되는 location끼리는 같은 키를 가집니다.
+        """
+        region = self.resolve_region(location)
+        origin = self.geocode(location)
+        if region is None and origin is None:
+            return None
+        return (region and (region.level, region.label), origin)
+
+    def _search(
+        self,
+        query_vectors: np.ndarray,
+        queries: list[str],
+        top_k: int,
+        region: Region | None = None,
+        origin: tuple[float, float] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """어휘 인덱스가 있으면 하이브리드(RRF), 없으면 벡터 검색
+
+        origin이 있으면 후보를 넉넉히 가져오고 반경 GEO_RADIUS_KM 안 문서 중
+        쿼리와 가까운 문서를 후보에 더한 뒤 거리순 순위와 합쳐 재순위하고,
+        MMR_RERANK이면 (거리 재순위 후) MMR_CANDIDATES개 후보에서 서로 다른
+        문서 top_k를 다시 고릅니다.
+        """
+        if query_vectors.shape[-1] != self.dimension:
+            raise ValueError(
+                f"쿼리 벡터 차원({query_vectors.shape[-1]})이 인덱스 차원"
+                f"({self.dimension})과 다릅니다"
+            )
+        pool_k = max(top_k, config.MMR_CANDIDATES) if config.MMR_RERANK else top_k
+        fetch_k = pool_k if origin is None else max(pool_k, config.GEO_CANDIDATES)
+        if self.lexical_index is None:
+            distances, indices = search(self.index, query_vectors, fetch_k, region)
+        else:
+            distances, indices = hybrid_search(
+                self.index, self.lexical_index, query_vectors, queries, fetch_k, region
+            )
+        if origin is not None:
+            if config.GEO_RADIUS_KM > 0:
+                distances, indices = append_candidates(
+                    distances,
+                    indices,
+                    *nearby_search(
+                        self.index,
+                        self.geo_index,
+                        query_vectors,
+                        origin,
+                        config.GEO_RADIUS_KM,
+                        config.GEO_CANDIDATES,
+                        region,
+                    ),
+                )
+            distances, indices = geo_rerank(
+                self.geo_index, distances, indices, origin, pool_k
+            )
+        if config.MMR_RERANK:
+            distances, indices = mmr_rerank(
+                self.index, query_vectors, distances, indices, top_k
+            )
+        return distances, indices
+
+    def _lexical_fallback(
+        self,
+        queries: list[str],
+        top_k: int,
+        reason: str,
+        region: Region | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """임베딩을 쓸 수 없을 때 어휘 검색만으로 결과 생성"""
+        self.lexical_fallbacks += len(queries)
+        logger.warning(f"쿼리 임베딩 {reason} - 어휘 검색만 사용합니다")
+        rows = [
+            lexical_search(self.lexical_index, query, top_k, region)
+            for query in queries
+        ]
+        return np.vstack([d for d, _ in rows]), np.vstack([i for _, i in rows])
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = 3,
+        location: str | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> list[dict[str, Any]]:
         """텍스트 쿼리로 유사한 문서 검색
 
+        어휘 인덱스가 있으면 벡터/어휘 검색 결과를 RRF로 합치고,
+        임베딩에 실패하면 어휘 검색 결과만 반환합니다.
+
         Args:
             query: 검색할 텍스트 쿼리
             top_k: 반환할 상위 문서 개수 (default: 3)
+            location: 만나는 장소. 지역으로 해석되면 그 지역 문서만 검색하고,
+                좌표화되면 가까운 문서를 앞으로 재순위
+            timings: 주어지면 단계별 소요시간(ms)을 기록
+                (resolve, embed, search, format; 어휘 검색 폴백은 search)
 
         Returns:
             검색 결과 리스트. 각 결과는 distance, title, introduction, alltag, address 포함
         """
         start_time = time.time()
-        logger.info(f"검색 시작 - 쿼리: '{query}', top_k: {top_k}")
+        clock = _StageClock(timings)
+        region = self.resolve_region(location)
+        origin = self.geocode(location)
+        logger.info(
+            f"검색 시작 - 쿼리: '{query}', top_k: {top_k}, "
+            f"지역: {region}, 기준좌표: {origin}"
+        )
+        clock.mark("resolve")
 
         # 1. 쿼리를 임베딩으로 변환
-        query_vector = embed_query(query)
+        try:
+            query_vector = embed_query(query)
+        except Exception:
+            if self.lexical_index is None:
+                raise
+            query_vector = None
+        clock.mark("embed")
 
         # 2. 유사 문서 검색
-        distances, indices = search(self.index, query_vector, top_k)
+        if query_vector is None:
+            distances, indices = self._lexical_fallback([query], top_k, "실패", region)
+        else:
+            distances, indices = self._search(
+                query_vector, [query], top_k, region, origin
+            )
+        clock.mark("search")
 
         # 3. 검색 결과 포매팅
         results = format_results(distances, indices, self.items)
+        clock.mark("format")
+
+        _log_results(results, start_time)
+
+        return results
+
+    def retrieve_many(
+        self, queries: list[str], top_k: int = 3
+    ) -> list[list[dict[str, Any]]]:
+        """여러 쿼리를 한 번에 검색
+
+        캐시 미스 쿼리는 한 번의 임베딩 API 호출로, 검색은 (N, D) 행렬에 대한
+        한 번의 index.search로 처리합니다.
+
+        Args:
+            queries: 검색할 텍스트 쿼리 리스트
+            top_k: 쿼리별 반환할 상위 문서 개수 (default: 3)
+
+        Returns:
+            queries 순서대로의 검색 결과 리스트의 리스트
+        """
+        if not queries:
+            return []
+
+        start_time = time.time()
+        logger.info(f"배치 검색 시작 - 쿼리수: {len(queries)}, top_k: {top_k}")
+
+        # 1. 쿼리들을 임베딩 행렬로 변환
+        try:
+            query_vectors = embed_queries(queries)
+        except Exception:
+            if self.lexical_index is None:
+                raise
+            query_vectors = None
+
+        # 2. 유사 문서 일괄 검색
+        if query_vectors is None:
+            distances, indices = self._lexical_fallback(queries, top_k, "실패")
+        else:
+            distances, indices = self._search(query_vectors, queries, top_k)
+
+        # 3. 쿼리별 결과 포매팅
+        results = format_batch_results(distances, indices, self.items)
 
-        # 로깅: 검색 완료 및 통계
         elapsed = time.time() - start_time
-        distances_list = [r["distance"] for r in results]
         logger.info(
-            f"검색 완료 - 소요시간: {elapsed:.3f}s, "
-            f"결과수: {len(results)}, "
-            f"거리범위: [{min(distances_list):.3f}, {max(distances_list):.3f}]"
+            f"배치 검색 완료 - 소요시간: {elapsed:.3f}s, 쿼리수: {len(queries)}"
         )
 
-        # 로깅: 상위 결과 (DEBUG 레벨)
-        for i, result in enumerate(results[:3]):
-            logger.debug(
-                f"  [{i+1}] distance={result['distance']:.3f}, "
-                f"title='{result['title'][:50]}'"
+        return results
+
+    async def aretrieve(
+        self,
+        query: str,
+        top_k: int = 3,
+        location: str | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> list[dict[str, Any]]:
+        """retrieve의 비동기 버전
+
+        임베딩은 백엔드의 비동기 API로, FAISS 검색은 전용 스레드 풀에서 수행하여
+        이벤트 루프를 블로킹하지 않습니다. 어휘 인덱스가 있으면 임베딩이
+        EMBEDDING_TIMEOUT_MS를 넘거나 실패할 때 어휘 검색 결과만 반환합니다.
+
+        Args:
+            query: 검색할 텍스트 쿼리
+            top_k: 반환할 상위 문서 개수 (default: 3)
+            location: 만나는 장소. 지역으로 해석되면 그 지역 문서만 검색하고,
+                좌표화되면 가까운 문서를 앞으로 재순위
+            timings: 주어지면 단계별 소요시간(ms)을 기록 (retrieve와 같음;
+                임베딩 시간 초과/실패 시 embed는 포기까지 걸린 시간)
+
+        Returns:
+            검색 결과 리스트. 각 결과는 distance, title, introduction, alltag, address 포함
+        """
+        start_time = time.time()
+        clock = _StageClock(timings)
+        region = self.resolve_region(location)
+        origin = self.geocode(location)
+        logger.info(
+            f"검색 시작 - 쿼리: '{query}', top_k: {top_k}, "
+            f"지역: {region}, 기준좌표: {origin}"
+        )
+        clock.mark("resolve")
+
+        # 1. 쿼리를 임베딩으로 변환 (비동기, 어휘 인덱스가 있으면 지연 예산 적용)
+        query_vector = None
+        if self.lexical_index is None:
+            query_vector = await aembed_query(query)
+        else:
+            try:
+                query_vector = await asyncio.wait_for(
+                    aembed_query(query), timeout=config.EMBEDDING_TIMEOUT_MS / 1000
+                )
+            except TimeoutError:
+                fallback_reason = "시간 초과"
+            except Exception:
+                fallback_reason = "실패"
+        clock.mark("embed")
+
+        # 2. 벡터(+ 어휘) 검색 / 거리 재순위 (스레드 풀)
+        if query_vector is None:
+            distances, indices = self._lexical_fallback(
+                [query], top_k, fallback_reason, region
+            )
+        else:
+            loop = asyncio.get_running_loop()
+            distances, indices = await loop.run_in_executor(
+                _search_executor,
+                self._search,
+                query_vector,
+                [query],
+                top_k,
+                region,
+                origin,
             )
+        clock.mark("search")
+
+        # 3. 검색 결과 포매팅
+        results = format_results(distances, indices, self.items)
+        clock.mark("format")
+
+        _log_results(results, start_time)
 
         return results
@@ -0,0 +1,219 @@
+"""지역(region1cd/region2cd) 필터 검색
+
+build_index에서 지역별 문서 id 목록과 주소 지명 사전을 만들어 인덱스 옆에
+``<인덱스 이름>_regions.json``으로 저장합니다. 런타임은 요청의 만나는 장소
+(location)를 지역으로 해석하고, FAISS ID selector로 해당 지역 벡터만
+검색합니다.
+
+지역 해석 순서:
+1. region2 라벨(구좌, 애월, 중문 …)이 location에 포함되면 해당 지역
+2. location의 지명(세화리, 하효동 …)이 데이터셋 주소 사전에 있으면 그 지역
+3. region1 라벨(제주시, 서귀포시)이 포함되면 해당 시 전체
+"""
+
+import json
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import faiss
+import numpy as np
+
+# region2 라벨 별칭 (데이터의 오기 포함)
+REGION_ALIASES = {"추차도": ("추자",)}
+
+# 주소에서 지명으로 쓰는 토큰 (읍/면/동/리 및 도로명)
+_PLACE_TOKEN = re.compile(r"^\w+(?:읍|면|동|리|로|길)$")
+_TOKEN_SEPARATORS = re.compile(r"[\s,()]+")
+
+
+def region_path_for(index_path: str | Path) -> Path:
+    """FAISS 인덱스 경로에 대응하는 지역 인덱스 경로"""
+    index_path = Path(index_path)
+    return index_path.with_name(f"{index_path.stem}_regions.json")
+
+
+def region_label(code: Any) -> str | None:
+    """region1cd/region2cd의 라벨 (누락/잘못된 값은 None)"""
+    label = code.get("label") if isinstance(code, dict) else code
+    if not label or label.startswith("region"):
+        return None
+    return label
+
+
+def normalize_location(text: str) -> str:
+    """NFKC 정규화 + 공백 정리"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def location_tokens(text: str) -> list[str]:
+    """정규화 후 공백/쉼표/괄호로 나눈 토큰"""
+    return [
+        token for token in _TOKEN_SEPARATORS.split(normalize_location(text)) if token
+    ]
+
+
+def place_tokens(text: str) -> list[str]:
+    """주소/장소 문자열에서 지명 토큰(…읍/면/동/리/로/길) 추출"""
+    return [token for token in location_tokens(text) if _PLACE_TOKEN.match(token)]
+
+
+def build_region_index(items: list[dict[str, Any]]) -> dict[str, Any]:
+    """items로 지역별 문서 id 목록과 주소 지명 → region2 사전 생성"""
+    regions: dict[str, dict[str, list[int]]] = {"region1": {}, "region2": {}}
+    place_counts: dict[str, Counter[str]] = {}
+    parent_counts: dict[str, Counter[str]] = {}
+    for doc_id, item in enumerate(items):
+        for level in ("region1", "region2"):
+            label = region_label(item.get(f"{level}cd"))
+            if label:
+                regions[level].setdefault(label, []).append(doc_id)
+
+        region2 = region_label(item.get("region2cd"))
+        if region2 is None:
+            continue
+        region1 = region_label(item.get("region1cd"))
+        if region1 is not None:
+            parent_counts.setdefault(region2, Counter())[region1] += 1
+        for field in ("address", "roadaddress"):
+            for token in place_tokens(item.get(field) or ""):
+                place_counts.setdefault(token, Counter())[region2] += 1
+
+    # 지명/지역이 여러 상위 지역에 걸치면 가장 많은 쪽으로 매핑
+    places = {
+        token: counts.most_common(1)[0][0] for token, counts in place_counts.items()
+    }
+    parents = {
+        label: counts.most_common(1)[0][0] for label, counts in parent_counts.items()
+    }
+    return {**regions, "places": places, "parents": parents}
+
+
+def save_region_index(path: str | Path, data: dict[str, Any]) -> None:
+    """build_region_index 결과를 JSON으로 저장"""
+    Path(path).write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+class Region:
+    """해석된 지역과 그 지역 문서 id 목록 / FAISS selector"""
+
+    def __init__(self, level: str, label: str, ids: np.ndarray):
+        self.level = level
+        self.label = label
+        self.ids = ids
+        # SearchParameters는 selector를 참조만 하므로 Region이 수명을 유지
+        self.selector = faiss.IDSelectorBatch(ids)
+
+    def __repr__(self) -> str:
+        return f"Region({self.level}={self.label!r}, n={len(self.ids)})"
+
+
+class RegionIndex:
+    """지역 → 문서 id 목록 인덱스와 location 해석기"""
+
+    def __init__(self, data: dict[str, Any], min_items: int = 1):
+        """
+        Args:
+            data: build_region_index 결과
+            min_items: 필터를 적용할 지역의 최소 문서 수 (미만이면 상위 지역/전체)
+        """
+        self.places: dict[str, str] = data.get("places", {})
+        self.parents: dict[str, str] = data.get("parents", {})
+        self.min_items = min_items
+        self.regions = {
+            level: {
+                label: Region(level, label, np.asarray(ids, dtype=np.int64))
+                for label, ids in data.get(level, {}).items()
+            }
+            for level in ("region1", "region2")
+        }
+        # 긴 라벨 우선 (서귀포시내 > 서귀포시)
+        self._region2_labels = sorted(self.regions["region2"], key=len, reverse=True)
+        self._region1_labels = sorted(self.regions["region1"], key=len, reverse=True)
+
+    @classmethod
+    def load(cls, path: str | Path, min_items: int = 1) -> "RegionIndex":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(data, min_items=min_items)
+
+    def resolve(self, location: str | None) -> Region | None:
+        """location을 지역으로 해석 (해석 불가면 None)
+
+        찾은 region2의 문서 수가 min_items 미만이면 상위 region1으로 넓히고,
+        그래도 부족하면 None(전체 검색)을 반환합니다.
+        """
+        if not location:
+            return None
+        text = normalize_location(location)
+
+        label = self._match_region2(text)
+        if label is not None:
+            region = self.regions["region2"][label]
+            if self._usable(region):
+                return region
+            parent = self.regions["region1"].get(self.parents.get(label, ""))
+            return parent if parent is not None and self._usable(parent) else None
+
+        for label in self._region1_labels:
+            region = self.regions["region1"][label]
+            if label in text:
+                return region if self._usable(region) else None
+        return None
+
+    def _match_region2(self, text: str) -> str | None:
+        """region2 라벨/별칭 포함 여부, 다음으로 주소 지명 사전 순으로 매칭"""
+        for label in self._region2_labels:
+            names = (label, *REGION_ALIASES.get(label, ()))
+            if any(name in text for name in names):
+                return label
+        for token in location_tokens(text):
+            label = self.places.get(token)
+            if label in self.regions["region2"]:
+                return label
+        return None
+
+    def _usable(self, region: Region) -> bool:
+        return len(region.ids) >= self.min_items
+
+
+def search_parameters(
+    index: faiss.Index, region: Region
+) -> faiss.SearchParameters | None:
+    """인덱스 타입에 맞는 selector 검색 파라미터 (selector 미지원 인덱스는 None)
+
+    HNSW/IVF는 인덱스에 설정된 efSearch/nprobe를 그대로 유지합니다.
+    """
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(
+            sel=region.selector, efSearch=index.hnsw.efSearch
+        )
+    if isinstance(index, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(sel=region.selector, nprobe=index.nprobe)
+    if isinstance(index, faiss.IndexPQ):
+        return None
+    return faiss.SearchParameters(sel=region.selector)
+
+
+def filtered_search(
+    index: faiss.Index, query_vectors: np.ndarray, top_k: int, region: Region
+) -> tuple[np.ndarray, np.ndarray]:
+    """지역 문서만 대상으로 검색 ((N, D) 쿼리, FAISS search와 같은 반환 형식)
+
+    selector를 지원하지 않는 인덱스(PQ)는 넉넉히 검색한 뒤 지역 문서만 남깁니다.
+    """
+    params = search_parameters(index, region)
+    if params is not None:
+        return index.search(query_vectors, top_k, params=params)
+
+    fetch = min(index.ntotal, max(top_k * 20, 100))
+    distances, indices = index.search(query_vectors, fetch)
+    keep = np.isin(indices, region.ids)
+    out_distances = np.full((len(indices), top_k), np.inf, dtype=np.float32)
+    out_indices = np.full((len(indices), top_k), -1, dtype=np.int64)
+    for row in range(len(indices)):
+        found = np.flatnonzero(keep[row])[:top_k]
+        out_distances[row, : len(found)] = distances[row, found]
+        out_indices[row, : len(found)] = indices[row, found]
+    return out_distances, out_indices
@@ -0,0 +1,121 @@
+"""llm 테스트 공용 fixture
+
+OpenAI API 없이 동작하도록 가짜 임베딩 클라이언트와 소형 합성 인덱스를 제공합니다.
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import faiss
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+FAKE_DIMENSION = 8
+
+SYNTHETIC_ITEMS = [
+    {
+        "contentsid": f"CNTS_{i:015d}",
+        "title": title,
+        "introduction": f"{title} 소개",
+        "alltag": tag,
+        "roadaddress": address,
+    }
+    for i, (title, tag, address) in enumerate(
+        [
+            ("해녀 물질 체험", "해녀,바다", "제주시 구좌읍 해녀길 1"),
+            ("돌담 쌓기 교실", "돌담,현무암", "제주시 애월읍 돌담로 2"),
+            ("감귤 따기 농장", "감귤,수확", "서귀포시 남원읍 감귤로 3"),
+            ("제주 향토 요리", "요리,향토음식", "제주시 조천읍 맛길 4"),
+            ("목공 공방", "목공,공예", "서귀포시 안덕면 나무길 5"),
+            ("해녀 박물관", "해녀,문화", "제주시 구좌읍 해녀길 6"),
+        ]
+    )
+]
+
+
+def fake_embedding(text: str) -> list[float]:
+    """텍스트 해시로 결정되는 정규화된 가짜 임베딩"""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(FAKE_DIMENSION)
+    return (vector / np.linalg.norm(vector)).astype(np.float32).tolist()
+
+
+def _fake_response(inputs):
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    return SimpleNamespace(
+        data=[SimpleNamespace(embedding=fake_embedding(text)) for text in inputs]
+    )
+
+
+class FakeEmbeddings:
+    """OpenAI().embeddings 대체"""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def create(self, *, model, input, **kwargs):  # noqa: ARG002
+        self.calls.append([input] if isinstance(input, str) else list(input))
+        return _fake_response(input)
+
+
+class FakeAsyncEmbeddings(FakeEmbeddings):
+    """AsyncOpenAI().embeddings 대체"""
+
+    async def create(self, *, model, input, **kwargs):
+        return super().create(model=model, input=input, **kwargs)
+
+
+@pytest.fixture
+def fake_openai(monkeypatch, tmp_path):
+    """임베딩 클라이언트와 캐시 파일을 격리 (모델 기본 차원은 FAKE_DIMENSION)"""
+    from llm import config, embedding_backend, rag_retriever
+
+    sync_client = SimpleNamespace(embeddings=FakeEmbeddings())
+    async_client = SimpleNamespace(embeddings=FakeAsyncEmbeddings())
+
+    monkeypatch.setattr(rag_retriever, "client", sync_client)
+    monkeypatch.setattr(rag_retriever, "async_client", async_client)
+    monkeypatch.setattr(
+        rag_retriever, "EMBEDDING_CACHE_STORE_PATH", tmp_path / "embedding_cache"
+    )
+    monkeypatch.setattr(
+        rag_retriever, "EMBEDDING_CACHE_PATH", tmp_path / "embedding_cache.json"
+    )
+    monkeypatch.setitem(
+        embedding_backend.NATIVE_DIMENSIONS, config.EMBEDDING_MODEL, FAKE_DIMENSION
+    )
+    monkeypatch.setattr(rag_retriever, "_embedding_backend", None)
+    monkeypatch.setattr(rag_retriever, "_embedding_cache", None)
+    monkeypatch.setattr(rag_retriever, "_embedding_batcher", None)
+    monkeypatch.setattr(config, "PERFORMANCE_WARMUP_QUERIES", [])
+
+    return SimpleNamespace(sync=sync_client.embeddings, async_=async_client.embeddings)
+
+
+@pytest.fixture
+def synthetic_artifacts(tmp_path):
+    """SYNTHETIC_ITEMS로 만든 IndexFlatL2 + 메타데이터 파일 경로"""
+    vectors = np.array(
+        [fake_embedding(item["title"]) for item in SYNTHETIC_ITEMS], dtype=np.float32
+    )
+    index = faiss.IndexFlatL2(FAKE_DIMENSION)
+    index.add(vectors)
+
+    index_path = tmp_path / "synthetic.index"
+    metadata_path = tmp_path / "synthetic_metadata.json"
+    faiss.write_index(index, str(index_path))
+    metadata_path.write_text(
+        json.dumps(
+            {"embedding_model": "text-embedding-3-small", "items": SYNTHETIC_ITEMS},
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    return index_path, metadata_path
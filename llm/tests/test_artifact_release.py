@@ -0,0 +1,88 @@
+"""버전별 아티팩트 릴리스 테스트"""
+
+import os
+
+import pytest
+
+from llm.artifact_release import (
+    current_release,
+    current_version,
+    prune_releases,
+    publish_release,
+    verify_release,
+)
+from llm.index_factory import index_version
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    index_path = tmp_path / "build" / "test.index"
+    index_path.parent.mkdir()
+    index_path.write_bytes(b"index")
+    metadata_path = index_path.with_name("metadata.json")
+    metadata_path.write_text("{}", encoding="utf-8")
+    return index_path, metadata_path
+
+
+def test_publish_copies_artifacts_and_switches_current(tmp_path, artifacts):
+    releases = tmp_path / "releases"
+    lexical_path = artifacts[0].with_name("test_lexical.npz")
+    lexical_path.write_bytes(b"lexical")
+
+    release = publish_release(
+        releases,
+        *artifacts,
+        files=[lexical_path, artifacts[0].with_name("missing.json")],
+        info={"index_type": "flat"},
+    )
+
+    assert current_version(releases) == release.version
+    loaded = current_release(releases)
+    assert loaded.index_path.read_bytes() == b"index"
+    assert sorted(loaded.manifest["files"]) == [
+        "metadata.json",
+        "test.index",
+        "test_lexical.npz",
+    ]
+    assert loaded.manifest["index_type"] == "flat"
+    # mtime 유지 → 사전 계산 결과의 인덱스 버전 검증이 그대로 유효
+    assert index_version(loaded.index_path) == index_version(artifacts[0])
+    verify_release(loaded)
+
+
+def test_verify_detects_modified_file(tmp_path, artifacts):
+    release = publish_release(tmp_path / "releases", *artifacts)
+    release.metadata_path.write_text("{ }", encoding="utf-8")
+
+    with pytest.raises(ValueError, match=r"metadata\.json"):
+        verify_release(release)
+
+
+def test_no_release(tmp_path):
+    assert current_release(tmp_path) is None
+
+
+def test_prune_keeps_recent_and_current(tmp_path):
+    for version in ("v1", "v2", "v3", "v4"):
+        (tmp_path / version).mkdir()
+    (tmp_path / "CURRENT").write_text("v1\n", encoding="utf-8")
+
+    assert prune_releases(tmp_path, keep=2) == ["v2"]
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == [
+        "v1",
+        "v3",
+        "v4",
+    ]
+
+
+def test_republish_writes_new_version(tmp_path, artifacts):
+    releases = tmp_path / "releases"
+    first = publish_release(releases, *artifacts)
+    artifacts[0].write_bytes(b"index v2")
+    os.utime(artifacts[0])
+
+    second = publish_release(releases, *artifacts)
+
+    assert second.version != first.version
+    assert current_release(releases).index_path.read_bytes() == b"index v2"
+    assert first.directory.exists()  # 이전 요청이 쓰던 릴리스는 그대로
@@ -0,0 +1,56 @@
+"""비동기 검색 경로 테스트"""
+
+import asyncio
+
+import pytest
+
+from llm.tests.conftest import SYNTHETIC_ITEMS
+
+
+class TestAsyncRetrieval:
+    """RAGRetriever.aretrieve 테스트"""
+
+    @pytest.mark.anyio
+    @pytest.mark.usefixtures("fake_openai")
+    async def test_aretrieve_matches_retrieve(self, synthetic_artifacts):
+        """aretrieve와 retrieve는 같은 결과를 반환해야 함"""
+        from llm.rag_retriever import RAGRetriever
+
+        retriever = RAGRetriever(*synthetic_artifacts)
+
+        async_results = await retriever.aretrieve("해녀 물질 체험", top_k=3)
+        sync_results = retriever.retrieve("해녀 물질 체험", top_k=3)
+
+        assert async_results == sync_results
+        assert async_results[0]["title"] == "해녀 물질 체험"
+        assert async_results[0]["distance"] == pytest.approx(0.0, abs=1e-5)
+
+    @pytest.mark.anyio
+    async def test_aretrieve_uses_async_client_and_cache(
+        self, fake_openai, synthetic_artifacts
+    ):
+        """캐시 미스만 AsyncOpenAI로 임베딩하고 동기 클라이언트는 쓰지 않아야 함"""
+        from llm.rag_retriever import RAGRetriever
+
+        retriever = RAGRetriever(*synthetic_artifacts)
+
+        await retriever.aretrieve("감귤 따기 농장", top_k=2)
+        await retriever.aretrieve("감귤 따기 농장", top_k=2)
+
+        assert fake_openai.async_.calls == [["감귤 따기 농장"]]
+        assert fake_openai.sync.calls == []
+
+    @pytest.mark.anyio
+    @pytest.mark.usefixtures("fake_openai")
+    async def test_aretrieve_runs_concurrently(self, synthetic_artifacts):
+        """동시 요청이 모두 처리되어야 함"""
+        from llm.rag_retriever import RAGRetriever
+
+        retriever = RAGRetriever(*synthetic_artifacts)
+        titles = [item["title"] for item in SYNTHETIC_ITEMS]
+
+        results = await asyncio.gather(
+            *(retriever.aretrieve(title, top_k=1) for title in titles)
+        )
+
+        assert [r[0]["title"] for r in results] == titles
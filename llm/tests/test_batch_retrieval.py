@@ -0,0 +1,54 @@
+"""배치 검색 테스트"""
+
+import numpy as np
+
+from llm.tests.conftest import SYNTHETIC_ITEMS
+
+
+class TestBatchRetrieval:
+    """RAGRetriever.retrieve_many 테스트"""
+
+    def test_retrieve_many_matches_single_queries(
+        self, fake_openai, synthetic_artifacts
+    ):
+        """retrieve_many 결과는 쿼리별 retrieve 결과와 같아야 함"""
+        from llm.rag_retriever import RAGRetriever
+
+        retriever = RAGRetriever(*synthetic_artifacts)
+        queries = [item["title"] for item in SYNTHETIC_ITEMS[:4]]
+
+        batch_results = retriever.retrieve_many(queries, top_k=2)
+
+        assert len(batch_results) == len(queries)
+        for query, results in zip(queries, batch_results, strict=True):
+            assert results == retriever.retrieve(query, top_k=2)
+            assert results[0]["title"] == query
+        assert fake_openai.sync.calls[0] == queries
+
+    def test_retrieve_many_embeds_only_unique_misses_once(
+        self, fake_openai, synthetic_artifacts
+    ):
+        """캐시 미스 쿼리들은 중복 없이 한 번의 임베딩 호출로 처리되어야 함"""
+        from llm.rag_retriever import RAGRetriever, embed_query
+
+        retriever = RAGRetriever(*synthetic_artifacts)
+        embed_query("해녀 물질 체험")  # 캐시에 미리 저장
+        fake_openai.sync.calls.clear()
+
+        retriever.retrieve_many(
+            ["해녀 물질 체험", "목공 공방", "감귤 따기 농장", "목공 공방"], top_k=1
+        )
+
+        assert fake_openai.sync.calls == [["목공 공방", "감귤 따기 농장"]]
+
+    def test_format_batch_results_skips_missing_neighbors(self):
+        """FAISS가 -1로 채운 자리는 결과에서 제외되어야 함"""
+        from llm.rag_retriever import format_batch_results
+
+        distances = np.array([[0.1, 0.2], [0.3, np.inf]], dtype=np.float32)
+        indices = np.array([[0, 1], [2, -1]], dtype=np.int64)
+
+        results = format_batch_results(distances, indices, SYNTHETIC_ITEMS)
+
+        assert [len(r) for r in results] == [2, 1]
+        assert results[1][0]["title"] == SYNTHETIC_ITEMS[2]["title"]
@@ -0,0 +1,93 @@
+"""임베딩 백엔드 테스트"""
+
+import numpy as np
+import pytest
+
+from llm import config
+from llm.embedding_backend import (
+    HashedNgramEmbeddingBackend,
+    OpenAIEmbeddingBackend,
+    cache_path_for_model,
+    create_embedding_backend,
+)
+
+
+class TestHashedNgramEmbeddingBackend:
+    def test_deterministic_and_normalized(self):
+        backend = HashedNgramEmbeddingBackend()
+
+        vectors = backend.embed(["제주 해녀 체험", "제주 해녀 체험", ""])
+
+        assert vectors.shape == (3, config.EMBEDDING_DIMENSION)
+        assert vectors.dtype == np.float32
+        np.testing.assert_array_equal(vectors[0], vectors[1])
+        assert np.linalg.norm(vectors[0]) == pytest.approx(1.0, rel=1e-5)
+        assert not vectors[2].any()
+
+    def test_overlapping_text_is_closer(self):
+        backend = HashedNgramEmbeddingBackend(dimension=256)
+        query, near, far = backend.embed(
+            ["해녀 물질 체험", "해녀 체험 프로그램", "목공 공방 가구 만들기"]
+        )
+
+        assert query @ near > query @ far
+
+    def test_normalizes_width_and_case(self):
+        backend = HashedNgramEmbeddingBackend(dimension=64)
+
+        np.testing.assert_array_equal(
+            *backend.embed(["\uff21\uff22\uff23 체험", "abc  체험"])
+        )
+
+    @pytest.mark.anyio
+    async def test_aembed_matches_embed(self):
+        backend = HashedNgramEmbeddingBackend(dimension=32)
+
+        np.testing.assert_array_equal(
+            await backend.aembed(["감귤"]), backend.embed(["감귤"])
+        )
+
+
+def test_create_embedding_backend():
+    assert isinstance(create_embedding_backend("openai"), OpenAIEmbeddingBackend)
+    assert create_embedding_backend("hashed").model == (
+        f"hashed-char123-{config.EMBEDDING_DIMENSION}"
+    )
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        create_embedding_backend("unknown")
+
+
+def test_cache_path_is_namespaced_by_model(tmp_path):
+    path = tmp_path / "embedding_cache"
+
+    assert cache_path_for_model(path, config.EMBEDDING_MODEL) == path
+    assert cache_path_for_model(path, "hashed-char123-1536") == (
+        tmp_path / "embedding_cache.hashed-char123-1536"
+    )
+
+
+class TestRetrieverBackend:
+    @pytest.fixture
+    def hashed_backend(self, fake_openai):  # noqa: ARG002
+        from llm import rag_retriever
+
+        backend = HashedNgramEmbeddingBackend(dimension=8)
+        rag_retriever.set_embedding_backend(backend)
+        yield backend
+        rag_retriever.set_embedding_backend(None)
+
+    def test_index_model_must_match_backend(self, hashed_backend, synthetic_artifacts):
+        from llm.rag_retriever import RAGRetriever
+
+        with pytest.raises(ValueError, match=hashed_backend.model):
+            RAGRetriever(*synthetic_artifacts)
+
+    def test_queries_use_backend_without_client(self, hashed_backend, fake_openai):
+        from llm.rag_retriever import embed_queries, embed_query
+
+        vector = embed_query("해녀")
+        matrix = embed_queries(["해녀", "감귤"])
+
+        np.testing.assert_array_equal(vector, hashed_backend.embed(["해녀"])[0])
+        np.testing.assert_array_equal(matrix, hashed_backend.embed(["해녀", "감귤"]))
+        assert fake_openai.sync.calls == []
@@ -0,0 +1,137 @@
+"""임베딩 마이크로 배칭 테스트"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from llm.embedding_batcher import EmbeddingBatcher
+
+
+class TestEmbeddingBatcher:
+    """EmbeddingBatcher 테스트"""
+
+    @pytest.mark.anyio
+    async def test_concurrent_queries_share_one_request(self):
+        """창 안에 도착한 쿼리는 한 번의 요청으로 묶이고 결과가 분배되어야 함"""
+        calls = []
+
+        async def embed_batch(texts):
+            calls.append(texts)
+            return np.array([[len(t), 0.0] for t in texts], dtype=np.float32)
+
+        batcher = EmbeddingBatcher(embed_batch, window_ms=5, max_batch_size=64)
+
+        vectors = await asyncio.gather(
+            batcher.embed("a"), batcher.embed("bb"), batcher.embed("a")
+        )
+
+        assert calls == [["a", "bb"]]
+        assert [v[0] for v in vectors] == [1.0, 2.0, 1.0]
+        assert batcher.requests == 3
+        assert batcher.batches == 1
+
+    @pytest.mark.anyio
+    async def test_flushes_when_max_batch_size_reached(self):
+        """max_batch_size에 도달하면 창을 기다리지 않고 전송해야 함"""
+        calls = []
+
+        async def embed_batch(texts):
+            calls.append(texts)
+            return np.zeros((len(texts), 2), dtype=np.float32)
+
+        batcher = EmbeddingBatcher(embed_batch, window_ms=10_000, max_batch_size=2)
+
+        await asyncio.wait_for(
+            asyncio.gather(*(batcher.embed(str(i)) for i in range(4))), timeout=1
+        )
+
+        assert calls == [["0", "1"], ["2", "3"]]
+
+    @pytest.mark.anyio
+    async def test_errors_propagate_to_all_waiters(self):
+        """배치 요청 실패는 대기 중인 모든 호출자에게 전달되어야 함"""
+
+        async def embed_batch(texts):  # noqa: ARG001
+            raise RuntimeError("rate limited")
+
+        batcher = EmbeddingBatcher(embed_batch, window_ms=1)
+
+        results = await asyncio.gather(
+            batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestAembedQueryBatching:
+    """aembed_query의 마이크로 배칭 연동 테스트"""
+
+    @pytest.mark.anyio
+    async def test_concurrent_cache_misses_use_single_embeddings_call(
+        self, fake_openai
+    ):
+        """동시 캐시 미스 쿼리는 한 번의 embeddings.create로 처리되어야 함"""
+        from llm.rag_retriever import aembed_query, embed_query
+
+        queries = [f"쿼리 {i}" for i in range(5)]
+
+        vectors = await asyncio.gather(*(aembed_query(q) for q in queries))
+
+        assert fake_openai.async_.calls == [queries]
+        for query, vector in zip(queries, vectors, strict=True):
+            np.testing.assert_allclose(vector, embed_query(query))
+        assert fake_openai.sync.calls == []
+
+    @pytest.mark.anyio
+    async def test_cache_write_runs_off_event_loop(self, fake_openai, monkeypatch):
+        """캐시 미스 결과의 디스크 기록은 이벤트 루프 스레드를 막지 않아야 함"""
+        from llm import rag_retriever
+
+        loop_thread = threading.get_ident()
+        write_threads = []
+        cache_put = rag_retriever._cache_put
+
+        def _recording_put(cache, keys, vectors):
+            write_threads.append(threading.get_ident())
+            cache_put(cache, keys, vectors)
+
+        monkeypatch.setattr(rag_retriever, "_cache_put", _recording_put)
+
+        vector = await rag_retriever.aembed_query("돌담 쌓기")
+
+        assert write_threads and loop_thread not in write_threads
+        # 기록된 벡터는 다음 호출에서 캐시 적중
+        cached = await rag_retriever.aembed_query("돌담 쌓기")
+        np.testing.assert_allclose(cached, vector)
+        assert len(fake_openai.async_.calls) == 1
+
+    @pytest.mark.anyio
+    async def test_cache_hit_does_not_wait_for_cache_writer(self, fake_openai):
+        """다른 스레드가 캐시를 기록하는 동안에도 캐시 히트는 바로 반환되어야 함"""
+        from llm import rag_retriever
+
+        vector = await rag_retriever.aembed_query("감귤 따기")
+        cache = rag_retriever._embedding_cache
+        writer_holds_lock = threading.Event()
+        release = threading.Event()
+
+        def _slow_writer():
+            with cache._lock, cache._file_lock():
+                writer_holds_lock.set()
+                release.wait(timeout=5)
+
+        writer = threading.Thread(target=_slow_writer)
+        writer.start()
+        try:
+            writer_holds_lock.wait(timeout=5)
+            cached = await asyncio.wait_for(
+                rag_retriever.aembed_query("감귤 따기"), timeout=0.5
+            )
+        finally:
+            release.set()
+            writer.join()
+
+        np.testing.assert_allclose(cached, vector)
+        assert len(fake_openai.async_.calls) == 1
@@ -0,0 +1,178 @@
+"""임베딩 캐시 저장소 테스트"""
+
+import json
+import threading
+
+import numpy as np
+
+from llm import embedding_cache
+from llm.embedding_cache import EmbeddingCacheStore
+
+
+def _vec(seed: int, dim: int = 4) -> np.ndarray:
+    return np.random.default_rng(seed).random(dim, dtype=np.float32)
+
+
+class TestEmbeddingCacheStore:
+    """EmbeddingCacheStore 테스트"""
+
+    def test_put_get_and_reload(self, tmp_path):
+        """append한 벡터가 재시작 후에도 memory-map으로 복원되어야 함"""
+        store = EmbeddingCacheStore(tmp_path / "cache")
+        store.put("해녀", _vec(1))
+        store.put("돌담", _vec(2))
+
+        reloaded = EmbeddingCacheStore(tmp_path / "cache")
+
+        assert len(reloaded) == 2
+        assert reloaded.dimension == 4
+        np.testing.assert_array_equal(reloaded.get("해녀"), _vec(1))
+        np.testing.assert_array_equal(reloaded.get("돌담"), _vec(2))
+        assert reloaded.get("감귤") is None
+
+    def test_miss_appends_instead_of_rewriting(self, tmp_path):
+        """캐시 미스마다 벡터 로그에 행 하나만 추가되어야 함"""
+        store = EmbeddingCacheStore(tmp_path / "cache")
+        store.put("a", _vec(1))
+        vec_path = tmp_path / "cache.0.vec"
+        size_after_first = vec_path.stat().st_size
+
+        store.put("b", _vec(2))
+
+        assert size_after_first == 4 * 4
+        assert vec_path.stat().st_size == 2 * 4 * 4
+
+    def test_lru_eviction_keeps_recently_used(self, tmp_path):
+        """max_entries 초과 시 가장 오래 사용하지 않은 키가 제거되어야 함"""
+        store = EmbeddingCacheStore(tmp_path / "cache", max_entries=2)
+        store.put("a", _vec(1))
+        store.put("b", _vec(2))
+        store.get("a")  # a를 최근 사용으로 갱신
+
+        store.put("c", _vec(3))
+
+        assert "a" in store and "c" in store
+        assert "b" not in store
+        assert store.dead_rows == 1
+
+    def test_compact_drops_evicted_rows(self, tmp_path):
+        """compact 후 로그에는 살아 있는 행만 남아야 함"""
+        store = EmbeddingCacheStore(tmp_path / "cache", max_entries=2)
+        for i, key in enumerate(["a", "b", "c"]):
+            store.put(key, _vec(i))
+
+        store.compact()
+
+        assert store.dead_rows == 0
+        assert not (tmp_path / "cache.0.vec").exists()
+        assert (tmp_path / "cache.1.vec").stat().st_size == 2 * 4 * 4
+
+        reloaded = EmbeddingCacheStore(tmp_path / "cache")
+        assert sorted(["b", "c"]) == sorted(k for k in ["a", "b", "c"] if k in reloaded)
+        np.testing.assert_array_equal(reloaded.get("c"), _vec(2))
+
+    def test_recovers_from_partial_append(self, tmp_path):
+        """벡터만 기록되고 키가 없는 행은 로드 시 버려져야 함"""
+        store = EmbeddingCacheStore(tmp_path / "cache")
+        store.put("a", _vec(1))
+        with (tmp_path / "cache.0.vec").open("ab") as f:
+            f.write(_vec(2).tobytes())
+
+        reloaded = EmbeddingCacheStore(tmp_path / "cache")
+        reloaded.put("b", _vec(3))
+
+        np.testing.assert_array_equal(reloaded.get("b"), _vec(3))
+        assert len(EmbeddingCacheStore(tmp_path / "cache")) == 2
+
+    def test_imports_legacy_json_once(self, tmp_path):
+        """바이너리 저장소가 없으면 기존 JSON 캐시를 가져와야 함"""
+        legacy_path = tmp_path / "embedding_cache.json"
+        legacy_path.write_text(
+            json.dumps({"제주 해녀 체험": _vec(1).tolist()}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+        store = EmbeddingCacheStore(tmp_path / "cache", legacy_json_path=legacy_path)
+
+        np.testing.assert_allclose(store.get("제주 해녀 체험"), _vec(1))
+        assert (tmp_path / "cache.keys").exists()
+
+    def test_get_does_not_wait_for_writer(self, tmp_path):
+        """쓰기/compaction이 락을 잡고 있어도 조회는 기다리지 않아야 함"""
+        store = EmbeddingCacheStore(tmp_path / "cache")
+        store.put("a", _vec(1))
+        result = []
+
+        with store._lock, store._file_lock():
+            reader = threading.Thread(target=lambda: result.append(store.get("a")))
+            reader.start()
+            reader.join(timeout=1)
+            assert not reader.is_alive()
+
+        np.testing.assert_array_equal(result[0], _vec(1))
+
+    def test_hits_are_flushed_in_background(self, tmp_path, monkeypatch):
+        """캐시 히트가 쌓이면 별도 스레드에서 access 로그에 기록되어야 함"""
+        monkeypatch.setattr(embedding_cache, "ACCESS_FLUSH_SIZE", 2)
+        store = EmbeddingCacheStore(tmp_path / "cache")
+        store.put("a", _vec(1))
+
+        store.get("a")
+        store.get("a")
+        store._flush_thread.join(timeout=1)
+
+        access_log = (tmp_path / "cache.0.access").read_text(encoding="utf-8")
+        assert access_log.splitlines() == ['"a"', '"a"']
+
+
+class TestSharedEmbeddingCacheStore:
+    """같은 prefix를 여러 워커(프로세스)가 공유하는 경우"""
+
+    def test_rows_follow_file_when_appending_from_two_stores(self, tmp_path):
+        """다른 워커가 append한 뒤에도 각 키가 자기 벡터를 가리켜야 함"""
+        a = EmbeddingCacheStore(tmp_path / "cache")
+        b = EmbeddingCacheStore(tmp_path / "cache")
+
+        a.put("query-A", _vec(1))
+        b.put("query-B", _vec(2))
+        a.put("query-C", _vec(3))
+        b.refresh()  # 조회는 스냅샷만 읽으므로 다른 워커의 키는 refresh 후에 보임
+
+        np.testing.assert_array_equal(b.get("query-B"), _vec(2))
+        np.testing.assert_array_equal(b.get("query-C"), _vec(3))
+        np.testing.assert_array_equal(a.get("query-B"), _vec(2))
+        reloaded = EmbeddingCacheStore(tmp_path / "cache")
+        for key, seed in [("query-A", 1), ("query-B", 2), ("query-C", 3)]:
+            np.testing.assert_array_equal(reloaded.get(key), _vec(seed))
+
+    def test_compaction_by_another_store_is_picked_up(self, tmp_path):
+        """다른 워커가 compaction 해도 이전 세대 파일을 다시 만들지 않아야 함"""
+        a = EmbeddingCacheStore(tmp_path / "cache", max_entries=2)
+        b = EmbeddingCacheStore(tmp_path / "cache", max_entries=2)
+        for i, key in enumerate(["a", "b", "c"]):
+            a.put(key, _vec(i))
+        b.refresh()
+        np.testing.assert_array_equal(b.get("c"), _vec(2))
+
+        a.compact()
+        b.put("d", _vec(3))
+        a.refresh()
+
+        assert not (tmp_path / "cache.0.vec").exists()
+        np.testing.assert_array_equal(b.get("d"), _vec(3))
+        np.testing.assert_array_equal(a.get("d"), _vec(3))
+        np.testing.assert_array_equal(a.get("c"), _vec(2))
+
+    def test_lru_order_survives_restart(self, tmp_path):
+        """재시작 후에도 삽입 순서가 아닌 사용 순서로 제거되어야 함"""
+        store = EmbeddingCacheStore(tmp_path / "cache", max_entries=2)
+        store.put("a", _vec(1))
+        store.put("b", _vec(2))
+        store.get("a")
+        store.flush()
+
+        reloaded = EmbeddingCacheStore(tmp_path / "cache", max_entries=2)
+        reloaded.put("c", _vec(3))
+
+        assert "a" in reloaded and "c" in reloaded
+        assert "b" not in reloaded
@@ -0,0 +1,96 @@
+"""빌드용 동시/재개 가능 임베딩 테스트"""
+
+import asyncio
+
+import httpx
+import numpy as np
+import openai
+import pytest
+
+from llm.embedding_jobs import BatchCheckpoint, embed_batches
+from llm.tests.conftest import FakeAsyncEmbeddings, fake_embedding
+
+TEXTS = [f"문서 {i}" for i in range(10)]
+
+
+def _rate_limit_error(retry_after: str | None = None) -> openai.RateLimitError:
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    response = httpx.Response(
+        429, headers=headers, request=httpx.Request("POST", "https://api.test")
+    )
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+class FlakyEmbeddings(FakeAsyncEmbeddings):
+    """지정한 배치(첫 텍스트 기준)에서 정해진 횟수만큼 오류를 내는 가짜 클라이언트"""
+
+    def __init__(self, failures: dict[str, list[Exception]] | None = None):
+        super().__init__()
+        self.failures = failures or {}
+        self.active = 0
+        self.max_active = 0
+
+    async def create(self, *, model, input, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            errors = self.failures.get(input[0])
+            if errors:
+                raise errors.pop(0)
+            return await super().create(model=model, input=input, **kwargs)
+        finally:
+            self.active -= 1
+
+
+def _run(embeddings, checkpoint=None, **kwargs):
+    async def embed_batch(texts):
+        response = await embeddings.create(model="test-model", input=texts)
+        return [d.embedding for d in response.data]
+
+    options = {"batch_size": 3, "concurrency": 2, "retry_base_s": 0, **kwargs}
+    return asyncio.run(
+        embed_batches(embed_batch, TEXTS, checkpoint=checkpoint, **options)
+    )
+
+
+def test_embeds_in_input_order_with_bounded_concurrency():
+    embeddings = FlakyEmbeddings()
+
+    vectors = _run(embeddings)
+
+    np.testing.assert_allclose(vectors, [fake_embedding(t) for t in TEXTS])
+    assert len(embeddings.calls) == 4
+    assert embeddings.max_active == 2
+
+
+def test_rate_limit_is_retried():
+    embeddings = FlakyEmbeddings({"문서 3": [_rate_limit_error("0")] * 2})
+
+    vectors = _run(embeddings)
+
+    assert len(vectors) == len(TEXTS)
+    assert len(embeddings.calls) == 4  # 실패한 요청은 calls에 기록되지 않음
+
+
+def test_failed_build_resumes_from_checkpoint(tmp_path):
+    checkpoint = BatchCheckpoint(tmp_path / "checkpoints", "test-model")
+    failing = FlakyEmbeddings({"문서 6": [_rate_limit_error()] * 3})
+
+    with pytest.raises(openai.RateLimitError):
+        _run(failing, checkpoint, max_retries=1)
+    assert len(list(checkpoint.directory.glob("*.npy"))) == 3
+
+    resumed = FlakyEmbeddings()
+    vectors = _run(resumed, checkpoint)
+
+    assert resumed.calls == [TEXTS[6:9]]
+    np.testing.assert_allclose(vectors, [fake_embedding(t) for t in TEXTS])
+
+
+def test_checkpoint_is_keyed_by_model(tmp_path):
+    batch = TEXTS[:3]
+    BatchCheckpoint(tmp_path, "model-a").save(batch, np.ones((3, 2), np.float32))
+
+    assert BatchCheckpoint(tmp_path, "model-a").load(batch) is not None
+    assert BatchCheckpoint(tmp_path, "model-b").load(batch) is None
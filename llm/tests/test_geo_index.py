@@ -0,0 +1,189 @@
+"""위경도 공간 인덱스 / 거리 기반 재순위 테스트"""
+
+import faiss
+import numpy as np
+import pytest
+
+from llm import config
+from llm.geo_index import GeoIndex, geo_path_for, haversine_km
+from llm.rag_retriever import append_candidates, geo_rerank, nearby_search
+from llm.tests.conftest import SYNTHETIC_ITEMS
+
+# SYNTHETIC_ITEMS 순서대로 (region2, 지번 주소, 위도, 경도)
+_PLACES = [
+    ("구좌", "제주시 구좌읍 세화리 1", 33.525, 126.860),
+    ("애월", "제주시 애월읍 고내리 2", 33.468, 126.337),
+    ("남원", "서귀포시 남원읍 위미리 3", 33.275, 126.660),
+    ("조천", "제주시 조천읍 신촌리 4", 33.538, 126.626),
+    ("안덕", "서귀포시 안덕면 사계리 5", 33.230, 126.300),
+    ("구좌", "제주시 구좌읍 하도리 6", None, None),
+]
+
+GEO_ITEMS = [
+    {
+        **item,
+        "address": address,
+        "region2cd": {"value": "", "label": region2, "refId": ""},
+        "latitude": lat,
+        "longitude": lon,
+    }
+    for item, (region2, address, lat, lon) in zip(SYNTHETIC_ITEMS, _PLACES, strict=True)
+]
+
+
+@pytest.fixture
+def geo_index():
+    return GeoIndex.build(GEO_ITEMS, cell_km=2.0)
+
+
+def test_haversine_km():
+    # 제주시청 ↔ 서귀포시청 약 27km
+    km = haversine_km((33.4996, 126.5312), np.array([33.2541]), np.array([126.5600]))
+
+    assert km[0] == pytest.approx(27.4, abs=0.5)
+    assert np.isnan(haversine_km((33.5, 126.5), np.array([np.nan]), np.array([1.0])))
+
+
+class TestGeoIndex:
+    def test_zero_and_missing_coordinates_are_nan(self):
+        items = [{"latitude": 0.0, "longitude": 0.0}, {}, GEO_ITEMS[0]]
+
+        coords = GeoIndex.build(items).coords
+
+        assert np.isnan(coords[:2]).all()
+        assert coords[2].tolist() == [33.525, 126.860]
+
+    @pytest.mark.parametrize(
+        ("location", "doc_id"),
+        [
+            ("세화리 해변 공방", 0),
+            ("서귀포시 안덕면 사계리", 4),  # 뒤쪽의 구체적인 지명 우선
+            ("애월 바닷가", 1),  # 지역 이름 부분 일치
+        ],
+    )
+    def test_geocode(self, geo_index, location, doc_id):
+        assert geo_index.geocode(location) == pytest.approx(
+            (GEO_ITEMS[doc_id]["latitude"], GEO_ITEMS[doc_id]["longitude"])
+        )
+
+    def test_geocode_unknown_location(self, geo_index):
+        assert geo_index.geocode("제주 마을 야외 작업장") is None
+
+    def test_nearby_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        items = [
+            {"latitude": lat, "longitude": lon}
+            for lat, lon in zip(
+                rng.uniform(33.2, 33.6, 500),
+                rng.uniform(126.2, 126.9, 500),
+                strict=True,
+            )
+        ]
+        index = GeoIndex.build(items, cell_km=1.5)
+        origin = (33.4, 126.5)
+
+        distances, ids = index.nearby(origin, radius_km=8)
+
+        expected = index.distances_km(np.arange(len(items)), origin)
+        assert sorted(ids.tolist()) == np.flatnonzero(expected <= 8).tolist()
+        assert np.all(np.diff(distances) >= 0)
+
+    def test_save_load_roundtrip(self, geo_index, tmp_path):
+        path = geo_path_for(tmp_path / "synthetic.index")
+        geo_index.save(path)
+
+        loaded = GeoIndex.load(path)
+
+        np.testing.assert_array_equal(loaded.coords, geo_index.coords)
+        assert loaded.places == geo_index.places
+        assert loaded.nearby((33.5, 126.85), 5)[1].tolist() == [0]
+
+
+def test_geo_rerank_promotes_nearby_candidates(geo_index):
+    # 검색 순위: 애월(1) > 세화(0) > 위미(2) > 하도(5, 좌표 없음)
+    distances = np.array([[0.1, 0.2, 0.3, 0.4]], dtype=np.float32)
+    indices = np.array([[1, 0, 2, 5]])
+    origin = geo_index.geocode("세화리")
+
+    reranked_distances, reranked = geo_rerank(
+        geo_index, distances, indices, origin, top_k=3
+    )
+
+    assert reranked[0].tolist() == [0, 1, 2]
+    assert reranked_distances[0].tolist() == pytest.approx([0.2, 0.1, 0.3])
+
+
+def test_nearby_search_uses_grid_candidates(geo_index):
+    vectors = np.random.default_rng(0).standard_normal((6, 4)).astype(np.float32)
+    index = faiss.IndexFlatL2(4)
+    index.add(vectors)
+    origin = geo_index.geocode("세화리")
+
+    # 반경 5km 안: 세화(0)만 (하도(5)는 좌표 없음)
+    distances, indices = nearby_search(index, geo_index, vectors[2], origin, 5.0, 3)
+    assert indices.tolist() == [[0]]
+    assert distances[0, 0] == pytest.approx(np.sum((vectors[2] - vectors[0]) ** 2))
+
+    _, none = nearby_search(index, geo_index, vectors[2], (37.5, 127.0), 5.0, 3)
+    assert none.shape == (1, 0)
+
+
+def test_append_candidates_keeps_search_order():
+    distances = np.array([[0.1, 0.2, np.nan]], dtype=np.float32)
+    indices = np.array([[3, 1, -1]])
+
+    merged_distances, merged = append_candidates(
+        distances, indices, np.array([[0.5, 0.2]]), np.array([[4, 1]])
+    )
+
+    assert merged.tolist() == [[3, 1, -1, 4, -1]]
+    assert merged_distances[0, 3] == pytest.approx(0.5)
+
+
+@pytest.mark.usefixtures("fake_openai")
+class TestGeoRerankedRetrieval:
+    @pytest.fixture
+    def geo_artifacts(self, synthetic_artifacts):
+        index_path, metadata_path = synthetic_artifacts
+        GeoIndex.build(GEO_ITEMS).save(geo_path_for(index_path))
+        return index_path, metadata_path
+
+    def test_location_key_uses_geocoded_origin(self, geo_artifacts):
+        from llm.rag_retriever import RAGRetriever
+
+        retriever = RAGRetriever(*geo_artifacts)
+
+        assert retriever.location_key("세화리 해변") == retriever.location_key(
+            "구좌읍 세화리"
+        )
+        assert retriever.location_key("알 수 없는 곳") is None
+
+    @pytest.mark.anyio
+    async def test_aretrieve_reranks_by_location(self, geo_artifacts):
+        from llm.rag_retriever import RAGRetriever
+
+        retriever = RAGRetriever(*geo_artifacts)
+        nearest = await retriever.aretrieve("체험", top_k=6, location="사계리")
+        plain = await retriever.aretrieve("체험", top_k=6)
+
+        assert {r["title"] for r in nearest} == {r["title"] for r in plain}
+        titles = [r["title"] for r in nearest]
+        plain_titles = [r["title"] for r in plain]
+        assert titles.index("목공 공방") <= plain_titles.index("목공 공방")
+
+    def test_nearby_documents_join_candidates(self, geo_artifacts, monkeypatch):
+        from llm.rag_retriever import RAGRetriever
+
+        retriever = RAGRetriever(*geo_artifacts)
+        monkeypatch.setattr(config, "GEO_CANDIDATES", 2)
+        query = "해녀 물질 체험"
+        assert "목공 공방" not in [r["title"] for r in retriever.retrieve(query, 2)]
+
+        # 반경 후보가 없으면 전체 벡터 후보 2개 안에서만 재순위
+        monkeypatch.setattr(config, "GEO_RADIUS_KM", 0)
+        without = retriever.retrieve(query, top_k=2, location="사계리")
+        monkeypatch.setattr(config, "GEO_RADIUS_KM", 10.0)
+        nearby = retriever.retrieve(query, top_k=2, location="사계리")
+
+        assert "목공 공방" not in [r["title"] for r in without]
+        assert "목공 공방" in [r["title"] for r in nearby]
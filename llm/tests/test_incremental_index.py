@@ -0,0 +1,120 @@
+"""contentsid 기반 증분 인덱스 빌드 테스트"""
+
+import json
+
+import numpy as np
+import pytest
+
+from llm import build_index
+from llm.incremental_index import (
+    BuildState,
+    content_id,
+    dedupe_items,
+    diff_items,
+    manifest_path_for,
+    vectors_path_for,
+)
+from llm.tests.conftest import SYNTHETIC_ITEMS, fake_embedding
+
+
+@pytest.fixture
+def embedded_texts(monkeypatch, tmp_path):
+    """build_index의 아티팩트 경로를 격리하고 임베딩한 텍스트를 기록"""
+    monkeypatch.setattr(build_index, "INDEX_PATH", tmp_path / "test.index")
+    monkeypatch.setattr(build_index, "DOC_STORE_PATH", tmp_path / "documents")
+    calls: list[list[str]] = []
+
+    def _embed_texts(texts, batch_size=64):  # noqa: ARG001
+        calls.append(list(texts))
+        return np.array([fake_embedding(t) for t in texts], dtype=np.float32)
+
+    monkeypatch.setattr(build_index, "embed_texts", _embed_texts)
+    return calls
+
+
+def _expected(items):
+    return np.array(
+        [fake_embedding(build_index.build_text(it)) for it in items], dtype=np.float32
+    )
+
+
+def test_content_id_is_stable_and_non_negative():
+    assert content_id("CNTS_000000000022244") == content_id("CNTS_000000000022244")
+    assert content_id("CNTS_000000000022244") != content_id("CNTS_000000000022245")
+    assert content_id("CNTS_200000000014235") >= 0
+
+
+def test_dedupe_items_keeps_first():
+    items = [*SYNTHETIC_ITEMS[:2], {**SYNTHETIC_ITEMS[0], "title": "중복"}, {}]
+
+    assert dedupe_items(items) == SYNTHETIC_ITEMS[:2]
+
+
+def test_diff_items():
+    diff = diff_items({"a": "1", "b": "2", "c": "3"}, {"a": "1", "b": "x", "d": "4"})
+
+    assert diff.summary() == {"added": 1, "changed": 1, "removed": 1, "unchanged": 1}
+    assert diff.to_embed == ["d", "b"]
+    assert diff.removed == ["c"]
+
+
+class TestIncrementalBuild:
+    def test_only_added_and_changed_items_are_embedded(self, embedded_texts):
+        build_index.embed_items(SYNTHETIC_ITEMS)
+
+        changed = {**SYNTHETIC_ITEMS[1], "introduction": "새 소개"}
+        added = {**SYNTHETIC_ITEMS[0], "contentsid": "CNTS_NEW", "title": "새 체험"}
+        items = [SYNTHETIC_ITEMS[0], changed, *SYNTHETIC_ITEMS[3:], added]
+
+        embeddings = build_index.embed_items(items, incremental=True)
+
+        assert embedded_texts[1] == [
+            build_index.build_text(added),
+            build_index.build_text(changed),
+        ]
+        np.testing.assert_allclose(embeddings, _expected(items), rtol=1e-6)
+
+        state = BuildState.load(build_index.INDEX_PATH)
+        assert state.version == 2
+        assert state.vectors.ntotal == len(items)  # 삭제된 item(2번) 제거
+        manifest = json.loads(manifest_path_for(build_index.INDEX_PATH).read_text())
+        assert manifest["changes"] == {
+            "added": 1,
+            "changed": 1,
+            "removed": 1,
+            "unchanged": 4,
+        }
+
+    def test_unchanged_items_need_no_embedding(self, embedded_texts):
+        build_index.embed_items(SYNTHETIC_ITEMS)
+        embeddings = build_index.embed_items(SYNTHETIC_ITEMS, incremental=True)
+
+        assert len(embedded_texts) == 1
+        np.testing.assert_allclose(embeddings, _expected(SYNTHETIC_ITEMS), rtol=1e-6)
+
+    def test_model_change_re_embeds_everything(self, embedded_texts, monkeypatch):
+        build_index.embed_items(SYNTHETIC_ITEMS)
+        monkeypatch.setattr(build_index, "EMBEDDING_MODEL", "other-model")
+
+        build_index.embed_items(SYNTHETIC_ITEMS, incremental=True)
+
+        assert len(embedded_texts[1]) == len(SYNTHETIC_ITEMS)
+        assert BuildState.load(build_index.INDEX_PATH).embedding_model == "other-model"
+
+    def test_full_rebuild_is_assembled_from_document_store(self, embedded_texts):
+        build_index.embed_items(SYNTHETIC_ITEMS)
+        # 다른 인덱스 타입으로 다시 빌드하는 경우 (벡터 저장소/매니페스트 없음)
+        vectors_path_for(build_index.INDEX_PATH).unlink()
+
+        changed = {**SYNTHETIC_ITEMS[0], "title": "새 이름"}
+        items = [changed, *SYNTHETIC_ITEMS[1:]]
+        embeddings = build_index.embed_items(items)
+
+        assert embedded_texts[1] == [build_index.build_text(changed)]
+        np.testing.assert_allclose(embeddings, _expected(items), rtol=1e-6)
+
+    def test_without_previous_build_embeds_everything(self, embedded_texts):
+        build_index.embed_items(SYNTHETIC_ITEMS[:3], incremental=True)
+
+        assert len(embedded_texts[0]) == 3
+        assert BuildState.load(build_index.INDEX_PATH).version == 1
@@ -0,0 +1,145 @@
+"""인덱스 타입 선택 및 recall/latency 리포트 테스트"""
+
+import json
+
+import faiss
+import numpy as np
+import pytest
+
+from llm.index_factory import INDEX_TYPES, create_index, evaluate_index
+
+
+@pytest.fixture
+def embeddings():
+    return np.random.default_rng(0).random((500, 16), dtype=np.float32)
+
+
+class TestIndexFactory:
+    """create_index / evaluate_index 테스트"""
+
+    @pytest.mark.parametrize("index_type", INDEX_TYPES)
+    def test_create_index_types(self, embeddings, index_type):
+        """각 타입의 인덱스가 모든 벡터를 담고 높은 recall을 보여야 함"""
+        index, params = create_index(embeddings, index_type, nprobe=4, pq_m=4)
+        reference, _ = create_index(embeddings, "flat")
+
+        report = evaluate_index(index, reference, embeddings[:50], top_k=5)
+
+        assert index.ntotal == len(embeddings)
+        # PQ는 학습 벡터가 적어 코드북이 작으므로 recall 하한을 두지 않음
+        assert report["recall_at_k"] >= (0.05 if index_type == "pq" else 0.5)
+        assert set(report["latency_ms"]) == {"mean", "p50", "p95", "p99"}
+        if index_type == "ivf":
+            assert params["nlist"] == 12  # 500 // 39
+            assert faiss.extract_index_ivf(index).nprobe == 4
+        if index_type == "hnsw":
+            assert index.hnsw.efSearch == params["efSearch"]
+        if index_type == "pq":
+            assert params == {"M": 4, "nbits": 3}  # log2(500 / 39)
+
+    def test_flat_recall_is_exact(self, embeddings):
+        """flat 인덱스는 자기 자신 대비 recall 1.0이어야 함"""
+        index, _ = create_index(embeddings, "flat")
+
+        report = evaluate_index(index, index, embeddings[:20], top_k=5, target_ms=500)
+
+        assert report["recall_at_k"] == 1.0
+        assert report["within_target"] is True
+
+    def test_unknown_index_type_raises(self, embeddings):
+        with pytest.raises(ValueError):
+            create_index(embeddings, "lsh")
+
+    def test_compare_index_types_reports_memory_savings(self, embeddings):
+        """압축 인덱스는 flat보다 메모리가 작아야 함"""
+        from llm.benchmark import compare_index_types
+
+        rows = compare_index_types(
+            embeddings, ("flat", "fp16", "sq8", "pq"), num_queries=20, top_k=5, pq_m=4
+        )
+        ratios = {row["index_type"]: row["memory_ratio"] for row in rows}
+
+        assert ratios["flat"] == 1.0
+        assert ratios["fp16"] < 0.7
+        assert ratios["sq8"] < ratios["fp16"]
+        assert ratios["pq"] < ratios["sq8"]
+        assert all("recall_at_k" in row and "latency_ms" in row for row in rows)
+
+    @pytest.mark.parametrize("index_type", ["fp16", "sq8", "pq"])
+    def test_compressed_index_roundtrip(self, embeddings, index_type, tmp_path):
+        """압축 인덱스도 파일로 저장 후 read_index로 로드할 수 있어야 함"""
+        index, _ = create_index(embeddings, index_type, pq_m=4)
+        path = tmp_path / f"{index_type}.index"
+        faiss.write_index(index, str(path))
+
+        loaded = faiss.read_index(str(path))
+
+        assert loaded.ntotal == index.ntotal
+        np.testing.assert_array_equal(
+            loaded.search(embeddings[:3], 3)[1], index.search(embeddings[:3], 3)[1]
+        )
+
+
+class TestBuildIndexOptions:
+    """build_index의 인덱스 타입 옵션 테스트"""
+
+    def test_runtime_reads_index_type_from_artifact(
+        self, monkeypatch, tmp_path, fake_openai
+    ):
+        """빌드 시 기록한 타입/검색 파라미터를 RAGRetriever가 적용해야 함"""
+        from llm import build_index
+        from llm.rag_retriever import RAGRetriever
+        from llm.tests.conftest import SYNTHETIC_ITEMS, fake_embedding
+
+        monkeypatch.setattr(build_index, "INDEX_PATH", tmp_path / "test.index")
+        monkeypatch.setattr(build_index, "META_PATH", tmp_path / "meta.json")
+        monkeypatch.setattr(build_index, "META_STORE_PATH", tmp_path / "meta.bin")
+        monkeypatch.setattr(build_index, "REPORT_PATH", tmp_path / "report.json")
+        embeddings = np.array(
+            [fake_embedding(item["title"]) for item in SYNTHETIC_ITEMS],
+            dtype=np.float32,
+        )
+
+        index = build_index.build_and_save_index(
+            embeddings, SYNTHETIC_ITEMS, index_type="hnsw", ef_search=17
+        )
+        report = build_index.write_index_report(index, embeddings, "hnsw", top_k=3)
+
+        retriever = RAGRetriever(tmp_path / "test.index", tmp_path / "meta.json")
+        assert retriever.index_type == "hnsw"
+        assert len(retriever.items) == len(SYNTHETIC_ITEMS)
+        assert retriever.index.hnsw.efSearch == 17
+        assert retriever.dimension == embeddings.shape[1]
+        metadata = json.loads((tmp_path / "meta.json").read_text(encoding="utf-8"))
+        assert metadata["index"]["dimension"] == embeddings.shape[1]
+        assert retriever.retrieve("목공 공방", top_k=1)[0]["title"] == "목공 공방"
+        assert fake_openai.sync.calls == [["목공 공방"]]
+
+        saved = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+        assert saved == report
+        assert saved["recall_at_k"] == 1.0
+
+    def test_rebuild_replaces_artifacts_instead_of_overwriting(
+        self, monkeypatch, tmp_path
+    ):
+        """memory-map 한 워커가 있어도 안전하도록 재빌드는 새 파일로 교체해야 함"""
+        from llm import build_index
+        from llm.tests.conftest import SYNTHETIC_ITEMS, fake_embedding
+
+        monkeypatch.setattr(build_index, "INDEX_PATH", tmp_path / "test.index")
+        monkeypatch.setattr(build_index, "META_PATH", tmp_path / "meta.json")
+        monkeypatch.setattr(build_index, "META_STORE_PATH", tmp_path / "meta.bin")
+        embeddings = np.array(
+            [fake_embedding(item["title"]) for item in SYNTHETIC_ITEMS],
+            dtype=np.float32,
+        )
+
+        build_index.build_and_save_index(embeddings, SYNTHETIC_ITEMS)
+        before = {path.name: path.stat().st_ino for path in tmp_path.iterdir()}
+        build_index.build_and_save_index(embeddings, SYNTHETIC_ITEMS)
+        after = {path.name: path.stat().st_ino for path in tmp_path.iterdir()}
+
+        assert set(after) == set(before)
+        assert not any(".tmp" in name for name in after)
+        # 같은 inode를 제자리에서 다시 쓰지 않음 (이전 inode는 기존 매핑이 계속 참조)
+        assert all(after[name] != before[name] for name in before)
@@ -1,4 +1,9 @@
-"""통합 테스트 및 최적화 테스트"""
+"""통합 테스트 및 최적화 테스트
+
+OPENAI_API_KEY와 빌드된 인덱스가 있으면 실제 아티팩트로, 없으면 결정적 로컬
+임베딩 백엔드(hashed)로 전체 데이터셋 인덱스를 빌드하여 검색 스택 전체를
+테스트합니다 (네트워크 불필요).
+"""
 
 import os
 import sys
@@ -7,17 +12,52 @@ from pathlib import Path
 
 import pytest
 
-if not os.getenv("OPENAI_API_KEY"):
-    pytest.skip("OPENAI_API_KEY is required for RAG integration tests", allow_module_level=True)
-
 # llm 모듈을 임포트하기 위한 경로 설정
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+OUTPUT_DIR = project_root / "llm" / "output"
+HAS_OPENAI = bool(os.getenv("OPENAI_API_KEY")) and (
+    OUTPUT_DIR / "visitjeju_faiss.index"
+).exists()
+
+
+@pytest.fixture(scope="module")
+def artifacts(tmp_path_factory):
+    """(index_path, metadata_path): 실제 아티팩트 또는 hashed 백엔드로 빌드한 아티팩트"""
+    if HAS_OPENAI:
+        yield (
+            OUTPUT_DIR / "visitjeju_faiss.index",
+            OUTPUT_DIR / "visitjeju_metadata.json",
+        )
+        return
+
+    from llm import build_index, config, rag_retriever
+    from llm.embedding_backend import HashedNgramEmbeddingBackend
+
+    out = tmp_path_factory.mktemp("hashed_build")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(build_index, "INDEX_PATH", out / "visitjeju_faiss.index")
+        mp.setattr(build_index, "META_PATH", out / "visitjeju_metadata.json")
+        mp.setattr(build_index, "META_STORE_PATH", out / "visitjeju_metadata.bin")
+        mp.setattr(build_index, "REPORT_PATH", out / "report.json")
+        mp.setattr(build_index, "CACHE_STORE_PATH", out / "embedding_cache")
+        mp.setattr(build_index, "DOC_STORE_PATH", out / "document_embeddings")
+        mp.setattr(config, "RELEASES_DIR", out / "releases")
+        mp.setattr(rag_retriever, "EMBEDDING_CACHE_STORE_PATH", out / "embedding_cache")
+        build_index.main(["--embedding-backend", "hashed", "--report-queries", "0"])
+        rag_retriever.set_embedding_backend(HashedNgramEmbeddingBackend())
+        try:
+            yield build_index.INDEX_PATH, build_index.META_PATH
+        finally:
+            rag_retriever.set_embedding_backend(None)
+            build_index.use_embedding_backend(config.EMBEDDING_BACKEND)
+
 
 class TestIntegration:
     """통합 테스트"""
 
+    @pytest.mark.skipif(not HAS_OPENAI, reason="example_rag_usage는 실제 인덱스 필요")
     def test_e2e_experience_plan(self):
         """Test 5.1: 실제 카테고리로 RAG + 프롬프트 전체 흐름 테스트"""
         # Given: example_rag_usage의 함수들
@@ -57,13 +97,12 @@ class TestIntegration:
         assert "해녀" in prompt, "카테고리가 포함되지 않음"
         assert "테왁" in prompt, "재료가 포함되지 않음"
 
-    def test_retrieval_performance(self):
+    def test_retrieval_performance(self, artifacts):
         """Test 5.2: 검색 속도가 합리적인지 확인 (< 500ms)"""
         # Given: RAGRetriever 인스턴스
         from llm.rag_retriever import RAGRetriever
 
-        index_path = project_root / "llm" / "output" / "visitjeju_faiss.index"
-        metadata_path = project_root / "llm" / "output" / "visitjeju_metadata.json"
+        index_path, metadata_path = artifacts
 
         retriever = RAGRetriever(str(index_path), str(metadata_path))
 
@@ -95,7 +134,7 @@ class TestIntegration:
 
         print(f"✓ 평균 검색 성능 (5회): {avg_time:.2f}ms")
 
-    def test_error_handling(self):
+    def test_error_handling(self, artifacts):
         """Test 5.3: 인덱스 파일 없음, API 오류 등 예외 상황 처리"""
         # Test 5.3a: 존재하지 않는 인덱스 파일
         from llm.rag_retriever import RAGRetriever
@@ -110,8 +149,7 @@ class TestIntegration:
             retrieve("테스트 쿼리", index_path="nonexistent.index")
 
         # Test 5.3c: 빈 쿼리 처리
-        index_path = project_root / "llm" / "output" / "visitjeju_faiss.index"
-        metadata_path = project_root / "llm" / "output" / "visitjeju_metadata.json"
+        index_path, metadata_path = artifacts
 
         retriever = RAGRetriever(str(index_path), str(metadata_path))
 
@@ -125,13 +163,12 @@ class TestIntegration:
 class TestOptimization:
     """최적화 관련 테스트"""
 
-    def test_batch_retrieval(self):
+    def test_batch_retrieval(self, artifacts):
         """여러 쿼리를 배치로 처리하는 성능 테스트"""
         # Given: RAGRetriever와 여러 쿼리
         from llm.rag_retriever import RAGRetriever
 
-        index_path = project_root / "llm" / "output" / "visitjeju_faiss.index"
-        metadata_path = project_root / "llm" / "output" / "visitjeju_metadata.json"
+        index_path, metadata_path = artifacts
 
         retriever = RAGRetriever(str(index_path), str(metadata_path))
 
@@ -0,0 +1,130 @@
+"""문자 n-gram BM25 어휘 인덱스 / 하이브리드 검색 테스트"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from llm.lexical_index import (
+    LexicalIndex,
+    char_ngrams,
+    lexical_path_for,
+    reciprocal_rank_fusion,
+)
+from llm.tests.conftest import SYNTHETIC_ITEMS
+
+
+@pytest.fixture
+def lexical_index():
+    return LexicalIndex.build(SYNTHETIC_ITEMS)
+
+
+@pytest.fixture
+def hybrid_artifacts(synthetic_artifacts):
+    index_path, metadata_path = synthetic_artifacts
+    LexicalIndex.build(SYNTHETIC_ITEMS).save(lexical_path_for(index_path))
+    return index_path, metadata_path
+
+
+class TestLexicalIndex:
+    def test_char_ngrams(self):
+        assert char_ngrams("해녀 물질!") == ["해녀", "물질"]
+        assert char_ngrams("감귤따기 A") == ["감귤", "귤따", "따기", "a"]
+
+    def test_search_ranks_matching_documents(self, lexical_index):
+        scores, ids = lexical_index.search("감귤 수확 체험", top_k=3)
+
+        assert SYNTHETIC_ITEMS[ids[0]]["title"] == "감귤 따기 농장"
+        assert np.all(np.diff(scores) <= 0)
+
+    def test_search_skips_unmatched_documents(self, lexical_index):
+        _, ids = lexical_index.search("해녀", top_k=5)
+
+        assert {SYNTHETIC_ITEMS[i]["title"] for i in ids} == {
+            "해녀 물질 체험",
+            "해녀 박물관",
+        }
+        assert lexical_index.search("없는단어", top_k=3)[1].size == 0
+
+    def test_save_load_roundtrip(self, lexical_index, tmp_path):
+        path = tmp_path / "lexical.npz"
+        lexical_index.save(path)
+
+        loaded = LexicalIndex.load(path)
+
+        np.testing.assert_allclose(
+            loaded.scores("목공 공방"), lexical_index.scores("목공 공방")
+        )
+
+    def test_reciprocal_rank_fusion(self):
+        fused = reciprocal_rank_fusion(
+            [np.array([1, 2, 3, -1]), np.array([3, 1, 4])], top_k=3, k=60
+        )
+
+        # 1과 3은 양쪽에 모두 있고, 1이 더 높은 순위
+        assert fused.tolist() == [1, 3, 2]
+
+
+@pytest.mark.usefixtures("fake_openai")
+class TestHybridRetrieval:
+    def test_retriever_fuses_vector_and_lexical(self, hybrid_artifacts):
+        from llm.rag_retriever import RAGRetriever
+
+        retriever = RAGRetriever(*hybrid_artifacts)
+        results = retriever.retrieve("목공 공방", top_k=3)
+
+        assert retriever.lexical_index is not None
+        assert results[0]["title"] == "목공 공방"
+        assert len(results) == 3
+
+    def test_sync_embedding_failure_falls_back_to_lexical(
+        self, hybrid_artifacts, monkeypatch
+    ):
+        from llm import rag_retriever
+
+        def _fail(_query):
+            raise RuntimeError("embedding down")
+
+        monkeypatch.setattr(rag_retriever, "embed_query", _fail)
+        retriever = rag_retriever.RAGRetriever(*hybrid_artifacts)
+
+        results = retriever.retrieve("해녀 박물관", top_k=2)
+
+        assert results[0]["title"] == "해녀 박물관"
+        assert np.isnan(results[0]["distance"])
+        assert retriever.lexical_fallbacks == 1
+
+    @pytest.mark.anyio
+    async def test_slow_embedding_falls_back_within_budget(
+        self, hybrid_artifacts, monkeypatch
+    ):
+        from llm import config, rag_retriever
+
+        async def _slow(_query):
+            await asyncio.sleep(1)
+
+        monkeypatch.setattr(rag_retriever, "aembed_query", _slow)
+        monkeypatch.setattr(config, "EMBEDDING_TIMEOUT_MS", 20)
+        retriever = rag_retriever.RAGRetriever(*hybrid_artifacts)
+
+        results = await asyncio.wait_for(
+            retriever.aretrieve("돌담 쌓기", top_k=1), timeout=0.5
+        )
+
+        assert [r["title"] for r in results] == ["돌담 쌓기 교실"]
+        assert retriever.lexical_fallbacks == 1
+
+    def test_without_lexical_index_errors_propagate(
+        self, synthetic_artifacts, monkeypatch
+    ):
+        from llm import rag_retriever
+
+        def _fail(_query):
+            raise RuntimeError("embedding down")
+
+        monkeypatch.setattr(rag_retriever, "embed_query", _fail)
+        retriever = rag_retriever.RAGRetriever(*synthetic_artifacts)
+
+        assert retriever.lexical_index is None
+        with pytest.raises(RuntimeError):
+            retriever.retrieve("해녀", top_k=1)
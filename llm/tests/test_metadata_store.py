@@ -0,0 +1,149 @@
+"""memory-map 메타데이터 저장소 / 인덱스 로드 테스트"""
+
+import json
+
+import faiss
+import numpy as np
+import pytest
+
+from llm.index_factory import create_index, read_index
+from llm.metadata_store import (
+    FIELDS,
+    MetadataStore,
+    convert_json_metadata,
+    extract_fields,
+    load_metadata,
+    store_path_for,
+    write_metadata_store,
+)
+from llm.tests.conftest import SYNTHETIC_ITEMS
+
+INDEX_INFO = {"type": "hnsw", "params": {"efSearch": 32}}
+EXPECTED_ROWS = [
+    dict(zip(FIELDS, extract_fields(item), strict=True)) for item in SYNTHETIC_ITEMS
+]
+
+
+class TestMetadataStore:
+    def test_roundtrip(self, tmp_path):
+        path = tmp_path / "meta.bin"
+        write_metadata_store(
+            path, SYNTHETIC_ITEMS, "text-embedding-3-small", INDEX_INFO
+        )
+
+        store = MetadataStore(path)
+
+        assert len(store) == len(SYNTHETIC_ITEMS)
+        assert list(store) == EXPECTED_ROWS
+        assert store[-1] == EXPECTED_ROWS[-1]
+        assert store[1:3] == EXPECTED_ROWS[1:3]
+        assert store.field(2, "address") == SYNTHETIC_ITEMS[2]["roadaddress"]
+        assert store.embedding_model == "text-embedding-3-small"
+        assert store.index_info == INDEX_INFO
+        with pytest.raises(IndexError):
+            store[len(SYNTHETIC_ITEMS)]
+
+    def test_empty_store(self, tmp_path):
+        path = tmp_path / "meta.bin"
+        write_metadata_store(path, [], "text-embedding-3-small")
+
+        store = MetadataStore(path)
+
+        assert len(store) == 0
+        assert store.index_info == {"type": "flat", "params": {}}
+
+    def test_keeps_only_retrieval_fields(self, tmp_path):
+        """repPhoto 등 검색에 쓰지 않는 필드는 저장하지 않고, 대체 필드를 반영"""
+        items = [
+            {
+                "title": "제주 체험",
+                "tag": "태그",
+                "address": "제주시",
+                "repPhoto": {"photoid": {"imgpath": "https://example.com/a.jpg"}},
+                "phoneno": "064-000-0000",
+            }
+        ]
+        path = tmp_path / "meta.bin"
+        write_metadata_store(path, items, "text-embedding-3-small")
+
+        assert MetadataStore(path)[0] == {
+            "title": "제주 체험",
+            "introduction": "",
+            "alltag": "태그",
+            "address": "제주시",
+        }
+        assert b"example.com" not in path.read_bytes()
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "meta.bin"
+        path.write_bytes(b"not a metadata store")
+
+        with pytest.raises(ValueError):
+            MetadataStore(path)
+
+    def test_load_metadata_prefers_store(self, synthetic_artifacts):
+        _, metadata_path = synthetic_artifacts
+
+        items, model, index_info = load_metadata(metadata_path)
+        assert isinstance(items, list)
+        assert index_info == {"type": "flat", "params": {}}
+
+        store_path = convert_json_metadata(metadata_path)
+        assert store_path == store_path_for(metadata_path)
+
+        items, model, index_info = load_metadata(metadata_path)
+        assert isinstance(items, MetadataStore)
+        assert list(items) == EXPECTED_ROWS
+        assert (
+            model
+            == json.loads(metadata_path.read_text(encoding="utf-8"))["embedding_model"]
+        )
+
+    def test_falls_back_to_json_on_unknown_store(self, synthetic_artifacts):
+        _, metadata_path = synthetic_artifacts
+        store_path_for(metadata_path).write_bytes(b"VJMETA\x00\x01" + b"\x00" * 8)
+
+        items, _, _ = load_metadata(metadata_path)
+
+        assert items == SYNTHETIC_ITEMS
+
+    def test_benchmark_compares_formats(self, synthetic_artifacts):
+        from llm.benchmark import compare_metadata_formats
+
+        _, metadata_path = synthetic_artifacts
+        rows = compare_metadata_formats(metadata_path, lookups=10)
+
+        assert [row["format"] for row in rows] == ["json", "store"]
+        assert all(row["items"] == len(SYNTHETIC_ITEMS) for row in rows)
+        assert all("load_ms" in row and "private_mb" in row for row in rows)
+
+
+class TestReadIndex:
+    @pytest.mark.parametrize("index_type", ["flat", "sq8", "ivf"])
+    def test_mmap_matches_regular_load(self, tmp_path, index_type):
+        embeddings = np.random.default_rng(0).random((500, 16), dtype=np.float32)
+        index, _ = create_index(embeddings, index_type)
+        path = tmp_path / "test.index"
+        faiss.write_index(index, str(path))
+
+        mapped = read_index(path, mmap=True)
+        loaded = read_index(path, mmap=False)
+
+        queries = embeddings[:5]
+        np.testing.assert_array_equal(
+            mapped.search(queries, 3)[1], loaded.search(queries, 3)[1]
+        )
+
+    @pytest.mark.usefixtures("fake_openai")
+    def test_retriever_uses_mmap_artifacts(self, synthetic_artifacts):
+        from llm.rag_retriever import RAGRetriever
+
+        index_path, metadata_path = synthetic_artifacts
+        convert_json_metadata(metadata_path)
+
+        retriever = RAGRetriever(index_path, metadata_path)
+        results = retriever.retrieve(SYNTHETIC_ITEMS[2]["title"], top_k=2)
+
+        assert isinstance(retriever.items, MetadataStore)
+        assert results[0]["title"] == SYNTHETIC_ITEMS[2]["title"]
+        assert results[0]["address"] == SYNTHETIC_ITEMS[2]["roadaddress"]
@@ -0,0 +1,98 @@
+"""MMR 다양화 재순위 테스트"""
+
+import faiss
+import numpy as np
+import pytest
+
+from llm import config
+from llm.index_factory import create_index, enable_reconstruct
+from llm.rag_retriever import mmr_rerank, mmr_select
+
+
+@pytest.fixture
+def near_duplicates():
+    """0~2는 거의 같은 문서(같은 농장의 지점들), 3과 4는 서로 다른 문서"""
+    vectors = np.array(
+        [
+            [1.0, 0.0, 0.0, 0.0],
+            [1.0, 0.01, 0.0, 0.0],
+            [1.0, 0.0, 0.01, 0.0],
+            [0.8, 0.6, 0.0, 0.0],
+            [0.8, 0.0, 0.0, 0.6],
+        ],
+        dtype=np.float32,
+    )
+    index = faiss.IndexFlatL2(4)
+    index.add(vectors)
+    return index, vectors[0]
+
+
+def test_mmr_select_skips_redundant_candidates():
+    relevance = np.array([1.0, 0.99, 0.5])
+    similarity = np.array([[1.0, 0.99, 0.0], [0.99, 1.0, 0.0], [0.0, 0.0, 1.0]])
+
+    assert mmr_select(relevance, similarity, 2, 0.5).tolist() == [0, 2]
+    assert mmr_select(relevance, similarity, 2, 1.0).tolist() == [0, 1]
+    assert mmr_select(relevance, similarity, 5, 0.5).tolist() == [0, 2, 1]
+    assert mmr_select(relevance[:0], similarity[:0, :0], 3, 0.5).tolist() == []
+
+
+def test_mmr_rerank_returns_distinct_documents(near_duplicates):
+    index, query = near_duplicates
+    distances, indices = index.search(query[None], 5)
+
+    reranked_distances, reranked = mmr_rerank(
+        index, query, distances, indices, top_k=3, lambda_=0.3
+    )
+
+    assert reranked[0, 0] == 0
+    assert set(reranked[0, 1:].tolist()) == {3, 4}
+    # 원래 검색 거리 유지
+    by_id = dict(zip(indices[0].tolist(), distances[0].tolist(), strict=True))
+    assert reranked_distances[0].tolist() == pytest.approx(
+        [by_id[i] for i in reranked[0].tolist()]
+    )
+
+
+def test_mmr_rerank_pads_missing_candidates(near_duplicates):
+    index, query = near_duplicates
+    distances = np.array([[0.0, np.nan, 0.0], [0.0, 0.0, 0.0]], dtype=np.float32)
+    indices = np.array([[0, 3, -1], [-1, -1, -1]])
+
+    reranked_distances, reranked = mmr_rerank(
+        index, np.vstack([query, query]), distances, indices, top_k=3
+    )
+
+    assert reranked.tolist() == [[0, 3, -1], [-1, -1, -1]]
+    assert np.isnan(reranked_distances[0, 1:]).all()
+
+
+def test_enable_reconstruct_for_ivf():
+    vectors = np.random.default_rng(0).standard_normal((200, 8)).astype(np.float32)
+    index, _ = create_index(vectors, "ivf", nlist=4)
+
+    enable_reconstruct(index)
+    enable_reconstruct(faiss.IndexFlatL2(8))  # IVF가 아니면 그대로
+
+    np.testing.assert_array_equal(
+        index.reconstruct_batch(np.array([5, 17])), vectors[[5, 17]]
+    )
+
+
+@pytest.mark.usefixtures("fake_openai")
+def test_retriever_applies_mmr_when_enabled(synthetic_artifacts, monkeypatch):
+    from llm.rag_retriever import RAGRetriever
+
+    retriever = RAGRetriever(*synthetic_artifacts)
+    plain = retriever.retrieve("해녀 체험", top_k=3)
+
+    monkeypatch.setattr(config, "MMR_RERANK", True)
+    monkeypatch.setattr(config, "MMR_LAMBDA", 1.0)
+    relevance_only = retriever.retrieve("해녀 체험", top_k=3)
+    monkeypatch.setattr(config, "MMR_LAMBDA", 0.0)
+    diverse = retriever.retrieve("해녀 체험", top_k=3)
+
+    # lambda=1이면 쿼리 유사도 순 (정규화된 벡터에서는 L2 순위와 같음)
+    assert [r["title"] for r in relevance_only] == [r["title"] for r in plain]
+    assert len({r["title"] for r in diverse}) == 3
+    assert diverse[0]["title"] == plain[0]["title"]
@@ -0,0 +1,100 @@
+"""사전 계산 RAG 컨텍스트 테스트"""
+
+import math
+
+import pytest
+
+from llm.index_factory import index_version
+from llm.precomputed_contexts import (
+    PrecomputedContexts,
+    context_query,
+    contexts_path_for,
+    save_precomputed_contexts,
+)
+
+
+def _result(title, distance=0.5):
+    return {
+        "distance": distance,
+        "title": title,
+        "introduction": f"{title} 소개",
+        "alltag": "",
+        "address": "",
+    }
+
+
+ENTRIES = [
+    ("해녀", "", [_result("해녀 박물관"), _result("해녀 물질 체험")]),
+    ("해녀", "물질", [_result("해녀 물질 체험"), _result("해녀 박물관", math.nan)]),
+    ("해녀", "해산물 요리", [_result("제주 향토 요리")]),
+    ("감귤", "", [_result("감귤 따기 농장")]),
+]
+
+
+@pytest.fixture
+def contexts(tmp_path):
+    path = tmp_path / "contexts.json"
+    save_precomputed_contexts(path, ENTRIES, top_k=3, index_version="v1")
+    return PrecomputedContexts.load(path)
+
+
+def test_context_query():
+    assert context_query("해녀", "물질") == "해녀 물질"
+    assert context_query("해녀", "") == "해녀"
+
+
+class TestPrecomputedContexts:
+    def test_lookup_prefers_longest_matching_pattern(self, contexts):
+        results = contexts.lookup("해녀", "30년 경력 해녀, 해산물 요리 가능")
+
+        assert [r["title"] for r in results] == ["제주 향토 요리"]
+
+    def test_lookup_uses_category_default_only_without_text(self, contexts):
+        results = contexts.lookup("감귤", "  ", top_k=1)
+
+        assert [r["title"] for r in results] == ["감귤 따기 농장"]
+        # 패턴과 맞지 않는 요청 텍스트는 기본 결과로 대체하지 않고 실시간 검색
+        assert contexts.lookup("감귤", "30년 과수원 가지치기 전문가") is None
+        assert contexts.stats()["hit_rate"] == 0.5
+
+    def test_lookup_is_normalized(self, contexts):
+        # 전각 문자/공백 차이
+        results = contexts.lookup("해녀", "\uff2e 물질  담당")
+
+        assert results[0]["title"] == "해녀 물질 체험"
+
+    def test_lookup_misses(self, contexts):
+        assert contexts.lookup("목공", "가구") is None
+        assert contexts.lookup("해녀", "물질", top_k=5) is None
+        assert contexts.stats()["misses"] == 2
+
+    def test_nan_distance_roundtrip(self, contexts):
+        results = contexts.lookup("해녀", "물질")
+
+        assert math.isnan(results[1]["distance"])
+        assert contexts.index_version == "v1"
+
+
+@pytest.mark.usefixtures("fake_openai")
+class TestRetrieverPrecomputedContexts:
+    def test_loaded_for_matching_index_version(self, synthetic_artifacts):
+        from llm.rag_retriever import RAGRetriever
+
+        index_path, metadata_path = synthetic_artifacts
+        save_precomputed_contexts(
+            contexts_path_for(index_path), ENTRIES, 2, index_version(index_path)
+        )
+
+        retriever = RAGRetriever(index_path, metadata_path)
+
+        assert len(retriever.precomputed_contexts) == len(ENTRIES)
+
+    def test_ignored_for_other_index_build(self, synthetic_artifacts):
+        from llm.rag_retriever import RAGRetriever
+
+        index_path, metadata_path = synthetic_artifacts
+        save_precomputed_contexts(contexts_path_for(index_path), ENTRIES, 2, "old")
+
+        retriever = RAGRetriever(index_path, metadata_path)
+
+        assert retriever.precomputed_contexts is None
@@ -0,0 +1,178 @@
+"""축소 임베딩 차원 (text-embedding-3 dimensions) 테스트"""
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from llm import build_index, rag_retriever
+from llm.benchmark import compare_dimensions
+from llm.embedding_backend import (
+    HashedNgramEmbeddingBackend,
+    OpenAIEmbeddingBackend,
+    create_embedding_backend,
+    embedding_key,
+    shorten_embeddings,
+)
+from llm.index_factory import create_index, default_pq_m
+
+
+class RecordingEmbeddings:
+    def __init__(self):
+        self.kwargs = []
+
+    def create(self, **kwargs):
+        self.kwargs.append(kwargs)
+        dimension = kwargs.get("dimensions", 1536)
+        return SimpleNamespace(
+            data=[SimpleNamespace(embedding=[0.0] * dimension) for _ in kwargs["input"]]
+        )
+
+
+def test_openai_backend_sends_dimensions_only_when_shortened():
+    embeddings = RecordingEmbeddings()
+    client = SimpleNamespace(embeddings=embeddings)
+
+    full = OpenAIEmbeddingBackend("text-embedding-3-small", client=lambda: client)
+    short = OpenAIEmbeddingBackend(
+        "text-embedding-3-small", client=lambda: client, dimensions=256
+    )
+
+    assert full.embed(["a"]).shape == (1, 1536)
+    assert short.embed(["a"]).shape == (1, 256)
+    assert "dimensions" not in embeddings.kwargs[0]
+    assert embeddings.kwargs[1]["dimensions"] == 256
+    assert (full.dimension, short.dimension) == (1536, 256)
+
+
+def test_openai_backend_rejects_unsupported_dimensions():
+    with pytest.raises(ValueError, match="1~1536"):
+        OpenAIEmbeddingBackend("text-embedding-3-small", dimensions=4096)
+    with pytest.raises(ValueError, match="dimensions"):
+        OpenAIEmbeddingBackend("text-embedding-ada-002", dimensions=256)
+
+
+def test_embedding_key_separates_shortened_vectors():
+    assert embedding_key("text-embedding-3-small", 1536) == "text-embedding-3-small"
+    assert embedding_key("text-embedding-3-small", None) == "text-embedding-3-small"
+    assert embedding_key("text-embedding-3-small", 256) == "text-embedding-3-small@256"
+    # hashed 백엔드는 모델 이름에 차원이 들어 있음
+    hashed = create_embedding_backend("hashed", dimensions=256)
+    assert hashed.dimension == 256
+    assert embedding_key(hashed.model, hashed.dimension) == "hashed-char123-256"
+
+
+def test_shorten_embeddings_truncates_and_normalizes():
+    vectors = np.array([[3.0, 4.0, 12.0], [0.0, 0.0, 1.0]], dtype=np.float32)
+
+    shortened = shorten_embeddings(vectors, 2)
+
+    np.testing.assert_allclose(shortened, [[0.6, 0.8], [0.0, 0.0]])
+    assert shortened.dtype == np.float32
+
+
+class TestDimensionEnforcement:
+    @pytest.fixture
+    def hashed_artifacts(self, synthetic_artifacts):
+        """메타데이터에 인덱스 차원(8)이 기록된 아티팩트"""
+        index_path, metadata_path = synthetic_artifacts
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        metadata["embedding_model"] = HashedNgramEmbeddingBackend(8).model
+        metadata["index"] = {"type": "flat", "params": {}, "dimension": 8}
+        metadata_path.write_text(json.dumps(metadata), encoding="utf-8")
+        return index_path, metadata_path
+
+    @pytest.fixture(autouse=True)
+    def isolate_backend(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+            rag_retriever, "EMBEDDING_CACHE_STORE_PATH", tmp_path / "embedding_cache"
+        )
+        monkeypatch.setattr(
+            rag_retriever, "EMBEDDING_CACHE_PATH", tmp_path / "embedding_cache.json"
+        )
+        monkeypatch.setattr(rag_retriever.config, "PERFORMANCE_WARMUP_QUERIES", [])
+        yield
+        rag_retriever.set_embedding_backend(None)
+
+    def test_matching_dimension_loads(self, hashed_artifacts):
+        rag_retriever.set_embedding_backend(HashedNgramEmbeddingBackend(8))
+
+        retriever = rag_retriever.RAGRetriever(*hashed_artifacts)
+
+        assert retriever.dimension == 8
+        assert len(retriever.retrieve("해녀", top_k=2)) == 2
+
+    def test_recorded_dimension_must_match_backend(self, hashed_artifacts):
+        backend = HashedNgramEmbeddingBackend(8)
+        backend.dimension = 16  # 같은 모델 이름, 다른 차원
+        rag_retriever.set_embedding_backend(backend)
+
+        with pytest.raises(ValueError, match="EMBEDDING_DIMENSIONS"):
+            rag_retriever.RAGRetriever(*hashed_artifacts)
+
+    def test_query_vector_dimension_checked_at_search(self, synthetic_artifacts):
+        # 차원이 기록되지 않은 이전 아티팩트는 검색 시 쿼리 벡터 차원으로 검증
+        index_path, metadata_path = synthetic_artifacts
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        backend = HashedNgramEmbeddingBackend(16)
+        backend.model = metadata["embedding_model"]
+        rag_retriever.set_embedding_backend(backend)
+
+        retriever = rag_retriever.RAGRetriever(index_path, metadata_path)
+
+        with pytest.raises(ValueError, match="쿼리 벡터 차원"):
+            retriever.retrieve("해녀")
+
+
+def test_compare_dimensions_reports_recall_and_memory():
+    rng = np.random.default_rng(0)
+    # 앞 성분에 분산이 몰린 벡터 (text-embedding-3처럼 앞 성분만으로도 구분됨)
+    scale = np.linspace(1.0, 0.01, 64)
+    embeddings = shorten_embeddings(rng.standard_normal((300, 64)) * scale, 64)
+
+    rows = compare_dimensions(embeddings, (16, 32, 64), num_queries=20, top_k=5)
+
+    assert [row["dimension"] for row in rows] == [16, 32, 64]
+    assert rows[-1]["recall_at_k"] == 1.0
+    assert rows[0]["memory_bytes"] < rows[1]["memory_bytes"] < rows[2]["memory_bytes"]
+    assert rows[0]["vector_bytes"] == 64
+    assert rows[0]["recall_at_k"] <= rows[1]["recall_at_k"] <= 1.0
+    with pytest.raises(ValueError):
+        compare_dimensions(embeddings, (128,))
+
+
+def test_pq_m_defaults_to_divisor_of_dimension():
+    assert [default_pq_m(d) for d in (1536, 512, 256, 100)] == [96, 64, 64, 50]
+
+    vectors = shorten_embeddings(
+        np.random.default_rng(0).standard_normal((300, 1536)), 256
+    )
+    index, params = create_index(vectors, "pq")
+
+    assert index.d == 256
+    assert params["M"] == 64
+
+
+def test_build_rejects_pq_m_before_embedding(monkeypatch):
+    def fail_load_items():
+        raise AssertionError("임베딩 전에 실패해야 함")
+
+    monkeypatch.setattr(build_index, "load_items", fail_load_items)
+    # main이 바꾸는 백엔드 전역값은 테스트 후 복원
+    for name in ("EMBEDDING_BACKEND", "EMBEDDING_DIMENSIONS", "EMBEDDING_MODEL"):
+        monkeypatch.setattr(build_index, name, getattr(build_index, name))
+
+    with pytest.raises(ValueError, match=r"pq_m\(96\)은 차원\(256\)의 약수"):
+        build_index.main(
+            [
+                "--index-type",
+                "pq",
+                "--pq-m",
+                "96",
+                "--embedding-backend",
+                "hashed",
+                "--embedding-dimensions",
+                "256",
+            ]
+        )
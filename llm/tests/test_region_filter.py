@@ -0,0 +1,140 @@
+"""지역(location) 필터 검색 테스트"""
+
+import faiss
+import numpy as np
+import pytest
+
+from llm.index_factory import create_index
+from llm.region_filter import (
+    RegionIndex,
+    build_region_index,
+    filtered_search,
+    region_path_for,
+    save_region_index,
+)
+from llm.tests.conftest import SYNTHETIC_ITEMS
+
+# SYNTHETIC_ITEMS 순서대로 (region1, region2, 지번 주소)
+_REGIONS = [
+    ("제주시", "구좌", "제주특별자치도 제주시 구좌읍 세화리 1"),
+    ("제주시", "애월", "제주특별자치도 제주시 애월읍 고내리 2"),
+    ("서귀포시", "남원", "제주특별자치도 서귀포시 남원읍 위미리 3"),
+    ("제주시", "조천", "제주특별자치도 제주시 조천읍 신촌리 4"),
+    ("서귀포시", "안덕", "제주특별자치도 서귀포시 안덕면 사계리 5"),
+    ("제주시", "구좌", "제주특별자치도 제주시 구좌읍 하도리 6"),
+]
+
+REGION_ITEMS = [
+    {
+        **item,
+        "address": address,
+        "region1cd": {"value": "", "label": region1, "refId": ""},
+        "region2cd": {"value": "", "label": region2, "refId": ""},
+    }
+    for item, (region1, region2, address) in zip(SYNTHETIC_ITEMS, _REGIONS, strict=True)
+]
+
+
+@pytest.fixture
+def region_index():
+    return RegionIndex(build_region_index(REGION_ITEMS))
+
+
+@pytest.fixture
+def region_artifacts(synthetic_artifacts, monkeypatch):
+    from llm import config
+
+    monkeypatch.setattr(config, "REGION_FILTER_MIN_ITEMS", 1)
+    index_path, metadata_path = synthetic_artifacts
+    save_region_index(region_path_for(index_path), build_region_index(REGION_ITEMS))
+    return index_path, metadata_path
+
+
+class TestRegionIndex:
+    def test_build_skips_missing_and_invalid_labels(self):
+        items = [
+            {"region2cd": {"label": "region>"}},
+            {"region2cd": None},
+            {"region2cd": {"label": "애월"}},
+        ]
+
+        assert build_region_index(items)["region2"] == {"애월": [2]}
+
+    @pytest.mark.parametrize(
+        ("location", "label"),
+        [
+            ("구좌 해안가 공방", "구좌"),
+            ("세화리 마을회관", "구좌"),  # 주소 지명 사전
+            ("서귀포시 어딘가", "서귀포시"),
+        ],
+    )
+    def test_resolve(self, region_index, location, label):
+        assert region_index.resolve(location).label == label
+
+    def test_unresolved_location_returns_none(self, region_index):
+        assert region_index.resolve("제주 마을 야외 작업장") is None
+        assert region_index.resolve(None) is None
+
+    def test_small_region_widens_to_parent(self):
+        index = RegionIndex(build_region_index(REGION_ITEMS), min_items=2)
+
+        assert index.resolve("구좌").label == "구좌"
+        region = index.resolve("애월 바닷가")
+        assert (region.level, region.label) == ("region1", "제주시")
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf", "pq"])
+def test_filtered_search_only_returns_region_documents(index_type):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((300, 16)).astype(np.float32)
+    options = {"ivf": {"nlist": 4}, "pq": {"pq_m": 4}}.get(index_type, {})
+    index, _ = create_index(vectors, index_type, **options)
+    regions = RegionIndex({"region2": {"test": list(range(0, 300, 7))}})
+    region = regions.regions["region2"]["test"]
+
+    _, indices = filtered_search(index, vectors[:2], 5, region)
+
+    found = indices[indices >= 0]
+    assert found.size > 0
+    assert np.isin(found, region.ids).all()
+
+
+def test_selector_search_matches_brute_force(region_index):
+    vectors = np.random.default_rng(1).standard_normal((6, 8)).astype(np.float32)
+    index = faiss.IndexFlatL2(8)
+    index.add(vectors)
+    region = region_index.resolve("제주시")
+
+    _, indices = filtered_search(index, vectors[2:3], 3, region)
+
+    distances = ((vectors[region.ids] - vectors[2]) ** 2).sum(axis=1)
+    assert indices[0].tolist() == region.ids[np.argsort(distances)[:3]].tolist()
+
+
+@pytest.mark.usefixtures("fake_openai")
+class TestRegionFilteredRetrieval:
+    def test_retrieve_filters_by_location(self, region_artifacts):
+        from llm.rag_retriever import RAGRetriever
+
+        retriever = RAGRetriever(*region_artifacts)
+        results = retriever.retrieve("체험", top_k=5, location="서귀포시 공방")
+
+        assert {r["title"] for r in results} == {"감귤 따기 농장", "목공 공방"}
+
+    @pytest.mark.anyio
+    async def test_aretrieve_filters_by_location(self, region_artifacts):
+        from llm.rag_retriever import RAGRetriever
+
+        retriever = RAGRetriever(*region_artifacts)
+        results = await retriever.aretrieve("체험", top_k=5, location="구좌읍 해변")
+
+        assert {r["title"] for r in results} == {"해녀 물질 체험", "해녀 박물관"}
+
+    def test_without_region_index_location_is_ignored(self, synthetic_artifacts):
+        from llm.rag_retriever import RAGRetriever
+
+        retriever = RAGRetriever(*synthetic_artifacts)
+        results = retriever.retrieve("체험", top_k=5, location="서귀포시")
+
+        assert retriever.region_index is None
+        assert len(results) == 5
@@ -0,0 +1,115 @@
+"""retrieval 벤치마크 (stub 임베딩으로 RAGRetriever 단계별 지연시간)"""
+
+import json
+
+from llm import config, rag_retriever
+from llm.benchmark import benchmark_retrieval, load_query_corpus, main
+from llm.lexical_index import LexicalIndex, lexical_path_for
+from llm.tests.conftest import SYNTHETIC_ITEMS
+
+STAGES = ("resolve", "embed", "search", "format", "total")
+
+
+def test_benchmark_retrieval_reports_cold_and_warm_stages(synthetic_artifacts):
+    index_path, metadata_path = synthetic_artifacts
+    corpus = [
+        {"query": "해녀 체험", "location": None},
+        {"query": "돌담 쌓기", "location": "제주시"},
+        {"query": "해녀 체험", "location": None},
+    ]
+
+    report = benchmark_retrieval(index_path, metadata_path, corpus, top_k=2)
+
+    assert report["queries"] == 3
+    assert report["unique_queries"] == 2
+    assert report["target_ms"] == config.TARGET_SEARCH_TIME_MS
+    for name in ("cold", "warm"):
+        assert set(STAGES) <= set(report[name])
+        for stage in STAGES:
+            assert set(report[name][stage]) == {"mean", "p50", "p95", "p99"}
+        assert isinstance(report[name]["within_target"], bool)
+    # cold는 고유 쿼리만 임베딩하고, warm은 모두 캐시 적중
+    assert report["cold"]["embed_calls"] == 2
+    assert report["warm"]["embed_calls"] == 0
+    assert report["cold"]["lexical_fallbacks"] == 0
+
+
+def test_benchmark_retrieval_measures_embedding_timeout_fallback(
+    synthetic_artifacts, monkeypatch
+):
+    index_path, metadata_path = synthetic_artifacts
+    LexicalIndex.build(SYNTHETIC_ITEMS).save(lexical_path_for(index_path))
+    monkeypatch.setattr(config, "EMBEDDING_TIMEOUT_MS", 20)
+    corpus = [{"query": "해녀 체험", "location": None}] * 4
+
+    report = benchmark_retrieval(
+        index_path, metadata_path, corpus, embed_latency_ms=200, concurrency=4
+    )
+
+    # 동시 요청의 같은 쿼리는 한 번만 임베딩하고, 예산을 넘으면 어휘 검색으로 응답
+    assert report["cold"]["embed_calls"] == 1
+    assert report["cold"]["lexical_fallbacks"] == 4
+    assert report["cold"]["embed"]["p50"] < 200
+    assert report["cold"]["total"]["p99"] < 200
+
+
+def test_benchmark_retrieval_restores_embedding_backend(synthetic_artifacts):
+    index_path, metadata_path = synthetic_artifacts
+    saved = (
+        rag_retriever.EMBEDDING_CACHE_STORE_PATH,
+        config.PERFORMANCE_WARMUP_QUERIES,
+    )
+
+    benchmark_retrieval(
+        index_path, metadata_path, [{"query": "감귤", "location": None}]
+    )
+
+    assert rag_retriever._embedding_backend is None
+    assert saved == (
+        rag_retriever.EMBEDDING_CACHE_STORE_PATH,
+        config.PERFORMANCE_WARMUP_QUERIES,
+    )
+
+
+def test_load_query_corpus(tmp_path):
+    jsonl = tmp_path / "queries.jsonl"
+    jsonl.write_text(
+        '{"query": "해녀", "location": "제주시"}\n'
+        '{"category": "요리", "job_description": "향토 요리"}\n',
+        encoding="utf-8",
+    )
+    text = tmp_path / "queries.txt"
+    text.write_text("감귤 따기\n\n목공\n", encoding="utf-8")
+
+    corpus = load_query_corpus(jsonl, 0)
+    assert corpus[0] == {"query": "해녀", "location": "제주시"}
+    assert corpus[1]["query"] and corpus[1]["location"] is None
+    assert [entry["query"] for entry in load_query_corpus(text, 0)] == [
+        "감귤 따기",
+        "목공",
+    ]
+    assert len(load_query_corpus(None, 20)) == 20
+
+
+def test_main_writes_json_report(synthetic_artifacts, tmp_path):
+    index_path, metadata_path = synthetic_artifacts
+    output = tmp_path / "retrieval.json"
+
+    main(
+        [
+            "--output",
+            str(output),
+            "retrieval",
+            "--index",
+            str(index_path),
+            "--metadata",
+            str(metadata_path),
+            "--num-queries",
+            "10",
+        ]
+    )
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["benchmark"] == "retrieval"
+    assert report["source"] == "synthetic:10"
+    assert report["warm"]["total"]["p99"] >= 0
@@ -2,3 +2,15 @@ import os
 
 # 테스트 실행 시에는 로컬 설정을 강제하여 SQLite 사용 및 스키마 오류를 방지한다.
 os.environ.setdefault("ENVIRONMENT", "local")
+
+import pytest
+
+from app.libs.context_cache import context_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_rag_context_cache():
+    """테스트 간 RAG 컨텍스트 캐시가 공유되지 않도록 비운다."""
+    context_cache.clear()
+    yield
+    context_cache.clear()
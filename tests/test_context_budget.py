@@ -0,0 +1,185 @@
+import math
+
+import pytest
+import tiktoken
+
+from app.core.config import settings
+from app.libs import context_budget, rag
+from app.libs.context_budget import (
+    BudgetedContext,
+    ContextBudget,
+    ContextTokenStats,
+    build_budgeted_context,
+    count_tokens,
+    truncate_tokens,
+)
+
+
+def _hit(title, introduction="", distance=0.1):
+    return {
+        "distance": distance,
+        "title": title,
+        "introduction": introduction,
+        "alltag": "태그",
+        "address": "제주시",
+    }
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    """기본은 문자 기반 추정치로 계산 (테스트 기대값이 인코딩 파일에 의존하지 않도록)"""
+    monkeypatch.setattr(context_budget, "load_encoding", lambda: None)
+    count_tokens.cache_clear()
+    yield
+    count_tokens.cache_clear()
+
+
+@pytest.fixture
+def byte_encoding(monkeypatch):
+    """UTF-8 바이트당 1토큰인 실제 tiktoken 인코딩 (인코딩 파일 없이 생성)"""
+    encoding = tiktoken.Encoding(
+        name="bytes",
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+    monkeypatch.setattr(context_budget, "load_encoding", lambda: encoding)
+    count_tokens.cache_clear()
+    return encoding
+
+
+class _Retriever:
+    index_version = "v1"
+    precomputed_contexts = None
+
+    def __init__(self, results):
+        self.results = results
+
+    def location_key(self, location):  # noqa: ARG002
+        return None
+
+    async def aretrieve(self, query, top_k=3, location=None):  # noqa: ARG002
+        return self.results[:top_k]
+
+
+def test_truncate_tokens_prefers_sentence_boundary():
+    text = (
+        "해녀 물질 체험입니다. 테왁을 들고 바다에 들어가 소라와 전복을 직접 따 봅니다."
+    )
+
+    truncated = truncate_tokens(text, 20)
+
+    assert count_tokens(truncated) <= 20
+    assert truncated == "해녀 물질 체험입니다."
+    assert truncate_tokens(text, 1000) == text
+    assert truncate_tokens(text, 0) == ""
+
+
+def test_truncate_tokens_appends_ellipsis_without_boundary():
+    text = "가" * 50
+
+    truncated = truncate_tokens(text, 10)
+
+    assert truncated == "가" * 9 + context_budget.ELLIPSIS
+    assert count_tokens(truncated) == 10
+
+
+def test_tokenizer_counts_are_used_when_loaded(byte_encoding):
+    text = "해녀 물질 체험입니다. 테왁을 들고 바다에 들어가 봅니다."
+
+    truncated = truncate_tokens(text, 40)
+
+    # 한글 1자 = 3바이트 = 3토큰 (추정치로는 1토큰)
+    assert count_tokens("해녀") == len(byte_encoding.encode("해녀")) == 6
+    assert len(byte_encoding.encode(truncated)) <= 40
+    assert truncated == "해녀 물질 체험입니다."
+
+
+def test_budget_is_enforced_with_tokenizer(byte_encoding):
+    results = [_hit(f"공방 {i}", "제주 돌담 쌓기 체험 " * 20) for i in range(5)]
+    budget = ContextBudget(max_tokens=300, field_max_tokens={"introduction": 80})
+
+    context = build_budgeted_context(results, budget)
+
+    assert len(byte_encoding.encode(context.text)) == context.tokens <= 300
+    assert 0 < context.hits < 5
+
+
+def test_gpt4o_encoding_loads(monkeypatch):
+    monkeypatch.undo()  # 추정치 fixture 해제
+    context_budget.load_encoding.cache_clear()
+    try:
+        encoding = context_budget.load_encoding()
+    finally:
+        context_budget.load_encoding.cache_clear()
+    if encoding is None:
+        pytest.skip(
+            "gpt-4o 인코딩 파일을 받을 수 없음 (TIKTOKEN_CACHE_DIR 없이 오프라인)"
+        )
+
+    assert encoding.name == "o200k_base"
+
+
+def test_budget_drops_distant_hits_and_keeps_lexical_hits():
+    results = [
+        _hit("가까운 공방", distance=0.2),
+        _hit("먼 공방", distance=1.5),
+        _hit("어휘 검색 결과", distance=math.nan),
+    ]
+
+    context = build_budgeted_context(results, ContextBudget(max_distance=1.0))
+
+    assert [line.split(" | ")[0] for line in context.text.split("\n")] == [
+        "가까운 공방",
+        "어휘 검색 결과",
+    ]
+    assert (context.hits, context.dropped) == (2, 1)
+
+
+def test_budget_truncates_fields_and_stops_at_token_limit():
+    results = [_hit(f"공방 {i}", "제주 돌담 쌓기 체험 " * 40) for i in range(5)]
+    budget = ContextBudget(max_tokens=150, field_max_tokens={"introduction": 40})
+
+    context = build_budgeted_context(results, budget)
+
+    assert context.tokens == count_tokens(context.text) <= 150
+    assert 0 < context.hits < 5
+    assert context.dropped == 5 - context.hits
+    assert context.text.startswith("공방 0 | ")
+    assert context.saved_tokens == context.original_tokens - context.tokens > 0
+    # 예산이 없으면 원래 컨텍스트 그대로
+    unlimited = build_budgeted_context(results, ContextBudget())
+    assert unlimited.text == rag.format_rag_context(results)
+    assert unlimited.saved_tokens == 0
+
+
+def test_context_token_stats_accumulates():
+    stats = ContextTokenStats()
+
+    stats.record(BudgetedContext("", tokens=30, original_tokens=100, hits=1, dropped=2))
+    stats.record(BudgetedContext("", tokens=50, original_tokens=50, hits=3, dropped=0))
+
+    assert stats.stats() == {
+        "contexts": 2,
+        "original_tokens": 150,
+        "tokens": 80,
+        "saved_tokens": 70,
+        "dropped_hits": 2,
+    }
+
+
+@pytest.mark.anyio
+async def test_build_rag_context_applies_endpoint_budget(monkeypatch):
+    monkeypatch.setattr(
+        settings, "rag_context_token_budgets", {"materials-suggestion": 60}
+    )
+    monkeypatch.setattr(settings, "rag_context_field_max_tokens", {})
+    retriever = _Retriever([_hit(f"공방 {i}", "소개 " * 10) for i in range(3)])
+
+    limited = await rag.build_rag_context(
+        retriever, "돌담 체험", endpoint="materials-suggestion"
+    )
+    unlimited = await rag.build_rag_context(retriever, "돌담 체험")
+
+    assert count_tokens(limited) <= 60
+    assert limited.count("\n") < unlimited.count("\n") == 2
@@ -0,0 +1,176 @@
+import threading
+
+import pytest
+
+from app.libs import rag
+from app.libs.context_cache import ContextCache, context_cache, normalize_query
+from llm.precomputed_contexts import PrecomputedContexts
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_query_collapses_unicode_and_whitespace():
+    assert normalize_query("  해녀\u3000체험\n  구좌읍 ") == "해녀 체험 구좌읍"
+    assert normalize_query("\uff21\uff22\uff23") == "ABC"
+
+
+def test_lru_eviction_and_ttl_expiry():
+    clock = _Clock()
+    cache = ContextCache(max_entries=2, ttl_seconds=10, clock=clock)
+
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")  # b가 가장 오래 사용되지 않음
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 1
+    assert cache.stats() == {"hits": 2, "misses": 2, "hit_rate": 0.5, "size": 1}
+
+
+def test_clear_from_worker_thread_waits_for_lookup():
+    cache = ContextCache(max_entries=4, ttl_seconds=60)
+    cache.put("a", "A")
+    workers = []
+
+    def clock():
+        # 조회 도중 reload_rag_retriever의 워커 스레드가 캐시를 비우려는 상황
+        worker = threading.Thread(target=cache.clear)
+        worker.start()
+        worker.join(timeout=0.1)
+        workers.append(worker)
+        return 0.0
+
+    cache._clock = clock
+
+    assert cache.get("a") == "A"
+    for worker in workers:
+        worker.join()
+    assert len(cache) == 0
+
+
+class _CountingRetriever:
+    def __init__(self, index_version="v1", fail=False, precomputed_contexts=None):
+        self.index_version = index_version
+        self.fail = fail
+        self.calls = 0
+        self.locations = []
+        self.precomputed_contexts = precomputed_contexts
+
+    def location_key(self, location):
+        # "애월읍", "애월 해안" → 같은 지역
+        if location and "애월" in location:
+            return (("region2", "애월"), None)
+        return None
+
+    async def aretrieve(self, query, top_k=3, location=None):
+        self.calls += 1
+        self.locations.append(location)
+        if self.fail:
+            raise RuntimeError("rag failure")
+        return [
+            {"title": query, "introduction": str(top_k), "alltag": "", "address": ""}
+        ]
+
+
+@pytest.mark.anyio
+async def test_build_rag_context_caches_by_normalized_query_and_version():
+    retriever = _CountingRetriever()
+
+    first = await rag.build_rag_context(retriever, "해녀 체험", top_k=3)
+    second = await rag.build_rag_context(retriever, " 해녀   체험 ", top_k=3)
+    assert first == second == "해녀 체험 | 3 |  | "
+    assert retriever.calls == 1
+
+    await rag.build_rag_context(retriever, "해녀 체험", top_k=5)
+    assert retriever.calls == 2
+
+    # 새 인덱스 버전은 이전 캐시를 쓰지 않음
+    rebuilt = _CountingRetriever(index_version="v2")
+    await rag.build_rag_context(rebuilt, "해녀 체험", top_k=3)
+    assert rebuilt.calls == 1
+
+
+@pytest.mark.anyio
+async def test_build_rag_context_shares_cache_per_resolved_region():
+    retriever = _CountingRetriever()
+
+    await rag.build_rag_context(retriever, "해녀 체험", location="애월읍 바닷가")
+    await rag.build_rag_context(retriever, "해녀 체험", location="애월 해안 공방")
+    assert retriever.calls == 1
+    assert retriever.locations == ["애월읍 바닷가"]
+
+    # 지역으로 해석되지 않는 location은 필터 없는 검색과 캐시를 공유
+    await rag.build_rag_context(retriever, "해녀 체험", location="마을 작업장")
+    await rag.build_rag_context(retriever, "해녀 체험")
+    assert retriever.calls == 2
+
+
+@pytest.mark.anyio
+async def test_build_rag_context_serves_precomputed_contexts():
+    contexts = PrecomputedContexts(
+        {
+            "index_version": "v1",
+            "top_k": 3,
+            "contexts": [
+                {
+                    "category": "해녀",
+                    "pattern": "물질",
+                    "results": [
+                        {
+                            "distance": 0.1,
+                            "title": "해녀 박물관",
+                            "introduction": "소개",
+                            "alltag": "해녀",
+                            "address": "구좌읍",
+                        }
+                    ],
+                }
+            ],
+        }
+    )
+    retriever = _CountingRetriever(precomputed_contexts=contexts)
+
+    context = await rag.build_rag_context(
+        retriever, "해녀 체험", category="Haenyeo 물질", details="해녀 30년, 물질 담당"
+    )
+    assert context == "해녀 박물관 | 소개 | 해녀 | 구좌읍"
+    assert retriever.calls == 0
+
+    # 지역으로 검색 범위가 바뀌거나, 체험 유형이 없거나, 패턴이 맞지 않으면 검색
+    await rag.build_rag_context(
+        retriever, "해녀 체험", location="애월읍", category="해녀"
+    )
+    await rag.build_rag_context(retriever, "목공 체험", category="목공")
+    await rag.build_rag_context(
+        retriever, "해녀 테왁 체험", category="해녀", details="테왁 만들기"
+    )
+    assert retriever.calls == 3
+
+
+@pytest.mark.anyio
+async def test_failed_retrieval_is_not_cached():
+    retriever = _CountingRetriever(fail=True)
+
+    assert await rag.build_rag_context(retriever, "해녀 체험") == ""
+    assert await rag.build_rag_context(retriever, "해녀 체험") == ""
+    assert retriever.calls == 2
+    assert len(context_cache) == 0
+
+
+def test_loading_retriever_clears_cache(tmp_path):
+    context_cache.put(("해녀 체험", 3, "old"), "stale")
+
+    rag.load_rag_retriever(tmp_path / "missing.index", tmp_path / "missing.json")
+
+    assert len(context_cache) == 0
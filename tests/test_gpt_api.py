@@ -45,14 +45,21 @@ class _FakeOpenAIClient:
 
 
 class _StubRAGRetriever:
+    index_version = "stub"
+    precomputed_contexts = None
+
     def __init__(self, context: str, raise_error: bool = False):
         self.context = context
         self.raise_error = raise_error
         self.called_queries: list[str] = []
 
-    def retrieve(self, query: str, top_k: int = 3):
+    def location_key(self, location: str | None):  # noqa: ARG002
+        return None
+
+    async def aretrieve(self, query: str, top_k: int = 3, location: str | None = None):
         self.called_queries.append(query)
         self.last_top_k = top_k
+        self.last_location = location
         if self.raise_error:
             raise RuntimeError("rag failure")
         return [
@@ -444,6 +451,7 @@ async def test_generate_experience_plan_uses_rag_context_when_available():
 
     assert res.status_code == 200
     assert stub_retriever.called_queries
+    assert stub_retriever.last_location == payload["location"]
     messages = fake_client.store["messages"]
     user_message = messages[1]["content"]
     assert "<reference_context>" in user_message
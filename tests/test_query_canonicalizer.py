@@ -0,0 +1,100 @@
+import pytest
+
+from app.libs.query_canonicalizer import (
+    ALLOWED_CATEGORIES,
+    bucket_years,
+    canonical_category,
+    canonical_materials,
+    canonicalize_query,
+)
+from app.prompts import experience_plan as exp
+
+
+def test_allowed_categories_match_prompt():
+    assert ", ".join(ALLOWED_CATEGORIES) in exp.get_system_prompt()
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("해녀", "해녀"),
+        ("Haenyeo", "해녀"),
+        (" 해녀 물질 체험 ", "해녀"),
+        ("Stone wall", "돌담"),
+        ("tangerine", "감귤"),
+        ("한라봉 따기", "감귤"),
+        ("Cooking class", "요리"),
+        ("향토 음식", "요리"),
+        ("WOODWORKING", "목공"),
+        ("도자기", "도자기"),
+        # 단어 경계 일치 (조사는 허용, 다른 단어의 일부는 제외)
+        ("해녀가 하는 물질", "해녀"),
+        ("돌 쌓기 체험", "돌담"),
+        ("돌고래 관찰", "돌고래 관찰"),
+        ("바다 산책", "바다 산책"),
+        ("보리빵 만들기", "보리빵 만들기"),
+        ("제주 gooding", "제주 gooding"),
+    ],
+)
+def test_canonical_category(raw, expected):
+    assert canonical_category(raw) == expected
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("0", "경력 1년 미만"),
+        ("2년", "경력 1~2년"),
+        ("5", "경력 3~5년"),
+        (" 7 년", "경력 6~9년"),
+        ("１５년", "경력 10~19년"),
+        ("20", "경력 20년 이상"),
+        ("35년 이상", "경력 20년 이상"),
+        ("오래됨", "오래됨"),
+    ],
+)
+def test_bucket_years(raw, expected):
+    assert bucket_years(raw) == expected
+
+
+def test_canonical_materials_sorts_and_dedupes():
+    assert canonical_materials("테왁, 망사리") == canonical_materials("망사리,테왁")
+    assert canonical_materials("테왁 / 망사리、테왁") == "망사리, 테왁"
+    assert canonical_materials(" , ") == ""
+
+
+def test_canonicalize_query_collapses_equivalent_requests():
+    first = canonicalize_query(
+        category="해녀",
+        years_of_experience="20",
+        job_description="제주 해녀",
+        materials="테왁, 망사리",
+        location="구좌읍",
+    )
+    second = canonicalize_query(
+        category="Haenyeo",
+        years_of_experience="25년",
+        job_description="  제주   해녀. ",
+        materials="망사리,테왁,테왁",
+        location="구좌읍!",
+    )
+
+    assert first == second == "해녀 경력 20년 이상 제주 해녀 망사리, 테왁 구좌읍"
+
+
+def test_canonicalize_query_skips_missing_fields():
+    assert (
+        canonicalize_query(
+            category="목공", years_of_experience="3", job_description="목수"
+        )
+        == "목공 경력 3~5년 목수"
+    )
+
+
+def test_replayed_log_hit_rate_improves():
+    from llm.benchmark import compare_query_keys, synthetic_request_log
+
+    report = compare_query_keys(synthetic_request_log(200))
+
+    assert report["canonical"]["hit_rate"] > report["raw"]["hit_rate"]
+    assert report["canonical"]["unique_keys"] <= 5 * 5
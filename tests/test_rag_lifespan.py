@@ -0,0 +1,153 @@
+import json
+
+import faiss
+import numpy as np
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routes import experience_plan as experience_plan_api
+from app.libs import rag
+from app.main import app, lifespan
+
+
+@pytest.fixture
+def rag_artifacts(tmp_path):
+    vectors = np.random.default_rng(0).random((4, 8), dtype=np.float32)
+    index = faiss.IndexFlatL2(8)
+    index.add(vectors)
+    index_path = tmp_path / "test.index"
+    faiss.write_index(index, str(index_path))
+
+    metadata_path = tmp_path / "metadata.json"
+    metadata_path.write_text(
+        json.dumps(
+            {
+                "embedding_model": "text-embedding-3-small",
+                "items": [{"title": f"워크숍 {i}"} for i in range(4)],
+            },
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    yield index_path, metadata_path
+    rag.close_rag_retriever()
+
+
+def test_load_rag_retriever_keeps_singleton(rag_artifacts):
+    index_path, metadata_path = rag_artifacts
+
+    retriever = rag.load_rag_retriever(index_path, metadata_path)
+
+    assert retriever is not None
+    assert retriever.index.ntotal == 4
+    assert retriever.load_time_ms >= 0
+    assert rag.get_rag_retriever() is retriever
+    assert experience_plan_api.get_rag_retriever() is retriever
+
+
+def test_load_rag_retriever_returns_none_when_artifacts_missing(tmp_path):
+    retriever = rag.load_rag_retriever(
+        tmp_path / "missing.index", tmp_path / "missing.json"
+    )
+
+    assert retriever is None
+    assert rag.get_rag_retriever() is None
+
+
+@pytest.mark.anyio
+async def test_lifespan_loads_and_releases_retriever(monkeypatch):
+    calls = []
+
+    def _fake_load():
+        calls.append("load")
+        return None
+
+    monkeypatch.setattr(rag, "load_rag_retriever", _fake_load)
+
+    async with lifespan(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            res = await ac.get("/api/health/ping")
+            assert res.status_code == 200
+
+    assert calls == ["load"]
+    assert rag.get_rag_retriever() is None
+
+
+def _write_index(index_path, count):
+    vectors = np.random.default_rng(count).random((count, 8), dtype=np.float32)
+    index = faiss.IndexFlatL2(8)
+    index.add(vectors)
+    faiss.write_index(index, str(index_path))
+
+
+def test_reload_swaps_to_new_release(rag_artifacts, tmp_path):
+    from llm.artifact_release import publish_release
+
+    index_path, metadata_path = rag_artifacts
+    releases = tmp_path / "releases"
+    first = publish_release(releases, index_path, metadata_path)
+    old = rag.load_rag_retriever(releases_dir=releases)
+    assert rag.rag_status()["release"] == first.version
+
+    # 처리 중인 요청은 이미 받은 retriever를 계속 사용
+    in_flight = rag.get_rag_retriever()
+    _write_index(index_path, 5)
+    metadata_path.write_text(
+        json.dumps(
+            {
+                "embedding_model": "text-embedding-3-small",
+                "items": [{"title": f"워크숍 {i}"} for i in range(5)],
+            }
+        ),
+        encoding="utf-8",
+    )
+    second = publish_release(releases, index_path, metadata_path)
+
+    status = rag.reload_rag_retriever(releases)
+
+    assert status["swapped"] is True
+    assert status["release"] == second.version
+    assert rag.get_rag_retriever().index.ntotal == 5
+    assert in_flight is old
+    assert in_flight.index.ntotal == 4
+    assert rag.reload_rag_retriever(releases)["swapped"] is False
+
+
+def test_reload_keeps_previous_retriever_on_checksum_mismatch(rag_artifacts, tmp_path):
+    from llm.artifact_release import publish_release
+
+    releases = tmp_path / "releases"
+    publish_release(releases, *rag_artifacts)
+    retriever = rag.load_rag_retriever(releases_dir=releases)
+    _write_index(rag_artifacts[0], 6)
+    broken = publish_release(releases, *rag_artifacts)
+    _write_index(broken.index_path, 7)
+
+    status = rag.reload_rag_retriever(releases)
+
+    assert status["swapped"] is False
+    assert "체크섬" in status["error"] or "크기" in status["error"]
+    assert rag.get_rag_retriever() is retriever
+
+
+@pytest.mark.anyio
+async def test_admin_reload_requires_token(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    monkeypatch.setattr(
+        rag, "reload_rag_retriever", lambda _dir, force: {"swapped": force}
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        denied = await ac.post("/api/admin/rag/reload")
+        res = await ac.post(
+            "/api/admin/rag/reload?force=true",
+            headers={"wadeulwadeul-admin-token": "secret"},
+        )
+
+    assert denied.status_code == 403
+    assert res.status_code == 200
+    assert res.json() == {"swapped": True}
@@ -0,0 +1,178 @@
+import asyncio
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.libs import openai_client, rag, single_flight
+from app.libs.single_flight import SingleFlight
+from app.main import app
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_calls_share_one_execution():
+    group = SingleFlight("test")
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(group.do("key", work) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert group.stats() == {"calls": 5, "coalesced": 4, "inflight": 0}
+
+
+@pytest.mark.anyio
+async def test_different_keys_and_sequential_calls_are_not_coalesced():
+    group = SingleFlight("test")
+    calls = []
+
+    async def work(key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        return key
+
+    await asyncio.gather(
+        group.do("a", lambda: work("a")), group.do("b", lambda: work("b"))
+    )
+    await group.do("a", lambda: work("a"))
+
+    assert calls == ["a", "b", "a"]
+    assert group.coalesced == 0
+
+
+@pytest.mark.anyio
+async def test_errors_are_shared_with_all_waiters():
+    group = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        group.do("key", work), group.do("key", work), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.anyio
+async def test_cancelled_leader_does_not_cancel_followers():
+    group = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    leader = asyncio.ensure_future(group.do("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(group.do("key", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "done"
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_rag_queries_share_one_retrieval():
+    class _SlowRetriever:
+        calls = 0
+        index_version = "slow"
+
+        async def aretrieve(self, query, top_k=3, location=None):  # noqa: ARG002
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return [{"title": query, "introduction": "", "alltag": "", "address": ""}]
+
+    retriever = _SlowRetriever()
+
+    contexts = await asyncio.gather(
+        *(rag.build_rag_context(retriever, "해녀 체험") for _ in range(3))
+    )
+
+    assert contexts == ["해녀 체험 |  |  | "] * 3
+    assert retriever.calls == 1
+
+
+@pytest.mark.anyio
+async def test_rag_queries_differing_in_whitespace_share_one_retrieval():
+    class _SlowRetriever:
+        calls = 0
+        index_version = "slow-normalized"
+
+        async def aretrieve(self, query, top_k=3, location=None):  # noqa: ARG002
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return [{"title": "해녀", "introduction": "", "alltag": "", "address": ""}]
+
+    retriever = _SlowRetriever()
+    queries = ["해녀 체험", "  해녀   체험 ", "해녀\u3000체험"]
+
+    contexts = await asyncio.gather(
+        *(rag.build_rag_context(retriever, query) for query in queries)
+    )
+
+    # 컨텍스트 캐시와 같은 정규화 쿼리로 병합되어 임베딩/검색은 한 번
+    assert contexts == ["해녀 |  |  | "] * 3
+    assert retriever.calls == 1
+
+
+class _SlowCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):  # noqa: ARG002
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        message = type("Msg", (), {"content": json.dumps({"체험 제목": "dummy"})})()
+        return type(
+            "Completion", (), {"choices": [type("C", (), {"message": message})()]}
+        )()
+
+
+@pytest.mark.anyio
+async def test_duplicate_experience_plan_requests_share_completion():
+    completions = _SlowCompletions()
+    fake_client = type(
+        "Client", (), {"chat": type("Chat", (), {"completions": completions})()}
+    )()
+
+    async def _override():
+        return fake_client
+
+    app.dependency_overrides[openai_client.get_openai_client] = _override
+    payload = {
+        "category": "해녀",
+        "years_of_experience": "20",
+        "job_description": "제주 해녀",
+        "materials": "테왁, 망사리",
+        "location": "구좌읍",
+        "duration_minutes": "90",
+        "capacity": "6",
+        "price_per_person": "80000",
+    }
+    retry_payload = {**payload, "job_description": "  제주   해녀 "}
+    before = single_flight.get_group("llm_completion").coalesced
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport, base_url="http://test", follow_redirects=True
+    ) as ac:
+        responses = await asyncio.gather(
+            ac.post("/api/v1/experience-plan", json=payload),
+            ac.post("/api/v1/experience-plan", json=payload),
+            ac.post("/api/v1/experience-plan", json=retry_payload),
+        )
+        metrics = (await ac.get("/api/health/metrics")).json()
+
+    app.dependency_overrides.clear()
+
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert completions.calls == 1
+    assert single_flight.get_group("llm_completion").coalesced - before == 2
+    assert metrics["single_flight"]["llm_completion"]["coalesced"] >= 2